@@ -0,0 +1,140 @@
+"""
+Aggregation benchmark: serial path against the month-partitioned process pool.
+
+A multi-year history is synthesized from the sample CSV (`--scale` copies
+with distinct SKUs per snapshot, `--snapshots` weekly snapshots with noisy
+quantities) and aggregated from scratch once serially and once per worker
+count. Every parallel payload is compared with the serial one, and the share
+of the serial run spent in the per-snapshot map work is reported, which bounds
+the achievable speed-up (Amdahl). Worker pools are started before timing.
+Finally one snapshot is appended to the aggregated history, which only maps
+the new date, and that payload is compared with the serial one too. Sections
+still filled with random placeholder data are left out of the comparisons.
+
+Usage (from the repository root):
+
+    python benchmarks/aggregation_benchmark.py [--scale 200] [--snapshots 104] [--workers 1 2 4 8]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+import time
+import warnings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(REPO_ROOT, 'supply_chain_data (1).csv')
+
+def weekly_history(scale, snapshots):
+    import numpy as np
+    import pandas as pd
+    from supply_chain.processing import process_single_csv
+
+    raw = pd.read_csv(SAMPLE_CSV)
+    raw = pd.concat([raw.assign(SKU=raw['SKU'] + f"-{i}") for i in range(scale)], ignore_index=True)
+    rng = np.random.default_rng(0)
+    start = datetime.date.today() - datetime.timedelta(weeks=snapshots - 1)
+    return [process_single_csv(raw.assign(**{'Stock levels': np.maximum(0, raw['Stock levels'] + rng.integers(-20, 20, len(raw)))}),
+                               start + datetime.timedelta(weeks=i)) for i in range(snapshots)]
+
+# Payload sections drawn at random by supply_chain.dummy, which differ on every run
+RANDOM_SECTIONS = ['stockCoverage']
+
+def comparable(payload):
+    return {key: value for key, value in payload.items() if key not in RANDOM_SECTIONS}
+
+def assert_same(a, b, path='payload'):
+    """Exact equality of two payloads, including frames, arrays and the history/archive objects."""
+    import numpy as np
+    import pandas as pd
+
+    assert type(a) is type(b), f"{path}: {type(a).__name__} != {type(b).__name__}"
+    if isinstance(a, dict):
+        assert list(a) == list(b), f"{path}: keys differ"
+        for key in a:
+            assert_same(a[key], b[key], f"{path}.{key}")
+    elif isinstance(a, (list, tuple)):
+        assert len(a) == len(b), f"{path}: lengths differ"
+        for i, (x, y) in enumerate(zip(a, b)):
+            assert_same(x, y, f"{path}[{i}]")
+    elif isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b, check_exact=True, obj=path)
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b, check_exact=True, obj=path)
+    elif isinstance(a, pd.Index):
+        pd.testing.assert_index_equal(a, b, exact=True, obj=path)
+    elif isinstance(a, np.ndarray):
+        assert a.dtype == b.dtype and np.array_equal(a, b, equal_nan=a.dtype.kind in 'fc'), f"{path}: arrays differ"
+    elif hasattr(a, '__dict__') and not isinstance(a, (pd.Timestamp, pd.Period)):
+        assert_same(vars(a), vars(b), f"{path}<{type(a).__name__}>")
+    elif isinstance(a, float) and a != a:
+        assert b != b, f"{path}: {a!r} != {b!r}"
+    else:
+        assert a == b, f"{path}: {a!r} != {b!r}"
+
+def cold_start():
+    """Forgets what earlier runs left in the process: the shared cache and the snapshot fingerprints."""
+    from supply_chain.cache import get_shared_cache
+    from supply_chain.rolling import SNAPSHOT_FINGERPRINTS
+
+    get_shared_cache.clear()
+    SNAPSHOT_FINGERPRINTS.clear()
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=200, help='copies of the sample CSV per snapshot (100 rows each)')
+    parser.add_argument('--snapshots', type=int, default=104, help='weekly snapshots in the history')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to time (1 = serial path)')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING) # Cached functions warn outside `streamlit run`
+    sys.path.insert(0, REPO_ROOT)
+    from supply_chain.aggregation import aggregate_and_generate_dashboard_data
+    from supply_chain.parallel import get_aggregation_pool, map_month_partition, month_partitions, snapshots_by_date
+    import supply_chain.parallel as parallel
+
+    all_dfs = weekly_history(args.scale, args.snapshots)
+    partitions = month_partitions(snapshots_by_date(all_dfs).keys())
+    print(f"{len(all_dfs[0]):,} rows per snapshot, {len(all_dfs)} snapshots in {len(partitions)} months, {os.cpu_count()} CPU(s)")
+    parallel.AGGREGATION_PARALLEL_MIN_ROWS = 0 # Time the pool at any size
+
+    aggregate_and_generate_dashboard_data(all_dfs[:2], workers=1) # Lazy imports and first-call set-up, outside the timing
+    cold_start() # Every timed run starts cold, as on a fresh upload
+    serial, serial_seconds = timed(aggregate_and_generate_dashboard_data, all_dfs, workers=1)
+    snapshots = snapshots_by_date(all_dfs)
+    all_parts = ['archive', 'rolling', 'sections']
+    _, map_seconds = timed(lambda: [map_month_partition([(d, snapshots[d], all_parts) for d in dates], None, None, True, False)
+                                    for dates in partitions])
+    map_share = min(map_seconds / serial_seconds, 1.0)
+    print(f"serial: {serial_seconds:.1f}s, of which ~{map_share:.0%} is per-snapshot map work")
+
+    print(f"{'workers':>8}{'seconds':>10}{'speed-up':>10}{'Amdahl bound':>14}  identical")
+    for workers in args.workers:
+        if workers > 1:
+            pool = get_aggregation_pool(workers)
+            list(pool.map(abs, range(workers))) # Start the workers outside the timing
+        cold_start()
+        payload, seconds = timed(aggregate_and_generate_dashboard_data, all_dfs, workers=workers)
+        assert_same(comparable(serial), comparable(payload))
+        bound = 1 / ((1 - map_share) + map_share / workers)
+        print(f"{workers:>8}{seconds:>10.1f}{serial_seconds / seconds:>9.2f}x{bound:>13.2f}x  yes")
+
+    # Appending one snapshot only aggregates the new date, whatever the worker count
+    workers = max(args.workers)
+    cold_start()
+    previous = aggregate_and_generate_dashboard_data(all_dfs[:-1], workers=workers)
+    appended, append_seconds = timed(aggregate_and_generate_dashboard_data, all_dfs, rolling_state=previous['rollingState'],
+                                     archive=previous['archive'], sections=previous['snapshotSections'], workers=workers)
+    assert_same(comparable(serial), comparable(appended))
+    print(f"append one snapshot ({workers} workers): {append_seconds:.1f}s, identical: yes")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Load test for the local JSON API.
+
+By default the API is started in-process on a free port and serves a
+dashboard aggregated from the sample CSV (or `--csv`). Pass `--url` to poll an
+API that is already running, e.g. a Streamlit app started with SC_API_PORT:
+
+    SC_API_PORT=8765 streamlit run sc.py
+
+Each client thread keeps one connection open and polls every section in a
+loop, in three modes:
+
+- full: plain requests, the whole JSON body every time
+- gzip: requests with Accept-Encoding: gzip
+- conditional: If-None-Match with the ETag of the previous response, so
+  unchanged sections are answered with 304 and no body
+
+Usage (from the repository root):
+
+    python benchmarks/api_load_test.py [--clients 8] [--duration 5] [--csv file.csv] [--url http://127.0.0.1:8765]
+"""
+
+import argparse
+import datetime
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(REPO_ROOT, 'supply_chain_data (1).csv')
+MODES = ['full', 'gzip', 'conditional']
+
+def self_hosted_api(csv_path):
+    """Aggregates one snapshot from `csv_path`, publishes it and returns the API base URL."""
+    sys.path.insert(0, REPO_ROOT)
+    import pandas as pd
+    from supply_chain.aggregation import aggregate_and_generate_dashboard_data
+    from supply_chain.api import start_api_server
+    from supply_chain.cache import SHARED_CACHE_BUDGET_MB, SharedSnapshotCache
+    from supply_chain.processing import process_single_csv
+
+    cache = SharedSnapshotCache(SHARED_CACHE_BUDGET_MB * 1024 * 1024)
+    snapshot_df = process_single_csv(pd.read_csv(csv_path), datetime.date.today())
+    cache.put('load-test', aggregate_and_generate_dashboard_data([snapshot_df]))
+    server = start_api_server('127.0.0.1', 0, cache)
+    server.publish('load-test')
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def poll(base_url, sections, mode, deadline, results):
+    """Polls the sections round-robin on one keep-alive connection until `deadline`."""
+    url = urllib.parse.urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+    etags = {}
+    latencies, statuses, body_bytes = [], {}, 0
+    while time.perf_counter() < deadline:
+        for section in sections:
+            headers = {}
+            if mode in ('gzip', 'conditional'):
+                headers['Accept-Encoding'] = 'gzip'
+            if mode == 'conditional' and section in etags:
+                headers['If-None-Match'] = etags[section]
+            start = time.perf_counter()
+            connection.request('GET', f"/api/{section}", headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+            body_bytes += len(body)
+            if response.getheader('ETag'):
+                etags[section] = response.getheader('ETag')
+    connection.close()
+    results.append((latencies, statuses, body_bytes))
+
+def run_mode(base_url, sections, mode, clients, duration):
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=poll, args=(base_url, sections, mode, deadline, results)) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    statuses = {}
+    for result in results:
+        for status, count in result[1].items():
+            statuses[status] = statuses.get(status, 0) + count
+    requests = len(latencies)
+    return {
+        'requests/s': requests / duration,
+        'p50 (ms)': statistics.median(latencies) * 1000,
+        'p99 (ms)': latencies[int(0.99 * (requests - 1))] * 1000,
+        'bytes/request': sum(result[2] for result in results) / requests,
+        'statuses': ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items())),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=8, help='concurrent polling clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per mode')
+    parser.add_argument('--csv', default=SAMPLE_CSV, help='snapshot to aggregate for the in-process API')
+    parser.add_argument('--url', help='base URL of a running API (skips the in-process server)')
+    args = parser.parse_args()
+
+    base_url = args.url or self_hosted_api(args.csv)
+    sys.path.insert(0, REPO_ROOT)
+    from supply_chain.api import API_SECTIONS
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per mode against {base_url}")
+    print(f"{'mode':<14}{'requests/s':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'bytes/request':>15}  statuses")
+    for mode in MODES:
+        row = run_mode(base_url, API_SECTIONS, mode, args.clients, args.duration)
+        print(f"{mode:<14}{row['requests/s']:>12.0f}{row['p50 (ms)']:>10.2f}{row['p99 (ms)']:>10.2f}{row['bytes/request']:>15.0f}  {row['statuses']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Interaction latency benchmark for the dashboard.
+
+The sample CSV is scaled up (`--scale` copies with distinct SKUs) and
+uploaded through the sidebar, as a user would. The history behind the
+upload is a multi-snapshot dashboard (`--snapshots` dated copies with noisy
+quantities) that is aggregated once up front and stored in the shared cache
+under the key the upload resolves to, so the comparison and anomaly
+sections have several dates to work with.
+
+Each interaction changes one widget and times the resulting rerun with
+Streamlit's public AppTest API. A widget inside a fragment (st.fragment)
+reruns only that fragment in the browser, so by default the fragment is
+rendered on its own in a minimal AppTest script (AppTest.from_function)
+against the cached dashboard, and only the fragment body is timed. Widgets
+outside fragments (navigation) rerun the whole app. `--full-rerun` times
+every change as a rerun of the whole app instead, which is what each change
+cost before the sections became fragments; running both modes gives the
+before/after comparison. Reported numbers are the median and minimum over
+`--repeat` changes.
+
+Usage (from the repository root):
+
+    python benchmarks/interaction_benchmark.py [--scale 1000] [--snapshots 6] [--repeat 5] [--full-rerun]
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+import warnings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(REPO_ROOT, 'supply_chain_data (1).csv')
+
+def comparison_arguments(data):
+    history = data['history']
+    return history, [snapshot_date.date() for snapshot_date in history.dates]
+
+def quality_arguments(data):
+    quality = data.get('quality') or {}
+    return quality, {snapshot_date: scorecards for snapshot_date, scorecards in (quality.get('bySnapshot') or {}).items() if scorecards}
+
+# (label, page, widget kind, widget key, two values to alternate between, (module, fragment, arguments from the dashboard))
+INTERACTIONS = [
+    ('navigation radio', None, 'radio', 'main_nav', ['Executive Summary', 'Excess Stock'], None),
+    ('comparison first date', 'Day-to-Day Comparison', 'selectbox', 'date1_select', [0, 1],
+     ('supply_chain.views.comparison', 'DateComparison', comparison_arguments)),
+    ('anomaly threshold', 'Day-to-Day Comparison', 'slider', 'anomaly_threshold', [3.0, 4.0],
+     ('supply_chain.views.comparison', 'ChangeAnomalies', lambda data: (data,))),
+    ('turnover metric', 'Excess Stock', 'selectbox', 'turnover_metric_select', ['gmroi', 'sellThrough'],
+     ('supply_chain.views.stock', 'ExcessTurnover', lambda data: (data,))),
+    ('rolling metric', 'Executive Summary', 'selectbox', 'rolling_metric_select', ['excessValue', 'inventoryValue'],
+     ('supply_chain.views.summary', 'RollingAverages', lambda data: (data.get('rollingMetrics') or {},))),
+    ('quality snapshot', 'Quality', 'selectbox', 'quality_date_select', [0, 1],
+     ('supply_chain.views.quality', 'QualityScorecards', quality_arguments)),
+    ('replenishment service level', 'Replenishment', 'slider', 'replenishment_z', [1.5, 2.0],
+     ('supply_chain.views.replenishment', 'ReplenishmentPlan', lambda data: (data['replenishmentInputs'], data['salesPeriodDays']))),
+]
+
+def render_fragment(dashboard_key, module, name, arguments):
+    """AppTest script drawing one fragment on its own, which is what a fragment-scoped rerun executes."""
+    import importlib
+    import streamlit as st
+    from supply_chain.cache import get_shared_cache
+
+    st.session_state['dashboard_key'] = dashboard_key # Derived results are cached per dashboard, as in the app
+    fragment = getattr(importlib.import_module(module), name)
+    fragment(*arguments(get_shared_cache().get(dashboard_key)))
+
+def scaled_csv(scale):
+    import pandas as pd
+    raw = pd.read_csv(SAMPLE_CSV)
+    copies = [raw.assign(SKU=raw['SKU'] + f"-{i}") for i in range(scale)]
+    return pd.concat(copies, ignore_index=True)
+
+def prepare_dashboard(raw, upload_date, snapshots):
+    """
+    Aggregates `snapshots` noisy dated copies of `raw` ending at the upload date
+    and caches them for the upload; returns (upload bytes, dashboard key).
+    """
+    import numpy as np
+    from supply_chain.aggregation import aggregate_and_generate_dashboard_data
+    from supply_chain.cache import content_hash, get_shared_cache
+    from supply_chain.policy import policy_key
+    from supply_chain.processing import process_single_csv
+
+    rng = np.random.default_rng(0)
+    dfs = []
+    for i in range(snapshots):
+        snapshot = raw.assign(**{'Stock levels': np.maximum(0, raw['Stock levels'] + rng.integers(-20, 20, len(raw)))})
+        dfs.append(process_single_csv(snapshot, upload_date - datetime.timedelta(days=7 * (snapshots - 1 - i))))
+    file_bytes = raw.to_csv(index=False).encode('utf-8')
+    snapshot_key = content_hash('snapshot', file_bytes, upload_date)
+    dashboard_key = content_hash('dashboard', snapshot_key, policy_key(None))
+    get_shared_cache().put(dashboard_key, aggregate_and_generate_dashboard_data(dfs))
+    return file_bytes, dashboard_key
+
+def timed_change(at, kind, key, value):
+    """Sets a widget and reruns the AppTest script; returns the seconds taken."""
+    widget = getattr(at, kind)(key=key)
+    if kind in ('selectbox', 'radio') and isinstance(value, int):
+        value = widget.options[value]
+    start = time.perf_counter()
+    widget.set_value(value).run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{key}: {at.exception[0].value}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=1000, help='copies of the sample CSV (100 rows each)')
+    parser.add_argument('--snapshots', type=int, default=6, help='dated snapshots behind the upload')
+    parser.add_argument('--repeat', type=int, default=5, help='widget changes per interaction')
+    parser.add_argument('--full-rerun', action='store_true', help='rerun the whole app on every change (the behaviour before fragments)')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    sys.path.insert(0, REPO_ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    raw = scaled_csv(args.scale)
+    upload_date = datetime.date.today()
+    start = time.perf_counter()
+    file_bytes, dashboard_key = prepare_dashboard(raw, upload_date, args.snapshots)
+    print(f"{len(raw):,} rows per snapshot, {args.snapshots} snapshots (aggregated in {time.perf_counter() - start:.1f}s)")
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, 'sc.py'), default_timeout=600)
+    app.run()
+    app.sidebar.file_uploader[0].set_value(('benchmark.csv', file_bytes, 'text/csv')).run()
+
+    print(f"{'interaction':<30}{'rerun scope':<14}{'median (ms)':>13}{'min (ms)':>11}")
+    for label, page, kind, key, values, fragment in INTERACTIONS:
+        if fragment is None or args.full_rerun:
+            at, scope = app, 'full script'
+            if page is not None:
+                at.radio(key='main_nav').set_value(page).run()
+        else:
+            module, name, arguments = fragment
+            at = AppTest.from_function(render_fragment, default_timeout=600, kwargs={
+                'dashboard_key': dashboard_key, 'module': module, 'name': name, 'arguments': arguments})
+            at.run()
+            scope = 'fragment'
+        samples = [timed_change(at, kind, key, values[(i + 1) % 2]) for i in range(args.repeat)]
+        print(f"{label:<30}{scope:<14}{statistics.median(samples) * 1000:>13.1f}{min(samples) * 1000:>11.1f}")
+
+if __name__ == '__main__':
+    main()
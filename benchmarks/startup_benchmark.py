@@ -0,0 +1,84 @@
+"""
+Cold-start benchmark for the dashboard.
+
+Every measurement runs in a fresh interpreter so nothing is already imported:
+
+- import time of the entry module (`sc`) against bare Streamlit
+- import time of each page module, i.e. the cost paid on first visit of a page
+- first render of the app without data, through Streamlit's AppTest harness
+
+Usage (from the repository root):
+
+    python benchmarks/startup_benchmark.py [--repeat 5] [--importtime]
+
+`--importtime` additionally lists the slowest imports of `sc` (python -X importtime).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+RENDER_SNIPPET = """import time, warnings
+warnings.filterwarnings('ignore')
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file('sc.py', default_timeout=120)
+t = time.perf_counter()
+at.run()
+print(time.perf_counter() - t)"""
+
+def run_fresh(snippet, extra_args=()):
+    """Runs a snippet in a new interpreter from the repository root and returns its stdout/stderr."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    result = subprocess.run([sys.executable, *extra_args, '-c', snippet], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+def measure(snippet, repeat):
+    """Median and minimum, in seconds, of the last line printed by `snippet` over `repeat` fresh runs."""
+    samples = [float(run_fresh(snippet)[0].strip().splitlines()[-1]) for _ in range(repeat)]
+    return statistics.median(samples), min(samples)
+
+def page_modules():
+    sys.path.insert(0, REPO_ROOT)
+    from supply_chain.views import PAGES
+    return sorted({f'supply_chain.views.{module}' for module, _ in PAGES.values()})
+
+def slowest_imports(module, top=15):
+    """Slowest imports (cumulative microseconds) reported by python -X importtime."""
+    _, stderr = run_fresh(f"import {module}", extra_args=('-X', 'importtime'))
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreter runs per measurement')
+    parser.add_argument('--importtime', action='store_true', help='list the slowest imports of sc')
+    args = parser.parse_args()
+
+    print(f"{'target':<45}{'median (ms)':>14}{'min (ms)':>12}")
+    targets = [('streamlit (baseline)', IMPORT_SNIPPET.format(module='streamlit')),
+               ('sc (entry module)', IMPORT_SNIPPET.format(module='sc')),
+               ('supply_chain.aggregation', IMPORT_SNIPPET.format(module='supply_chain.aggregation'))]
+    targets += [(module, IMPORT_SNIPPET.format(module=module)) for module in page_modules()]
+    targets.append(('first render without data (AppTest)', RENDER_SNIPPET))
+    for label, snippet in targets:
+        median, minimum = measure(snippet, args.repeat)
+        print(f"{label:<45}{median * 1000:>14.1f}{minimum * 1000:>12.1f}")
+
+    if args.importtime:
+        print("\nSlowest imports of sc (cumulative):")
+        for cumulative_us, name in slowest_imports('sc'):
+            print(f"{cumulative_us / 1000:>10.1f} ms  {name}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+Supply chain dashboard internals. `sc.py` is the Streamlit entry point; the
+modules here are imported on first use so a cold start only pays for what the
+current page needs.
+"""
@@ -0,0 +1,353 @@
+"""Aggregation of the uploaded snapshots into the dashboard payload."""
+
+import pandas as pd
+
+from supply_chain.cube import query_cube
+from supply_chain.dummy import generate_dummy_data
+from supply_chain.history import DeltaHistoryStore
+from supply_chain.parallel import AGGREGATION_WORKERS, carried_sections, compute_snapshot_sections, map_snapshot_partials, snapshots_by_date
+from supply_chain.processing import expand_snapshots
+from supply_chain.quality import build_quality_evolution
+from supply_chain.replenishment import build_replenishment_inputs
+from supply_chain.retention import update_archive
+from supply_chain.rolling import build_rolling_metrics_data, update_rolling_state
+from supply_chain.scenario import build_scenario_base
+from supply_chain.timeseries import build_item_matrix, build_position_matrix
+from supply_chain.transitions import STATUS_COLORS, compute_status_transitions
+from supply_chain.turnover import build_turnover_evolution, rank_slow_movers, snapshot_period_days, turnover_ratios
+
+# --- Data Aggregation and Dashboard Data Generation (for all uploaded files) ---
+
+def status_mode_by_item(snapshot_df):
+    """
+    Most frequent status of each item, the alphabetically first on ties (as
+    Series.mode()[0]), from one grouped count rather than a Python call per item.
+    """
+    counts = snapshot_df.groupby(['Item', 'Calculated Stock Status'], sort=True).size().reset_index(name='positions')
+    counts = counts.sort_values(['Item', 'positions'], ascending=[True, False], kind='stable') # Ties keep status order
+    return counts.drop_duplicates('Item').set_index('Item')['Calculated Stock Status']
+
+def aggregate_and_generate_dashboard_data(all_dfs, rolling_state=None, progress_callback=None, policy=None, archive=None,
+                                          sections=None, workers=AGGREGATION_WORKERS):
+    """
+    Aggregates data from multiple DataFrames (each with a date) and generates
+    the structured data needed for the dashboard. `rolling_state` is the
+    previous run's rolling-metrics state, extended incrementally when given.
+    `progress_callback(fraction, stage)` is called as each section completes.
+    `policy` is the stock policy the snapshots were classified under.
+    `archive` is the previous run's snapshot archive, extended and compacted
+    like the rolling state. `sections` are the previous run's per-snapshot
+    page sections, reused for unchanged snapshots. Whatever the previous state
+    does not cover is aggregated per month on up to `workers` processes when it
+    is large (see map_snapshot_partials), with the same results.
+    """
+    report_progress = progress_callback or (lambda fraction, stage: None)
+    if not all_dfs:
+        return None
+
+    report_progress(0.0, "Combining snapshots")
+
+    # Concatenate all individual DataFrames into a single master DataFrame
+    master_df = pd.concat(all_dfs, ignore_index=True)
+    master_df['Date'] = pd.to_datetime(master_df['Date'])
+    master_df.sort_values(by='Date', inplace=True) # Ensure chronological order
+
+    # Get data for the latest date for overall KPIs and current status
+    latest_date = master_df['Date'].max()
+    current_df = master_df[master_df['Date'] == latest_date].copy()
+
+    if current_df.empty:
+        return None
+
+    # Per-snapshot aggregations of a large history are mapped over month partitions on a process pool
+    report_progress(0.02, "Aggregating snapshots")
+    mapped = map_snapshot_partials(all_dfs, policy, workers, archive=archive, rolling_state=rolling_state, sections=sections)
+    partials, mapped_history = mapped if mapped is not None else ({}, None)
+
+    def snapshot_partials(section):
+        return {snapshot_date: partial[section] for snapshot_date, partial in partials.items() if section in partial} or None
+
+    # Per-snapshot page sections: mapped above, carried over from the previous run, or computed (cached)
+    snapshot_sections = {}
+    for snapshot_date, snapshot_dfs in snapshots_by_date(all_dfs).items():
+        last_df = snapshot_dfs[-1] # Later uploads of a date replace earlier ones in the per-page sections
+        snapshot_sections[snapshot_date] = (
+            partials.get(snapshot_date, {}).get('sections')
+            or carried_sections(sections, snapshot_date, last_df)
+            or compute_snapshot_sections(last_df)
+        )
+
+    # Older snapshots are compacted into coarser tiers; evolution series read across the tiers
+    report_progress(0.05, "Compacting history")
+    archive = update_archive(archive, all_dfs, policy, snapshot_partials('archive'))
+
+    # Small aggregates are rolled up from the per-snapshot cube instead of scanning rows
+    cube = archive.cube
+
+    # --- KPIs (from the cube at the latest date) ---
+    current_totals = query_cube(cube, [], date=latest_date)
+    total_inventory_value = current_totals['inventoryValue']
+    total_missing_stock_amount = current_totals['missingAmount']
+    total_excess_stock_value = current_totals['excessValue']
+    total_items_count = len(current_df['Item'].unique()) # Count unique items
+    total_positions_count = len(current_df) # Total rows in current snapshot
+
+    # --- Inventory Status Breakdown (from the cube at the latest date) ---
+    current_status = query_cube(cube, ['status'], date=latest_date)
+    inventory_status_breakdown = current_status.sort_values('positions', ascending=False, kind='stable')[['status', 'positions']]
+    inventory_status_breakdown.columns = ['name', 'value']
+    inventory_status_breakdown['color'] = inventory_status_breakdown['name'].map(STATUS_COLORS)
+
+    # --- Executive Summary ---
+    report_progress(0.1, "Executive summary")
+    executive_summary_data = {
+        'inventoryEvolution': [],
+        'warehouseSummary': [],
+        'itemEvolution': [],
+    }
+
+    # Inventory Evolution (across all dates)
+    monthly_cube = query_cube(cube, ['Month'])
+    monthly_cube['month'] = monthly_cube['Month'].dt.strftime('%b %y')
+    executive_summary_data['inventoryEvolution'] = monthly_cube[['month', 'inventoryValue']].rename(columns={'inventoryValue': 'value'}).to_dict('records')
+
+    # Item Evolution (across all dates)
+    monthly_items = archive.monthly_items()
+    monthly_items['month'] = monthly_items['Month'].dt.strftime('%b %y')
+    executive_summary_data['itemEvolution'] = monthly_items[['month', 'items']].to_dict('records')
+
+    # Warehouse Summary (from current_df)
+    warehouse_grouped_current = query_cube(cube, ['Warehouse'], date=latest_date).rename(columns={
+        'excessValue': 'excessStock',
+        'missingAmount': 'missingStock',
+    })
+    executive_summary_data['warehouseSummary'] = warehouse_grouped_current.rename(columns={'Warehouse': 'name'}).to_dict('records')
+
+    # --- Warehouses Data (from current_df) ---
+    report_progress(0.2, "Warehouses")
+    warehouses_data = []
+    warehouse_status_current = query_cube(cube, ['Warehouse', 'status'], date=latest_date)
+    for index, row in warehouse_grouped_current.iterrows():
+        wh_status = warehouse_status_current[warehouse_status_current['Warehouse'] == row['Warehouse']]
+        stock_breakdown_wh = wh_status.sort_values('positions', ascending=False, kind='stable')[['status', 'positions']]
+        stock_breakdown_wh.columns = ['name', 'value']
+        stock_breakdown_wh['color'] = stock_breakdown_wh['name'].map(STATUS_COLORS)
+        warehouses_data.append({
+            'name': row['Warehouse'],
+            'inventoryValue': row['inventoryValue'],
+            'excessStock': row['excessStock'],
+            'missingStock': row['missingStock'],
+            'positions': row['positions'],
+            'stockBreakdown': stock_breakdown_wh.to_dict('records')
+        })
+
+    # --- Availability Data (from current_df; stock-out forecasts come from the demand forecasts on the page) ---
+    availability_data_processed = {
+        'missingStockAmount': total_missing_stock_amount,
+        'excessStockValue': total_excess_stock_value,
+        'inventoryValue': total_inventory_value,
+        'currentInventoryByItem': current_df.groupby('Item').agg(
+            onHand=('On-hand Quantity', 'first'),
+        ).assign(status=status_mode_by_item(current_df)).reset_index().rename(columns={'Item': 'name'}).to_dict('records'),
+    }
+
+    # --- Excess Stock Data (from current_df and the cube for evolution) ---
+    report_progress(0.3, "Excess stock")
+    current_status_counts = current_status.set_index('status')['positions']
+    excess_stock_data_processed = {
+        'percentOverStock': (current_status_counts.get('OVER-STOCK', 0) / total_items_count * 100) if total_items_count > 0 else 0,
+        'excessStockValue': total_excess_stock_value,
+        'shareOfExcessStockValue': (total_excess_stock_value / total_inventory_value * 100) if total_inventory_value > 0 else 0,
+        'excessStockEvolution': [],
+        'highestExcessItems': [],
+    }
+    monthly_excess = monthly_cube[['month', 'inventoryValue', 'excessValue']].copy()
+    monthly_excess['excessShare'] = (monthly_excess['excessValue'] / monthly_excess['inventoryValue'] * 100).fillna(0)
+    excess_stock_data_processed['excessStockEvolution'] = monthly_excess[['month', 'inventoryValue', 'excessValue', 'excessShare']].to_dict('records')
+
+    highest_excess_items = current_df.groupby('Item')['Excess Stock Value'].sum().sort_values(ascending=False).reset_index()
+    highest_excess_items.columns = ['name', 'excessValue']
+    total_excess_sum = highest_excess_items['excessValue'].sum()
+    highest_excess_items['share'] = (highest_excess_items['excessValue'] / total_excess_sum * 100).fillna(0) if total_excess_sum > 0 else 0
+
+    # --- Turnover, Sell-through and GMROI (cached per snapshot, ratios over the summed inputs) ---
+    turnover_by_date = {snapshot_date.date(): parts['turnover'] for snapshot_date, parts in snapshot_sections.items()}
+    period_days = snapshot_period_days(list(turnover_by_date))
+    latest_turnover = turnover_by_date.get(latest_date.date()) or {}
+    turnover_data_processed = {
+        'periodDays': period_days,
+        'latest': {dim: turnover_ratios(totals, period_days) for dim, totals in latest_turnover.items()},
+        'slowMovers': pd.DataFrame(),
+        'evolution': build_turnover_evolution(turnover_by_date, period_days),
+    }
+    if 'Item' in turnover_data_processed['latest']:
+        item_turnover = turnover_data_processed['latest']['Item'].merge(
+            highest_excess_items[['name', 'excessValue']].rename(columns={'name': 'Item'}), on='Item', how='left')
+        turnover_data_processed['slowMovers'] = rank_slow_movers(item_turnover)
+        # Sell-through and days of inventory tell slow-moving excess from high-volume stock
+        highest_excess_items = highest_excess_items.merge(
+            item_turnover[['Item', 'sellThrough', 'daysOfInventory']].rename(columns={'Item': 'name'}), on='name', how='left')
+    excess_stock_data_processed['highestExcessItems'] = highest_excess_items.head(6).to_dict('records')
+
+    # --- Missing Stock Data (from current_df and the cube for evolution) ---
+    report_progress(0.4, "Missing stock")
+    missing_stock_data_processed = {
+        'percentBelowSafetyStock': (current_status_counts.get('BELOW-SAFETY-STOCK', 0) / total_items_count * 100) if total_items_count > 0 else 0,
+        'percentOutOfStock': (current_status_counts.get('STOCK-OUT', 0) / total_items_count * 100) if total_items_count > 0 else 0,
+        'amountToRefill': total_missing_stock_amount,
+        'evolutionOfMissingStockItems': [],
+        'evolutionOfMissingStockAmount': [],
+        'mostImportantMissingItems': [],
+    }
+    monthly_missing_items = query_cube(cube[cube['status'].isin(['STOCK-OUT', 'BELOW-SAFETY-STOCK'])], ['Month'])
+    monthly_missing_items['month'] = monthly_missing_items['Month'].dt.strftime('%b')
+    missing_stock_data_processed['evolutionOfMissingStockItems'] = monthly_missing_items[['month', 'positions']].rename(columns={'positions': 'items'}).to_dict('records')
+
+    monthly_missing_amount = monthly_cube[['Month', 'missingAmount']].copy()
+    monthly_missing_amount['month'] = monthly_missing_amount['Month'].dt.strftime('%b')
+    missing_stock_data_processed['evolutionOfMissingStockAmount'] = monthly_missing_amount[['month', 'missingAmount']].rename(columns={'missingAmount': 'amount'}).to_dict('records')
+
+    most_important_missing_items = current_df.groupby('Item').agg(
+        amount=('Missing Stock Amount', 'sum'),
+    ).assign(status=status_mode_by_item(current_df)).sort_values(by='amount', ascending=False).reset_index().rename(columns={'Item': 'name'})
+    missing_stock_data_processed['mostImportantMissingItems'] = most_important_missing_items[most_important_missing_items['amount'] > 0].head(5).to_dict('records')
+
+    # --- Historical Status Data (from master_df) ---
+    report_progress(0.5, "Historical status")
+    historical_status_data_processed = {
+        'stockStatusOverview': { # Based on current_df for consistency with other KPIs
+            'stockOut': missing_stock_data_processed['percentOutOfStock'],
+            'belowSafetyStock': missing_stock_data_processed['percentBelowSafetyStock'],
+            'atStock': (current_status_counts.get('AT-STOCK', 0) / total_items_count * 100) if total_items_count > 0 else 0,
+            'overStock': excess_stock_data_processed['percentOverStock'],
+        },
+        'evolutionInPositionStatus': [],
+        'mostInventoryIssues': [],
+    }
+    statuses_by_item = master_df.sort_values('Date', kind='stable').groupby('Item')['Calculated Stock Status'].agg(list)
+    historical_status_data_processed['evolutionInPositionStatus'] = [
+        {'item': item, 'statuses': statuses} for item, statuses in statuses_by_item.items()
+    ]
+    historical_status_data_processed['transitions'] = compute_status_transitions(master_df)
+
+    issue_df = current_df[current_df['Calculated Stock Status'].isin(['STOCK-OUT', 'BELOW-SAFETY-STOCK'])]
+    issue_items = issue_df.groupby('Item').agg(
+        positions=('Item', 'count'),
+    ).assign(status=status_mode_by_item(issue_df)).sort_values(by='positions', ascending=False).reset_index().rename(columns={'Item': 'name'})
+    historical_status_data_processed['mostInventoryIssues'] = issue_items.head(5).to_dict('records')
+
+    # --- Rolling-Window Metrics (incremental over appended snapshots) ---
+    report_progress(0.6, "Rolling metrics")
+    rolling_state = update_rolling_state(rolling_state, all_dfs, snapshot_partials('rolling'))
+    rolling_metrics_data_processed = build_rolling_metrics_data(rolling_state)
+
+    # --- Logistics Data (cached per snapshot) ---
+    report_progress(0.7, "Logistics")
+    logistics_data_processed = {snapshot_date.date(): parts['logistics'] for snapshot_date, parts in snapshot_sections.items()}
+
+    # --- Quality Scorecards (cached per snapshot, evolution stacked from the scorecards) ---
+    report_progress(0.75, "Quality scorecards")
+    quality_by_date = {snapshot_date.date(): parts['quality'] for snapshot_date, parts in snapshot_sections.items()}
+    quality_data_processed = {
+        'bySnapshot': quality_by_date,
+        'evolution': build_quality_evolution(quality_by_date),
+    }
+
+    # --- Position x Date Quantity and Item x Date Sales Matrices (anomalies, forecasts) ---
+    position_matrix = build_position_matrix(master_df)
+    sales_matrix = build_item_matrix(master_df, 'Number of products sold')
+
+    # --- Scenario Base Arrays (what-if recomputation of the latest KPIs) ---
+    scenario_base = build_scenario_base(current_df, policy)
+
+    # --- Replenishment Inputs (engine runs on the page with the selected policy) ---
+    replenishment_inputs = build_replenishment_inputs(master_df, current_df)
+
+    # --- Stock Coverage Data (dummy) ---
+    stock_coverage_data_processed = generate_dummy_data()['stockCoverage']
+
+    # --- Item Deep-dive Data (select first item from current_df for simplicity) ---
+    item_deep_dive_data_processed = {}
+    if not current_df.empty:
+        first_item_row = current_df.iloc[0]
+        item_deep_dive_data_processed = {
+            'selectedItem': first_item_row.get('Item', 'N/A'),
+            'itemFamily': first_item_row.get('Item Family', 'N/A'),
+            'stockStatus': {
+                'onHandQty': first_item_row.get('On-hand Quantity', 0),
+                'inventoryValue': first_item_row.get('Inventory Value', 0),
+                'excessStock': first_item_row.get('Excess Stock Value', 0),
+                'missingStock': first_item_row.get('Missing Stock Amount', 0),
+            },
+            'warehouseBreakdown': current_df[current_df['Item'] == first_item_row['Item']].groupby('Warehouse').agg(
+                onHand=('On-hand Quantity', 'sum'),
+                value=('Inventory Value', 'sum'),
+                excess=('Excess Stock Value', 'sum'),
+                missing=('Missing Stock Amount', 'sum'),
+            ).reset_index().rename(columns={'Warehouse': 'wh'}).to_dict('records'),
+        }
+    else:
+        item_deep_dive_data_processed = generate_dummy_data()['itemDeepDive']
+
+    # --- Adhoc Analysis Data (from master_df) ---
+    report_progress(0.9, "Adhoc analysis")
+    adhoc_analysis_data_processed = {
+        'inventoryValueTrends': executive_summary_data['inventoryEvolution'],
+        'inventoryValueByItemFamily': [],
+        'paretoAnalysis': [],
+    }
+    item_family_value = query_cube(cube, ['Item Family'])[['Item Family', 'inventoryValue']]
+    item_family_value.columns = ['name', 'value']
+    total_inv_value_adhoc = item_family_value['value'].sum()
+    item_family_value['share'] = (item_family_value['value'] / total_inv_value_adhoc * 100).fillna(0) if total_inv_value_adhoc > 0 else 0
+    adhoc_analysis_data_processed['inventoryValueByItemFamily'] = item_family_value.to_dict('records')
+
+    pareto_items = archive.item_totals('inventoryValue').sort_values(ascending=False).reset_index()
+    pareto_items.columns = ['name', 'value']
+    adhoc_analysis_data_processed['paretoAnalysis'] = pareto_items.head(7).to_dict('records')
+
+    return {
+        'kpis': {
+            'inventoryValue': total_inventory_value,
+            'missingStockAmount': total_missing_stock_amount,
+            'excessStockValue': total_excess_stock_value,
+        },
+        'inventoryStatus': {
+            'totalItems': total_items_count,
+            'totalPositions': total_positions_count,
+            'breakdown': inventory_status_breakdown.to_dict('records'),
+        },
+        'executiveSummary': executive_summary_data,
+        'warehouses': warehouses_data,
+        'availability': availability_data_processed,
+        'excessStock': excess_stock_data_processed,
+        'missingStock': missing_stock_data_processed,
+        'historicalStatus': historical_status_data_processed,
+        'stockCoverage': stock_coverage_data_processed,
+        'itemDeepDive': item_deep_dive_data_processed,
+        'adhocAnalysis': adhoc_analysis_data_processed,
+        'logistics': logistics_data_processed,
+        'quality': quality_data_processed,
+        'turnover': turnover_data_processed,
+        'rollingMetrics': rolling_metrics_data_processed,
+        'replenishmentInputs': replenishment_inputs,
+        'salesPeriodDays': period_days, # Period 'Number of products sold' covers, for turnover and replenishment alike
+        'rollingState': rolling_state, # Extended incrementally on the next aggregation
+        'isLoadedFromCSV': True,
+        'positionMatrix': position_matrix, # On-hand quantity per (item, warehouse) x snapshot date
+        'salesMatrix': sales_matrix, # Products sold per item x snapshot date (None without the column)
+        'scenarioBase': scenario_base, # Latest-snapshot arrays for the what-if simulator
+        'stockPolicy': policy, # Rule table the statuses were derived with (None: built-in defaults)
+        'history': mapped_history or DeltaHistoryStore.from_snapshots(all_dfs, policy=policy), # Delta-encoded snapshots for day-to-day comparison, SQL and export
+        'cube': cube, # (date, warehouse, family, status) aggregates for roll-ups and drill-downs
+        'archive': archive, # Snapshot history at decreasing resolution, extended incrementally on the next aggregation
+        'snapshotSections': snapshot_sections, # Per-snapshot turnover, logistics and quality inputs, reused on the next aggregation
+    }
+
+def aggregate_compact_snapshots(compact_snapshots, policy=None, **kwargs):
+    """
+    aggregate_and_generate_dashboard_data over compact snapshots, materialized
+    under `policy` first. Background jobs run this so the full frames are only
+    built on the worker thread, not on every rerun of the UI.
+    """
+    return aggregate_and_generate_dashboard_data(expand_snapshots(compact_snapshots, policy), policy=policy, **kwargs)
@@ -0,0 +1,129 @@
+"""Anomaly detection on snapshot-to-snapshot quantity changes."""
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- Change Anomaly Detection (vectorized over the position x date matrix) ---
+
+ANOMALY_METHODS = ['Robust (median / MAD)', 'Rolling z-score']
+ANOMALY_DEFAULTS = {'window': 8, 'threshold': 3.5, 'min_history': 3}
+ANOMALY_MIN_SCALE = 1.0 # Quantity units
+MAD_TO_SIGMA = 1.4826 # Scales the MAD to a standard deviation for normally distributed changes
+
+def window_median(windows, count):
+    """
+    Median over the last axis ignoring NaN, for `count` valid values per window:
+    NaN sorts last, so the median sits at fixed positions of the sorted window
+    (no per-row fallback as in np.nanmedian).
+    """
+    ordered = np.sort(windows, axis=-1)
+    last = windows.shape[-1] - 1
+    low = np.clip((count - 1) // 2, 0, last)[..., None]
+    high = np.clip(count // 2, 0, last)[..., None]
+    median = 0.5 * (np.take_along_axis(ordered, low, axis=-1) + np.take_along_axis(ordered, high, axis=-1))[..., 0]
+    return np.where(count > 0, median, np.nan)
+
+def rolling_baseline(changes, window, method):
+    """
+    Expected change and spread of every (position, change) cell, from the
+    previous `window` changes of the same position only (the current change is
+    excluded). Returns (center, scale, history_count), each shaped like `changes`.
+    """
+    n_positions, n_changes = changes.shape
+    valid = ~np.isnan(changes)
+    if method == 'Rolling z-score':
+        # Windowed sums from cumulative sums: O(positions x changes) whatever the window
+        filled = np.where(valid, changes, 0.0)
+        pad = np.zeros((n_positions, 1))
+        csum = np.concatenate([pad, np.cumsum(filled, axis=1)], axis=1)
+        csq = np.concatenate([pad, np.cumsum(filled ** 2, axis=1)], axis=1)
+        ccount = np.concatenate([pad, np.cumsum(valid, axis=1)], axis=1)
+        end = np.arange(n_changes)
+        start = np.maximum(end - window, 0)
+        count = ccount[:, end] - ccount[:, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            center = (csum[:, end] - csum[:, start]) / count
+            variance = (csq[:, end] - csq[:, start]) / count - center ** 2
+            scale = np.sqrt(np.maximum(variance, 0) * count / np.maximum(count - 1, 1))
+        return center, scale, count
+
+    # Robust: median and MAD over a sliding window of the previous changes
+    padded = np.concatenate([np.full((n_positions, window), np.nan), changes], axis=1)
+    windows = sliding_window_view(padded, window, axis=1)[:, :n_changes] # windows[:, t] = changes t-window .. t-1
+    count = (~np.isnan(windows)).sum(axis=2)
+    center = window_median(windows, count)
+    scale = window_median(np.abs(windows - center[:, :, None]), count) * MAD_TO_SIGMA
+    return center, scale, count
+
+ANOMALY_TYPES = ['Sudden stock-out', 'Data-entry spike', 'Shrinkage', 'Unusual increase']
+ANOMALY_CHUNK_POSITIONS = 100000 # Positions scored per block, bounding the memory of the window arrays
+
+def score_change_block(values, method, window, threshold, min_history):
+    """
+    Anomaly type code (0 = normal, i + 1 = ANOMALY_TYPES[i]) and score of every
+    change of a block of positions, plus the arrays needed to describe them.
+    """
+    previous, current = values[:, :-1], values[:, 1:]
+    changes = current - previous
+    center, scale, count = rolling_baseline(changes, window, method)
+
+    # The spread is floored at one unit, so a flat history does not make every small move infinitely unusual
+    score = np.abs(changes - center) / np.maximum(np.nan_to_num(scale), ANOMALY_MIN_SCALE)
+    score[(count < min_history) | np.isnan(changes)] = np.nan
+
+    abnormal = score >= threshold
+    # A drop to zero is only a sudden stock-out when the change itself is abnormal, not an ordinary sell-through
+    stock_out = abnormal & (previous > 0) & (current <= 0)
+    # Reversed by the next change: opposite sign and at least half the size
+    next_change = np.concatenate([changes[:, 1:], np.full((changes.shape[0], 1), np.nan)], axis=1)
+    reverted = (np.sign(next_change) == -np.sign(changes)) & (np.abs(next_change) >= 0.5 * np.abs(changes))
+    spike = abnormal & reverted
+    # The change that undoes a spike is part of the same event, not a second anomaly
+    reverting = np.concatenate([np.zeros((changes.shape[0], 1), dtype=bool), spike[:, :-1]], axis=1)
+
+    code = np.select(
+        [stock_out, spike, abnormal & ~reverting & (changes < 0), abnormal & ~reverting & (changes > 0)],
+        [1, 2, 3, 4],
+        default=0
+    ).astype(np.int8)
+    return code, score, previous, current, changes, center
+
+def detect_change_anomalies(position_matrix, method=ANOMALY_METHODS[0], window=ANOMALY_DEFAULTS['window'],
+                            threshold=ANOMALY_DEFAULTS['threshold'], min_history=ANOMALY_DEFAULTS['min_history']):
+    """
+    Scores every snapshot-to-snapshot quantity change against the position's own
+    recent changes and returns the anomalous ones, most abnormal first:
+
+    - Sudden stock-out: an abnormal drop from stock to zero or below
+    - Data-entry spike: an abnormal change that the next snapshot reverses
+    - Shrinkage / Unusual increase: other abnormal decreases / increases
+
+    All steps are array operations over blocks of the position x date matrix;
+    no Python loop runs per position.
+    """
+    values = position_matrix['values']
+    columns = ['Item', 'Warehouse', 'Date', 'Previous Quantity', 'Quantity', 'Quantity Change', 'Expected Change', 'Score', 'Type']
+    if values.shape[1] < 2:
+        return pd.DataFrame(columns=columns)
+
+    blocks = []
+    for start in range(0, values.shape[0], ANOMALY_CHUNK_POSITIONS):
+        block = values[start:start + ANOMALY_CHUNK_POSITIONS].astype(float)
+        code, score, previous, current, changes, center = score_change_block(block, method, window, threshold, min_history)
+        rows, cols = np.nonzero(code)
+        blocks.append(pd.DataFrame({
+            'Item': position_matrix['items'][start + rows],
+            'Warehouse': position_matrix['warehouses'][start + rows],
+            'Date': position_matrix['dates'][cols + 1],
+            'Previous Quantity': previous[rows, cols],
+            'Quantity': current[rows, cols],
+            'Quantity Change': changes[rows, cols],
+            'Expected Change': center[rows, cols],
+            'Score': score[rows, cols],
+            'Type': np.asarray(ANOMALY_TYPES, dtype=object)[code[rows, cols] - 1],
+        }, columns=columns))
+
+    anomalies = pd.concat(blocks, ignore_index=True)
+    return anomalies.sort_values(['Score', 'Previous Quantity'], ascending=[False, False], na_position='last',
+                                 kind='stable').reset_index(drop=True)
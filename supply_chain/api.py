@@ -0,0 +1,211 @@
+"""Local HTTP JSON API serving dashboard sections from the shared cache (standard library only)."""
+
+import streamlit as st
+import datetime
+import gzip
+import http.server
+import io
+import json
+import math
+import os
+import threading
+import urllib.parse
+
+from supply_chain.cache import content_hash, get_shared_cache
+
+# --- Local JSON API ---
+
+API_SECTIONS = ['kpis', 'inventoryStatus', 'warehouses', 'missingStock']
+API_HOST = os.environ.get('SC_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('SC_API_PORT', '0')) # 0 leaves the API off
+API_PUBLIC_URL = os.environ.get('SC_API_PUBLIC_URL', '').rstrip('/') # Base URL browsers reach the API at, if any
+API_GZIP_MIN_BYTES = 512 # Smaller bodies are sent uncompressed
+API_EXPORT_BUFFER_BYTES = 256 * 1024 # Export bytes sent per HTTP chunk
+
+def to_json_value(value):
+    """
+    Converts a payload section into plain JSON types: NumPy scalars and arrays,
+    DataFrames (as records), dates and periods; NaN and infinities become null.
+    Duck-typed so neither pandas nor NumPy is imported here.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if callable(getattr(value, 'to_dict', None)) and hasattr(value, 'columns'): # DataFrame
+        return to_json_value(value.to_dict('records'))
+    if callable(getattr(value, 'tolist', None)): # NumPy scalar or array, Series
+        return to_json_value(value.tolist())
+    if callable(getattr(value, 'isoformat', None)):
+        return value.isoformat()
+    return str(value)
+
+class ChunkedResponseWriter(io.RawIOBase):
+    """Write-only stream sending everything written to it as HTTP/1.1 chunks (unseekable, so zip archives stream)."""
+
+    def __init__(self, wfile):
+        super().__init__()
+        self.wfile = wfile
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + bytes(data) + b"\r\n")
+        return len(data)
+
+    def finish(self):
+        """Sends the terminating chunk."""
+        self.wfile.write(b"0\r\n\r\n")
+
+class DashboardApiServer(http.server.ThreadingHTTPServer):
+    """
+    Serves `/api/<section>` of the most recently published dashboard (or of
+    `?dashboard=<key>`), `/api` as an index and `/api/export`, which streams
+    the export of the Export page with chunked transfer encoding. Cached payloads never change
+    under a key, so the ETag is derived from the key alone: a matching
+    If-None-Match is answered with 304 without touching the payload. Encoded
+    bodies (plain and gzip) are kept in the shared cache next to the payload.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, cache):
+        super().__init__(address, DashboardApiHandler)
+        self.cache = cache
+        self.latest_key = None
+
+    def publish(self, dashboard_key):
+        """Marks the dashboard served by default."""
+        self.latest_key = dashboard_key
+
+    def encoded_section(self, dashboard_key, section):
+        """(JSON body, gzipped body) of one section, or None when the dashboard is not cached."""
+        encoded_key = content_hash('api', dashboard_key, section)
+        encoded = self.cache.get(encoded_key)
+        if encoded is None:
+            data = self.cache.get(dashboard_key)
+            if data is None or section not in data:
+                return None
+            body = json.dumps(to_json_value(data[section]), separators=(',', ':'), allow_nan=False).encode('utf-8')
+            encoded = self.cache.put(encoded_key, (body, gzip.compress(body, compresslevel=6)))
+        return encoded
+
+class DashboardApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-alive, so polling clients reuse their connection
+    disable_nagle_algorithm = True # Headers and body go out as separate writes
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts or parts[0] != 'api' or len(parts) > 2:
+            return self.send_json(404, {'error': 'Not found'})
+        dashboard_key = query.get('dashboard', [self.server.latest_key])[0]
+        if len(parts) == 1:
+            return self.send_json(200, {'dashboard': dashboard_key, 'sections': API_SECTIONS})
+
+        section = parts[1]
+        if section == 'export':
+            return self.send_export(dashboard_key, query)
+        if section not in API_SECTIONS:
+            return self.send_json(404, {'error': f"Unknown section '{section}'", 'sections': API_SECTIONS})
+        if dashboard_key is None:
+            return self.send_json(404, {'error': 'No dashboard has been computed yet'})
+
+        etag = f'"{content_hash("api", dashboard_key, section)[:32]}"'
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        encoded = self.server.encoded_section(dashboard_key, section)
+        if encoded is None:
+            return self.send_json(404, {'error': 'Dashboard not cached (evicted or unknown key)'})
+        body, gzipped = encoded
+        use_gzip = len(body) >= API_GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', '')
+        self.send_body(200, gzipped if use_gzip else body, etag=etag, encoding='gzip' if use_gzip else None)
+
+    def send_export(self, dashboard_key, query):
+        """
+        Streams `?format=` (default CSV) of the `?tables=` (comma-separated,
+        default all) of a dashboard, with the comparison of `?date1=&date2=`.
+        Tables are built and written chunk by chunk straight into the response.
+        """
+        from supply_chain.export import EXPORT_FORMATS, build_export_tables, export_file_type, export_table_builders, openpyxl, pa, write_export
+
+        data = self.server.cache.get(dashboard_key) if dashboard_key is not None else None
+        if data is None:
+            return self.send_json(404, {'error': 'Dashboard not cached (evicted or unknown key)'})
+        export_format = query.get('format', ['CSV'])[0]
+        if export_format not in EXPORT_FORMATS:
+            return self.send_json(400, {'error': f"Unknown format '{export_format}'", 'formats': EXPORT_FORMATS})
+        if (export_format == 'Parquet' and pa is None) or (export_format == 'Excel' and openpyxl is None):
+            return self.send_json(501, {'error': f"{export_format} export is not available on this server"})
+        comparison_dates = None
+        if 'date1' in query and 'date2' in query:
+            try:
+                comparison_dates = (datetime.date.fromisoformat(query['date1'][0]), datetime.date.fromisoformat(query['date2'][0]))
+            except ValueError:
+                return self.send_json(400, {'error': 'date1 and date2 must be ISO dates'})
+        builders = export_table_builders(data, comparison_dates)
+        names = [name for name in query['tables'][0].split(',') if name] if 'tables' in query else list(builders)
+        unknown = [name for name in names if name not in builders]
+        if unknown or not names:
+            return self.send_json(400, {'error': f"Unknown tables: {', '.join(unknown)}" if unknown else 'No tables selected', 'tables': list(builders)})
+
+        extension, mime = export_file_type(export_format)
+        self.send_response(200)
+        self.send_header('Content-Type', mime)
+        self.send_header('Content-Disposition', f'attachment; filename="supply_chain_export_{datetime.date.today().strftime("%Y%m%d")}.{extension}"')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        response = ChunkedResponseWriter(self.wfile)
+        try:
+            with io.BufferedWriter(response, buffer_size=API_EXPORT_BUFFER_BYTES) as stream:
+                write_export(build_export_tables(builders, names), export_format, stream)
+                stream.flush()
+                response.finish()
+        except Exception:
+            # Headers are sent: dropping the connection without the final chunk marks the download as failed
+            self.close_connection = True
+
+    def send_json(self, status, value):
+        self.send_body(status, json.dumps(value).encode('utf-8'))
+
+    def send_body(self, status, body, etag=None, encoding=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache') # Clients revalidate with If-None-Match
+        self.send_header('Vary', 'Accept-Encoding')
+        if etag:
+            self.send_header('ETag', etag)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Polling clients would flood the Streamlit log
+
+def start_api_server(host, port, cache):
+    """Starts a DashboardApiServer on a daemon thread and returns it (port 0 picks a free port)."""
+    server = DashboardApiServer((host, port), cache)
+    threading.Thread(target=server.serve_forever, name='sc-api', daemon=True).start()
+    return server
+
+@st.cache_resource
+def get_api_server():
+    """The API server of this Streamlit process, started once when SC_API_PORT is set (else None)."""
+    if not API_PORT:
+        return None
+    return start_api_server(API_HOST, API_PORT, get_shared_cache())
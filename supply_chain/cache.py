@@ -0,0 +1,180 @@
+"""Process-wide snapshot cache and background aggregation jobs (no pandas at import)."""
+
+import streamlit as st
+import collections
+import concurrent.futures
+import hashlib
+import os
+import sys
+import threading
+import time
+
+# --- Shared Cross-Session Cache ---
+
+# Memory budget of the process-wide snapshot cache, in megabytes
+SHARED_CACHE_BUDGET_MB = int(os.environ.get('SC_SHARED_CACHE_MB', '1024'))
+
+def estimate_nbytes(value):
+    """Approximate memory footprint of a cached value (DataFrames, arrays and nested containers)."""
+    if callable(getattr(value, 'nbytes', None)):
+        return value.nbytes() # Stores that know their own footprint (compact snapshots, history)
+    if callable(getattr(value, 'memory_usage', None)): # DataFrame / Series, duck-typed so pandas is not imported here
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if isinstance(getattr(value, 'nbytes', None), int): # NumPy arrays
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+class SharedSnapshotCache:
+    """
+    Process-wide LRU cache of immutable processed snapshots and dashboard
+    aggregates, keyed by content hash. Entries are evicted least-recently-used
+    first once the memory budget is exceeded. Cached values are shared by all
+    sessions and must never be modified in place.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = estimate_nbytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.used_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, nbytes)
+            self.used_bytes += nbytes
+            # Never evict the entry just added, even if it alone exceeds the budget
+            while self.used_bytes > self.budget_bytes and len(self.entries) > 1:
+                _, (_, evicted_nbytes) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted_nbytes
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'usedBytes': self.used_bytes, 'budgetBytes': self.budget_bytes}
+
+@st.cache_resource
+def get_shared_cache():
+    """Returns the single cache instance shared by every session of this server process."""
+    return SharedSnapshotCache(SHARED_CACHE_BUDGET_MB * 1024 * 1024)
+
+def content_hash(*parts):
+    """Stable hex digest of raw bytes / strings, used as a cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def dashboard_derived(kind, compute, *params):
+    """
+    Result of `compute()` for the dashboard shown in this session and `params`,
+    kept in the shared cache under the dashboard's key so other sessions and
+    reruns reuse it. Computed directly when no dashboard key is known yet.
+    """
+    dashboard_key = st.session_state.get('dashboard_key')
+    if dashboard_key is None:
+        return compute()
+    shared_cache = get_shared_cache()
+    key = content_hash(kind, dashboard_key, *params)
+    value = shared_cache.get(key)
+    if value is None:
+        value = shared_cache.put(key, compute())
+    return value
+
+def snapshot_derived(kind, fingerprint, compute):
+    """
+    Result of `compute()` for the snapshot whose content hash is `fingerprint`,
+    kept in the shared cache so any dashboard holding the same snapshot reuses it.
+    """
+    shared_cache = get_shared_cache()
+    key = content_hash(kind, fingerprint)
+    value = shared_cache.get(key)
+    if value is None:
+        value = shared_cache.put(key, compute())
+    return value
+
+# --- Background Recomputation ---
+
+# Worker threads shared by all sessions for heavy dashboard aggregation
+BACKGROUND_WORKERS = int(os.environ.get('SC_BACKGROUND_WORKERS', '2'))
+
+class BackgroundAggregator:
+    """
+    Runs dashboard aggregations on a shared thread pool so the UI keeps serving
+    the last good result meanwhile. Jobs are keyed like the shared cache, so
+    sessions asking for the same data attach to the same running job, and a
+    finished result is published to the shared cache. Only running jobs are
+    kept; a job that published nothing (no data, or an error) is handed once
+    more to the next `submit` for its key so the session can report it.
+    """
+
+    def __init__(self, max_workers, cache):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sc-aggregate')
+        self.cache = cache
+        self.jobs = {}
+        self.failed = {}
+        self.lock = threading.Lock()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Starts `func` for `key` unless a job for it is running or has an unreported failure; returns the job."""
+        with self.lock:
+            job = self.jobs.get(key) or self.failed.pop(key, None)
+            if job is None:
+                job = {'progress': 0.0, 'stage': 'Queued', 'started': time.monotonic(), 'error': None}
+                job['future'] = self.executor.submit(self.run, key, job, func, args, kwargs)
+                self.jobs[key] = job
+            return job
+
+    def run(self, key, job, func, args, kwargs):
+        def report(fraction, stage):
+            job['progress'] = fraction
+            job['stage'] = stage
+        result = None
+        try:
+            result = func(*args, progress_callback=report, **kwargs)
+            if result is not None:
+                self.cache.put(key, result)
+            report(1.0, 'Done')
+        except Exception as e:
+            # Only the message is kept: the traceback would pin the job's frames in memory
+            job['error'] = str(e) or type(e).__name__
+        finally:
+            with self.lock:
+                self.jobs.pop(key, None)
+                if result is None:
+                    self.failed[key] = job
+        return result
+
+    def discard(self, key):
+        """Forgets a failure the session has already reported."""
+        with self.lock:
+            self.failed.pop(key, None)
+
+@st.cache_resource
+def get_background_aggregator():
+    """Returns the aggregation worker pool shared by every session of this server process."""
+    return BackgroundAggregator(BACKGROUND_WORKERS, get_shared_cache())
+
+@st.fragment(run_every=1.0)
+def AggregationProgress(job):
+    """Polls a running aggregation job and reruns the app once its result is ready."""
+    if job['future'].done():
+        st.rerun()
+    elapsed = time.monotonic() - job['started']
+    st.progress(min(job['progress'], 1.0), text=f"{job['stage']} ({elapsed:.0f}s)")
@@ -0,0 +1,33 @@
+"""Day-to-day comparison of two snapshots."""
+
+# --- New Content for Day-to-Day Comparison ---
+
+def compute_day_to_day_comparison(history, date1, date2):
+    """
+    Compares on-hand quantity and inventory value per Item x Warehouse between two
+    snapshot dates, reconstructed from the delta-encoded history. Positions
+    missing on one date count as zero on that date.
+    """
+    suffix1 = date1.strftime("%Y%m%d")
+    suffix2 = date2.strftime("%Y%m%d")
+    columns = ['Item', 'Warehouse', 'On-hand Quantity', 'Inventory Value']
+    df_date1 = history.reconstruct(date1)[columns]
+    df_date2 = history.reconstruct(date2)[columns]
+
+    # Align and combine dataframes
+    comparison_df = df_date1.merge(
+        df_date2,
+        on=['Item', 'Warehouse'],
+        how='outer',
+        suffixes=(f'_{suffix1}', f'_{suffix2}')
+    )
+
+    # Fill NaN for items not present on a specific date with 0 quantity
+    value_cols = [f'{col}_{suffix}' for suffix in (suffix1, suffix2) for col in ('On-hand Quantity', 'Inventory Value')]
+    comparison_df[value_cols] = comparison_df[value_cols].fillna(0)
+
+    comparison_df['Quantity Change'] = comparison_df[f'On-hand Quantity_{suffix2}'] - comparison_df[f'On-hand Quantity_{suffix1}']
+    comparison_df['Value Change'] = comparison_df[f'Inventory Value_{suffix2}'] - comparison_df[f'Inventory Value_{suffix1}']
+
+    return comparison_df[['Item', 'Warehouse', f'On-hand Quantity_{suffix1}', f'On-hand Quantity_{suffix2}',
+                          'Quantity Change', f'Inventory Value_{suffix1}', f'Inventory Value_{suffix2}', 'Value Change']]
@@ -0,0 +1,38 @@
+"""Pre-aggregated status cube."""
+
+# --- Pre-aggregated Status Cube ---
+
+CUBE_DIMENSIONS = ['Date', 'Warehouse', 'Item Family', 'status']
+CUBE_MEASURES = ['inventoryValue', 'excessValue', 'missingAmount', 'positions']
+
+def build_snapshot_cube(snapshot_df):
+    """
+    Aggregates one processed snapshot to (Date, Warehouse, Item Family, status)
+    granularity with summed value, excess, missing amount and position count.
+    Not cached: the snapshot archive keeps each snapshot's cube, so it is only
+    built when a snapshot is first archived.
+    """
+    cube = snapshot_df.groupby(['Date', 'Warehouse', 'Item Family', 'Calculated Stock Status'], observed=True, sort=False).agg(
+        inventoryValue=('Inventory Value', 'sum'),
+        excessValue=('Excess Stock Value', 'sum'),
+        missingAmount=('Missing Stock Amount', 'sum'),
+        positions=('Item', 'count'),
+    ).reset_index().rename(columns={'Calculated Stock Status': 'status'})
+    cube['Month'] = cube['Date'].dt.to_period('M')
+    return cube
+
+def query_cube(cube, by, date=None, **filters):
+    """
+    Rolls the cube up to the `by` dimensions (any of Date, Month, Warehouse,
+    Item Family, status), optionally restricted to one snapshot date and to
+    dimension values given as keyword filters, e.g. Warehouse='Mumbai'
+    (Item_Family for 'Item Family'). With no `by` dimensions, returns the totals.
+    """
+    subset = cube
+    if date is not None:
+        subset = subset[subset['Date'] == date]
+    for dim, value in filters.items():
+        subset = subset[subset[dim.replace('_', ' ')] == value]
+    if not by:
+        return subset[CUBE_MEASURES].sum()
+    return subset.groupby(by, observed=True, sort=True)[CUBE_MEASURES].sum().reset_index()
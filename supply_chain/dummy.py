@@ -0,0 +1,287 @@
+"""Fallback dummy dashboard payload."""
+
+import pandas as pd
+import datetime
+import numpy as np
+
+from supply_chain.turnover import TURNOVER_PERIOD_DAYS
+
+# --- Dummy Data Generation (Fallback) ---
+
+def generate_dummy_data():
+    """Generates realistic-looking dummy data for the dashboard."""
+    current_inventory_value = np.random.randint(20, 30) * 1000000
+    missing_stock_amount = np.random.randint(1, 7) * 1000000
+    excess_stock_value = np.random.randint(1, 3) * 1000000
+
+    total_items = np.random.randint(50, 100)
+    total_positions = np.random.randint(200, 300)
+
+    stock_out = int(total_items * (np.random.rand() * 0.1 + 0.05))
+    below_safety_stock = int(total_items * (np.random.rand() * 0.2 + 0.15))
+    at_stock = int(total_items * (np.random.rand() * 0.3 + 0.25))
+    over_stock = total_items - stock_out - below_safety_stock - at_stock
+
+    inventory_status_data = [
+        {'name': 'STOCK-OUT', 'value': stock_out, 'color': '#DC2626'},
+        {'name': 'BELOW SAFETY STOCK', 'value': below_safety_stock, 'color': '#F59E0B'},
+        {'name': 'AT-STOCK', 'value': at_stock, 'color': '#10B981'},
+        {'name': 'OVER-STOCK', 'value': over_stock, 'color': '#6366F1'},
+    ]
+
+    today = datetime.date.today()
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+    # Executive Summary Data
+    inventory_evolution_data = []
+    for i in range(12):
+        date = today - datetime.timedelta(days=30 * i)
+        inventory_evolution_data.append({
+            'month': f"{months[date.month - 1]} {date.year % 100}",
+            'value': np.random.randint(20, 28) * 1000000
+        })
+    inventory_evolution_data.reverse() # To show from older to newer
+
+    warehouse_summary_data = [
+        {'name': 'WH Seattle', 'inventoryValue': np.random.randint(4, 8) * 1000000, 'excessStock': np.random.rand() * 0.8 * 1000000, 'missingStock': np.random.rand() * 1.5 * 1000000, 'positions': np.random.randint(20, 50)},
+        {'name': 'WH Chicago', 'inventoryValue': np.random.randint(4, 8) * 1000000, 'excessStock': np.random.rand() * 0.8 * 1000000, 'missingStock': np.random.rand() * 1.5 * 1000000, 'positions': np.random.randint(20, 50)},
+        {'name': 'WH New Delhi', 'inventoryValue': np.random.randint(4, 8) * 1000000, 'excessStock': np.random.rand() * 0.8 * 1000000, 'missingStock': np.random.rand() * 1.5 * 1000000, 'positions': np.random.randint(20, 50)},
+        {'name': 'WH London', 'inventoryValue': np.random.randint(4, 8) * 1000000, 'excessStock': np.random.rand() * 0.8 * 1000000, 'missingStock': np.random.rand() * 1.5 * 1000000, 'positions': np.random.randint(20, 50)},
+        {'name': 'WH Istanbul', 'inventoryValue': np.random.randint(4, 8) * 1000000, 'excessStock': np.random.rand() * 0.8 * 1000000, 'missingStock': np.random.rand() * 1.5 * 1000000, 'positions': np.random.randint(20, 50)},
+    ]
+
+    item_evolution_data = []
+    for i in range(12):
+        date = today - datetime.timedelta(days=30 * i)
+        item_evolution_data.append({
+            'month': f"{months[date.month - 1]} {date.year % 100}",
+            'items': np.random.randint(15, 30)
+        })
+    item_evolution_data.reverse()
+
+    executive_summary_kpis = {
+        'inventory_value': current_inventory_value,
+        'missing_stock_amount': missing_stock_amount,
+        'excess_stock_value': excess_stock_value,
+    }
+
+    # Warehouses Data (simplified from executive_summary_data for consistency)
+    warehouse_chart_data = []
+    for wh in warehouse_summary_data:
+        warehouse_chart_data.append({
+            'name': wh['name'],
+            'inventoryValue': wh['inventoryValue'],
+            'excessStock': wh['excessStock'],
+            'missingStock': wh['missingStock'],
+            'positions': wh['positions'],
+            'stockBreakdown': [
+                {'name': 'OVER-STOCK', 'value': np.random.randint(5, 15), 'color': '#6366F1'},
+                {'name': 'AT-STOCK', 'value': np.random.randint(10, 20), 'color': '#10B981'},
+                {'name': 'BELOW-SAFETY-STOCK', 'value': np.random.randint(5, 15), 'color': '#F59E0B'},
+                {'name': 'STOCK-OUT', 'value': np.random.randint(1, 5), 'color': '#DC2626'},
+            ]
+        })
+
+    # Availability Data
+    availability_data = {
+        'missingStockAmount': missing_stock_amount,
+        'excessStockValue': excess_stock_value,
+        'inventoryValue': current_inventory_value,
+        'stockOutForecast': [
+            {'range': 'within 3 days', 'items': np.random.randint(1, 5)},
+            {'range': '4 to 10 days', 'items': np.random.randint(1, 5)},
+            {'range': '11 to 20 days', 'items': np.random.randint(1, 5)},
+            {'range': '21 to 30 days', 'items': np.random.randint(1, 5)},
+        ],
+        'itemsToStockOutSoon': [
+            {'name': 'Armanda ALW 400', 'days': np.random.randint(1, 30), 'forecast': 'STOCK-OUT'},
+            {'name': 'eBike 7', 'days': np.random.randint(1, 30), 'forecast': 'BELOW-SAFETY-STOCK'},
+            {'name': 'Armanda BMV 560E', 'days': np.random.randint(1, 30), 'forecast': 'STOCK-OUT'},
+            {'name': 'Zebra - Mitorina105', 'days': np.random.randint(1, 30), 'forecast': 'BELOW-SAFETY-STOCK'},
+            {'name': 'FlyFighter 120', 'days': np.random.randint(1, 30), 'forecast': 'STOCK-OUT'},
+        ],
+        'currentInventoryByItem': [
+            {'name': 'Armanda ALW 400', 'onHand': np.random.randint(10, 50), 'status': 'STOCK-OUT'},
+            {'name': 'eBike 7', 'onHand': np.random.randint(10, 50), 'status': 'BELOW-SAFETY-STOCK'},
+            {'name': 'FlyFighter 120', 'onHand': np.random.randint(10, 50), 'status': 'BELOW-SAFETY-STOCK'},
+            {'name': 'Armanda BMV 560E', 'onHand': np.random.randint(10, 50), 'status': 'AT-STOCK'},
+            {'name': 'Zebra - Mitorina105 C', 'onHand': np.random.randint(10, 50), 'status': 'OVER-STOCK'},
+        ],
+        'theoreticalOnHandQuantity': [{
+            'date': (today + datetime.timedelta(days=i)).strftime('%b %d'),
+            'value': np.random.randint(100, 300)
+        } for i in range(20)],
+    }
+
+    # Excess Stock Data
+    excess_stock_data = {
+        'percentOverStock': (np.random.rand() * 10) + 20,
+        'excessStockValue': excess_stock_value,
+        'shareOfExcessStockValue': (np.random.rand() * 5) + 1,
+        'excessStockEvolution': [{
+            'month': f"{months[((today - datetime.timedelta(days=30*i)).month - 1)]} {((today - datetime.timedelta(days=30*i)).year % 100)}",
+            'inventoryValue': np.random.randint(20, 28) * 1000000,
+            'excessValue': np.random.rand() * 1.5 * 1000000,
+            'excessShare': np.random.rand() * 5 + 1,
+        } for i in range(12)],
+        'highestExcessItems': [
+            {'name': 'Armanda TTR 900', 'excessValue': np.random.randint(100000, 300000), 'share': np.random.rand() * 10 + 20},
+            {'name': 'Hiraki F250', 'excessValue': np.random.randint(100000, 300000), 'share': np.random.rand() * 10 + 20},
+            {'name': 'Wedside 560', 'excessValue': np.random.randint(100000, 300000), 'share': np.random.rand() * 10 + 20},
+            {'name': 'Kamoucha - FB20', 'excessValue': np.random.randint(50000, 300000), 'share': np.random.rand() * 10 + 20},
+            {'name': 'Rolad 500 Electric', 'excessValue': np.random.randint(50000, 300000), 'share': np.random.rand() * 10 + 20},
+            {'name': 'Van Torino', 'excessValue': np.random.randint(50000, 300000), 'share': np.random.rand() * 10 + 20},
+        ],
+    }
+    excess_stock_data['excessStockEvolution'].reverse()
+
+    # Missing Stock Data
+    missing_stock_data = {
+        'percentBelowSafetyStock': (np.random.rand() * 20) + 30,
+        'percentOutOfStock': (np.random.rand() * 5) + 2,
+        'amountToRefill': missing_stock_amount,
+        'evolutionOfMissingStockItems': [{
+            'month': months[((today - datetime.timedelta(days=30*i)).month - 1)],
+            'items': np.random.randint(10, 30)
+        } for i in range(10)],
+        'evolutionOfMissingStockAmount': [{
+            'month': months[((today - datetime.timedelta(days=30*i)).month - 1)],
+            'amount': np.random.randint(1, 5) * 1000000
+        } for i in range(10)],
+        'mostImportantMissingItems': [
+            {'name': 'Armanda BMV 560E', 'amount': np.random.randint(50000, 100000), 'status': 'STOCK-OUT'},
+            {'name': 'FlyFighter 120', 'amount': np.random.randint(50000, 100000), 'status': 'BELOW SAFETY STOCK'},
+            {'name': 'eBike 7', 'amount': np.random.randint(50000, 100000), 'status': 'STOCK-OUT'},
+            {'name': 'Armanda BMV 600X', 'amount': np.random.randint(50000, 100000), 'status': 'BELOW SAFETY STOCK'},
+            {'name': 'Armanda REG 100', 'amount': np.random.randint(50000, 100000), 'status': 'BELOW SAFETY STOCK'},
+        ],
+    }
+    missing_stock_data['evolutionOfMissingStockItems'].reverse()
+    missing_stock_data['evolutionOfMissingStockAmount'].reverse()
+
+
+    # Historical Status Data
+    historical_status_data = {
+        'stockStatusOverview': {
+            'stockOut': round(np.random.rand() * 0.5 + 0.1, 1),
+            'belowSafetyStock': round(np.random.rand() * 10 + 40, 1),
+            'atStock': round(np.random.rand() * 10 + 30, 1),
+            'overStock': round(np.random.rand() * 5 + 10, 1),
+        },
+        'evolutionInPositionStatus': [{
+            'item': f"Item {i + 1}",
+            'statuses': [np.random.choice(['STOCK-OUT', 'BELOW-SAFETY-STOCK', 'AT-STOCK', 'OVER-STOCK']) for _ in range(12)],
+        } for i in range(10)],
+        'mostInventoryIssues': [
+            {'name': 'Armanda ALW 400', 'positions': np.random.randint(10, 100), 'status': 'Out-of-Stock'},
+            {'name': 'Kantouza - CEB100', 'positions': np.random.randint(10, 100), 'status': 'Below-Safety'},
+            {'name': 'eViteza 500', 'positions': np.random.randint(10, 100), 'status': 'At-Stock'},
+            {'name': 'FlyFighter 120', 'positions': np.random.randint(10, 100), 'status': 'Over-Stock'},
+            {'name': 'Armanda BMV 560E', 'positions': np.random.randint(10, 100), 'status': 'Out-of-Stock'},
+        ],
+    }
+
+    # Stock Coverage Data
+    stock_coverage_data = {
+        'abcXyzClassification': [
+            {
+                'consumption': 'HIGH Consumption', 'stability': 'STABLE Demand', 'class': 'AX',
+                'totalOutflowValue': np.random.randint(200000, 500000), 'numItems': np.random.randint(1, 5),
+                'recommended': 'Automated replenishment', 'buffer': 'LOW buffer - JIT or consignment transfers the responsibility for security.', 'control': 'Perpetual inventory',
+                'details': [{'name': 'Kantouza - CEB100', 'value': np.random.randint(10000, 100000)}, {'name': 'FlyFighter 120', 'value': np.random.randint(10000, 100000)}]
+            },
+            {
+                'consumption': 'HIGH Consumption', 'stability': 'VOLATILE Demand', 'class': 'AY',
+                'totalOutflowValue': np.random.randint(200000, 500000), 'numItems': np.random.randint(1, 5),
+                'recommended': 'Automated with manual intervention', 'buffer': 'LOW buffer accept stock out risk', 'control': 'Perpetual inventory',
+                'details': [{'name': 'Armanda BMV 560E', 'value': np.random.randint(10000, 100000)}, {'name': 'TRICA EC200', 'value': np.random.randint(10000, 100000)}]
+            },
+            {
+                'consumption': 'MEDIUM Consumption', 'stability': 'STABLE Demand', 'class': 'BX',
+                'totalOutflowValue': np.random.randint(50000, 200000), 'numItems': np.random.randint(1, 5),
+                'recommended': 'Automated replenishment', 'buffer': 'LOW buffer - safety first', 'control': 'Periodic count: MEDIUM security',
+                'details': [{'name': 'Pale 500', 'value': np.random.randint(5000, 50000)}]
+            },
+        ]
+    }
+
+    # Item Deep-dive Data
+    item_deep_dive_data = {
+        'selectedItem': 'Armanda BMV 560E',
+        'itemFamily': 'Road & Gravel Bikes',
+        'stockStatus': {
+            'onHandQty': np.random.randint(200, 300),
+            'inventoryValue': np.random.randint(500000, 1000000),
+            'excessStock': np.random.randint(0, 100000),
+            'missingStock': np.random.randint(50000, 500000),
+        },
+        'warehouseBreakdown': [
+            {'wh': 'WH Chicago', 'onHand': np.random.randint(10, 50), 'value': np.random.randint(10000, 50000), 'excess': np.random.randint(0, 5000), 'missing': np.random.randint(0, 10000)},
+            {'wh': 'WH Seattle', 'onHand': np.random.randint(10, 50), 'value': np.random.randint(10000, 50000), 'excess': np.random.randint(0, 5000), 'missing': np.random.randint(0, 10000)},
+            {'wh': 'WH New Delhi', 'onHand': np.random.randint(10, 50), 'value': np.random.randint(10000, 50000), 'excess': np.random.randint(0, 5000), 'missing': np.random.randint(0, 10000)},
+        ],
+        'dailyForecast': [{
+            'day': i + 1,
+            'expectedOnHand': np.random.randint(50, 200),
+            'inflow': np.random.randint(0, 20),
+            'outflow': np.random.randint(0, 20),
+        } for i in range(30)],
+    }
+
+    # Adhoc Analysis Data
+    adhoc_analysis_data = {
+        'inventoryValueTrends': [{
+            'month': f"{months[(today - datetime.timedelta(days=30*i)).month - 1]} {((today - datetime.timedelta(days=30*i)).year % 100)}",
+            'value': np.random.randint(20, 28) * 1000000,
+        } for i in range(24)],
+        'inventoryValueByItemFamily': [
+            {'name': 'Road & Gravel Bikes', 'value': np.random.randint(500000, 1500000), 'share': round(np.random.rand() * 10 + 20, 1)},
+            {'name': 'Electric Bikes', 'value': np.random.randint(300000, 1000000), 'share': round(np.random.rand() * 10 + 10, 1)},
+            {'name': 'Urban Bikes', 'value': np.random.randint(200000, 800000), 'share': round(np.random.rand() * 10 + 5, 1)},
+            {'name': 'Mountain Bikes', 'value': np.random.randint(150000, 700000), 'share': round(np.random.rand() * 5 + 5, 1)},
+            {'name': 'Folding Bikes', 'value': np.random.randint(100000, 500000), 'share': round(np.random.rand() * 5 + 3, 1)},
+        ],
+        'paretoAnalysis': [
+            {'name': 'Road & Gravel Bikes', 'value': np.random.randint(500000, 1500000)},
+            {'name': 'Electric Bikes', 'value': np.random.randint(300000, 1000000)},
+            {'name': 'Urban Bikes', 'value': np.random.randint(200000, 800000)},
+            {'name': 'Mountain Bikes', 'value': np.random.randint(150000, 700000)},
+            {'name': 'Folding Bikes', 'value': np.random.randint(100000, 500000)},
+            {'name': 'Hybrid Bikes', 'value': np.random.randint(50000, 300000)},
+            {'name': 'Kids Bikes', 'value': np.random.randint(20000, 200000)},
+        ],
+    }
+    adhoc_analysis_data['inventoryValueTrends'].reverse()
+
+    return {
+        'kpis': {
+            'inventoryValue': current_inventory_value,
+            'missingStockAmount': missing_stock_amount,
+            'excessStockValue': excess_stock_value,
+        },
+        'inventoryStatus': {
+            'totalItems': total_items,
+            'totalPositions': total_positions,
+            'breakdown': inventory_status_data, # This is now a list of dicts
+        },
+        'executiveSummary': {
+            'inventoryEvolution': inventory_evolution_data,
+            'warehouseSummary': warehouse_summary_data,
+            'itemEvolution': item_evolution_data,
+        },
+        'warehouses': warehouse_chart_data,
+        'availability': availability_data,
+        'excessStock': excess_stock_data,
+        'missingStock': missing_stock_data,
+        'historicalStatus': historical_status_data,
+        'stockCoverage': stock_coverage_data,
+        'itemDeepDive': item_deep_dive_data,
+        'adhocAnalysis': adhoc_analysis_data,
+        'logistics': {},
+        'stockPolicy': None,
+        'quality': {'bySnapshot': {}, 'evolution': {}},
+        'rollingMetrics': {'byDimension': {}, 'evolution': []},
+        'replenishmentInputs': pd.DataFrame(),
+        'salesPeriodDays': TURNOVER_PERIOD_DAYS,
+        'isLoadedFromCSV': False,
+    }
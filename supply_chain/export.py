@@ -0,0 +1,228 @@
+"""Streaming bulk export of the dashboard tables."""
+
+import pandas as pd
+import datetime
+import functools
+import io
+import zipfile
+import numpy as np
+
+from supply_chain.comparison import compute_day_to_day_comparison
+from supply_chain.history import DeltaHistoryStore
+from supply_chain.replenishment import REPLENISHMENT_DEFAULTS, compute_replenishment
+
+try:
+    import pyarrow as pa # Optional: Parquet export
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import openpyxl # Optional: Excel export
+except ImportError:
+    openpyxl = None
+
+# --- Bulk Export ---
+
+EXPORT_FORMATS = ['Parquet', 'CSV', 'Excel', 'JSON']
+EXPORT_CHUNK_ROWS = 100000
+EXCEL_MAX_ROWS = 1048575 # One row of the sheet is taken by the header
+
+def export_table_builders(data, comparison_dates=None):
+    """
+    The exportable tables of a dashboard as {name: build}, where `build()`
+    returns the table: the processed snapshots, the per-page aggregates and,
+    when two dates are given, the day-to-day comparison between them. Only
+    presence checks run here; tables are built once they are exported.
+    """
+    builders = {}
+    history = data.get('history')
+    if history is not None and history.dates:
+        builders['snapshots'] = functools.partial(identity, history) # Reconstructed one date at a time while writing
+
+    records = {
+        'kpis': [data['kpis']],
+        'inventory_status': data['inventoryStatus']['breakdown'],
+        'inventory_evolution': data['executiveSummary']['inventoryEvolution'],
+        'item_evolution': data['executiveSummary']['itemEvolution'],
+        'warehouse_summary': data['executiveSummary']['warehouseSummary'],
+        'current_inventory_by_item': data['availability']['currentInventoryByItem'],
+        'excess_stock_evolution': data['excessStock']['excessStockEvolution'],
+        'highest_excess_items': data['excessStock']['highestExcessItems'],
+        'missing_stock_items_evolution': data['missingStock']['evolutionOfMissingStockItems'],
+        'missing_stock_amount_evolution': data['missingStock']['evolutionOfMissingStockAmount'],
+        'most_important_missing_items': data['missingStock']['mostImportantMissingItems'],
+        'inventory_value_by_item_family': data['adhocAnalysis']['inventoryValueByItemFamily'],
+    }
+    for dim, dim_records in (data.get('rollingMetrics') or {}).get('byDimension', {}).items():
+        records[f"rolling_by_{dim.lower().replace(' ', '_')}"] = dim_records
+    for name, table_records in records.items():
+        if table_records:
+            builders[name] = functools.partial(pd.DataFrame, table_records)
+
+    status_history = data['historicalStatus']['evolutionInPositionStatus']
+    if status_history:
+        builders['status_history'] = functools.partial(build_status_history_table, status_history)
+
+    frames = {}
+    for snapshot_date, analytics in (data.get('logistics') or {}).items():
+        if 'All dimensions' in analytics:
+            frames[f"logistics_{snapshot_date.strftime('%Y%m%d')}"] = analytics['All dimensions']
+    for dim, evolution in (data.get('quality') or {}).get('evolution', {}).items():
+        frames[f"quality_by_{dim.lower().replace(' ', '_')}"] = evolution
+    for dim, evolution in (data.get('turnover') or {}).get('evolution', {}).items():
+        frames[f"turnover_by_{dim.lower().replace(' ', '_')}"] = evolution
+    for name, frame in frames.items():
+        if len(frame) > 0:
+            builders[name] = functools.partial(identity, frame)
+
+    replenishment_inputs = data.get('replenishmentInputs')
+    if replenishment_inputs is not None and not replenishment_inputs.empty:
+        builders['replenishment'] = functools.partial(compute_replenishment, replenishment_inputs, data['salesPeriodDays'], **REPLENISHMENT_DEFAULTS)
+
+    if comparison_dates and 'snapshots' in builders:
+        date1, date2 = comparison_dates
+        builders[f"comparison_{date1.strftime('%Y%m%d')}_{date2.strftime('%Y%m%d')}"] = functools.partial(
+            compute_day_to_day_comparison, history, date1, date2)
+
+    return builders
+
+def build_export_tables(builders, names):
+    """Builds the named tables of `export_table_builders`, leaving out the empty ones."""
+    tables = {name: builders[name]() for name in names}
+    return {name: table for name, table in tables.items() if table_row_count(table) > 0}
+
+def identity(value):
+    return value
+
+def build_status_history_table(status_history):
+    """Status history as a long table: one row per item and snapshot."""
+    table = pd.DataFrame(status_history).explode('statuses').rename(columns={'statuses': 'status'})
+    table['snapshot'] = table.groupby(level=0).cumcount()
+    return table.reset_index(drop=True)
+
+def export_file_type(export_format):
+    """(file extension, MIME type) of an export."""
+    if export_format == 'Excel':
+        return 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    return 'zip', 'application/zip'
+
+def table_row_count(table):
+    """Row count of an export table (a DataFrame or the snapshot history)."""
+    return table.total_rows if isinstance(table, DeltaHistoryStore) else len(table)
+
+def iter_chunks(table, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yields consecutive row slices of a DataFrame without copying the whole frame.
+    The snapshot history is reconstructed and sliced one date at a time.
+    """
+    frames = table.iter_snapshots() if isinstance(table, DeltaHistoryStore) else [table]
+    for df in frames:
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+
+def parquet_schema(sample):
+    """
+    Arrow schema every chunk of a table is cast to, from a frame with all of
+    its columns and dtypes: categoricals take their categories' type and
+    anything not numeric, boolean or datetime is written as string.
+    """
+    fields = []
+    for col in sample.columns:
+        dtype = sample[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            arrow_type = pa.bool_()
+        elif pd.api.types.is_integer_dtype(dtype):
+            arrow_type = pa.int64()
+        elif pd.api.types.is_float_dtype(dtype):
+            arrow_type = pa.float64()
+        elif pd.api.types.is_datetime64_dtype(dtype):
+            arrow_type = pa.timestamp('ns')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(str(col), arrow_type))
+    return pa.schema(fields)
+
+def conform_chunk(chunk, schema):
+    """
+    Casts one chunk to `schema`: columns it lacks are written as nulls, and values
+    are converted column by column, so snapshots whose dtypes differ (all-NaN
+    against float, object against category) still share one Parquet file.
+    """
+    arrays = []
+    for field in schema:
+        if field.name not in chunk.columns:
+            arrays.append(pa.nulls(len(chunk), type=field.type))
+            continue
+        values = chunk[field.name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        if pa.types.is_string(field.type):
+            values = values.astype('string').to_numpy(dtype=object, na_value=None)
+        elif pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        elif pa.types.is_integer(field.type):
+            values = pd.to_numeric(values, errors='coerce').astype('Int64')
+        elif pa.types.is_boolean(field.type):
+            values = values.astype('boolean')
+        else:
+            values = pd.to_datetime(values, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def write_export(tables, export_format, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Streams `tables` into `fileobj` chunk by chunk, so only one slice of a large
+    table is converted at a time. Excel produces one workbook with a sheet per
+    table; the other formats produce a zip archive with one file per table.
+    """
+    if export_format == 'Excel':
+        if openpyxl is None:
+            raise RuntimeError("Excel export needs openpyxl. Run `pip install openpyxl`.")
+        workbook = openpyxl.Workbook(write_only=True)
+        for name, table in tables.items():
+            sheet, sheet_rows, part = None, 0, 1
+            for chunk in iter_chunks(table, chunk_rows):
+                for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+                    if sheet is None or sheet_rows == EXCEL_MAX_ROWS:
+                        # Tables longer than an Excel sheet continue on a new sheet
+                        sheet = workbook.create_sheet((name if part == 1 else f"{name}_{part}")[:31])
+                        sheet.append([str(col) for col in chunk.columns])
+                        sheet_rows, part = 0, part + 1
+                    sheet.append([value.isoformat() if isinstance(value, (datetime.date, pd.Timestamp)) else value for value in row])
+                    sheet_rows += 1
+        workbook.save(fileobj)
+        return fileobj
+
+    if export_format == 'Parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow. Run `pip install pyarrow`.")
+
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, table in tables.items():
+            if export_format == 'Parquet':
+                with archive.open(f"{name}.parquet", 'w', force_zip64=True) as member:
+                    # One schema for the whole file, covering the columns and dtypes of every snapshot
+                    schema = parquet_schema(table.sample() if isinstance(table, DeltaHistoryStore) else table)
+                    with pq.ParquetWriter(member, schema) as writer:
+                        for chunk in iter_chunks(table, chunk_rows):
+                            writer.write_table(conform_chunk(chunk, schema))
+            elif export_format == 'CSV':
+                with archive.open(f"{name}.csv", 'w', force_zip64=True) as member:
+                    text = io.TextIOWrapper(member, encoding='utf-8', newline='')
+                    for i, chunk in enumerate(iter_chunks(table, chunk_rows)):
+                        chunk.to_csv(text, header=(i == 0), index=False)
+                    text.flush()
+                    text.detach()
+            elif export_format == 'JSON':
+                # JSON Lines: one record per line, so chunks concatenate cleanly
+                with archive.open(f"{name}.jsonl", 'w', force_zip64=True) as member:
+                    text = io.TextIOWrapper(member, encoding='utf-8')
+                    for chunk in iter_chunks(table, chunk_rows):
+                        text.write(chunk.to_json(orient='records', lines=True, date_format='iso'))
+                    text.flush()
+                    text.detach()
+            else:
+                raise ValueError(f"Unsupported export format: {export_format}")
+    return fileobj
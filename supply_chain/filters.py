@@ -0,0 +1,90 @@
+"""Global dashboard filters backed by packed bitmap indexes over the compact snapshots."""
+
+import pandas as pd
+import numpy as np
+
+from supply_chain.processing import POLICY_INPUT_COLUMNS, derive_stock_columns
+
+# --- Global Filters (bitmap indexes) ---
+
+FILTER_DIMENSIONS = {
+    'Warehouse': 'Warehouse',
+    'Item Family': 'Item Family',
+    'Status': 'Calculated Stock Status',
+}
+
+def snapshot_filter_column(snapshot, column, policy=None):
+    """Values of a filter column of one compact snapshot; statuses are classified under `policy`."""
+    if column != 'Calculated Stock Status':
+        return snapshot.base[column]
+    # Export statuses are kept and only missing ones derived, as when the snapshot is expanded
+    inputs = [col for col in POLICY_INPUT_COLUMNS + [column] if col in snapshot.base.columns]
+    return derive_stock_columns(snapshot.base[inputs].copy(), policy)[column]
+
+class SnapshotBitmapIndex:
+    """
+    One packed bitmap (a bit per row of the stacked compact snapshots) per value
+    of every filter dimension, built once per upload and stock policy. Values
+    selected within a dimension are OR-ed, dimensions are AND-ed, and only the
+    final bitmap is unpacked into a row mask. Date ranges select whole snapshots.
+    """
+
+    def __init__(self, compact_snapshots, policy=None):
+        self.dates = [snapshot.date for snapshot in compact_snapshots]
+        lengths = [len(snapshot) for snapshot in compact_snapshots]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.n_rows = int(self.offsets[-1])
+        self.bitmaps = {}
+        for dim, column in FILTER_DIMENSIONS.items():
+            # Snapshot-local codes are mapped to codes shared by the whole history
+            positions, code_parts = {}, []
+            for snapshot in compact_snapshots:
+                local_codes, local_values = pd.factorize(snapshot_filter_column(snapshot, column, policy))
+                mapping = np.array([positions.setdefault(str(value), len(positions)) for value in local_values] + [-1], dtype=np.int32)
+                code_parts.append(mapping[local_codes]) # Code -1 (missing) picks the trailing -1
+            codes = np.concatenate(code_parts) if code_parts else np.zeros(0, dtype=np.int32)
+            self.bitmaps[dim] = {value: np.packbits(codes == code) for value, code in sorted(positions.items())}
+
+    def values(self, dim):
+        return list(self.bitmaps[dim])
+
+    def row_mask(self, selection):
+        """
+        Boolean mask over all rows for a {dimension: [values]} selection (empty
+        or missing dimensions do not filter), or None when nothing is selected.
+        """
+        bits = None
+        for dim, values in selection.items():
+            if not values:
+                continue
+            dim_bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                if value in self.bitmaps[dim]:
+                    dim_bits |= self.bitmaps[dim][value]
+            bits = dim_bits if bits is None else bits & dim_bits
+        if bits is None:
+            return None
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def apply(self, compact_snapshots, selection, date_range=None):
+        """
+        The compact snapshots restricted to the selection and to snapshots dated
+        within `date_range` (inclusive dates, either end may be None). Snapshots
+        left without rows are dropped.
+        """
+        mask = self.row_mask(selection)
+        start, end = date_range or (None, None)
+        filtered = []
+        for i, snapshot in enumerate(compact_snapshots):
+            if (start is not None and snapshot.date.date() < start) or (end is not None and snapshot.date.date() > end):
+                continue
+            if mask is None:
+                filtered.append(snapshot)
+                continue
+            rows = mask[self.offsets[i]:self.offsets[i + 1]]
+            if rows.any():
+                filtered.append(snapshot.subset(rows))
+        return filtered
+
+    def nbytes(self):
+        return int(sum(bitmap.nbytes for bitmaps in self.bitmaps.values() for bitmap in bitmaps.values()))
@@ -0,0 +1,148 @@
+"""Batched exponential-smoothing demand forecasts over the Item x Date sales matrix."""
+
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+
+import pandas as pd
+import numpy as np
+
+# --- Demand Forecasting (vectorized exponential smoothing) ---
+
+FORECAST_METHODS = ['Simple', 'Holt', 'Seasonal']
+FORECAST_DEFAULTS = {'horizon': 6, 'season_length': 4}
+# Smoothing parameters are fitted per item by picking the grid combination with the lowest one-step error
+ALPHA_GRID = [0.1, 0.3, 0.5, 0.7, 0.9]
+BETA_GRID = [0.05, 0.2, 0.4]
+GAMMA_GRID = [0.1, 0.3, 0.5]
+FORECAST_CHUNK_ITEMS = 50000 # Items per block; blocks are the unit of work of the process pool
+FORECAST_PARALLEL_MIN_ITEMS = 200000 # Smaller catalogs are fitted in-process (pool start-up costs more)
+FORECAST_WORKERS = int(os.environ.get('SC_FORECAST_WORKERS', str(os.cpu_count() or 1)))
+
+def smoothing_pass(values, alpha, beta, gamma, season_length):
+    """
+    Runs the additive exponential-smoothing recurrence over all rows at once
+    (one vectorized step per date). beta=None gives simple smoothing, gamma=None
+    no seasonality. Missing observations advance the state without correction.
+    Returns the one-step squared error per row and the final level, trend and
+    seasonal states.
+    """
+    n_rows, n_dates = values.shape
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), 0)
+    level = np.nan_to_num(values[np.arange(n_rows), first])
+    trend = np.zeros(n_rows)
+    seasonal = np.zeros((n_rows, season_length if gamma is not None else 1))
+    sse = np.zeros(n_rows)
+
+    for t in range(n_dates):
+        slot = t % seasonal.shape[1]
+        season = seasonal[:, slot] if gamma is not None else 0.0
+        prediction = level + trend + season
+        y = values[:, t]
+        observed = valid[:, t] & (t > first)
+        error = np.where(observed, y - prediction, 0.0)
+        sse += error ** 2
+
+        new_level = np.where(observed, level + trend + alpha * error, level + trend)
+        if beta is not None:
+            trend = np.where(observed, trend + beta * (new_level - level - trend), trend)
+        if gamma is not None:
+            seasonal[:, slot] = np.where(observed, season + gamma * (1 - alpha) * error, season)
+        # The first observation only initializes the level
+        level = np.where(valid[:, t] & (t == first), y, new_level)
+    return sse, level, trend, seasonal
+
+def fit_forecast_block(values, method, horizon, season_length):
+    """
+    Fits the smoothing parameters of every row of a block on a grid and returns
+    (forecast rows x horizon, one-step RMSE per row, alpha, beta, gamma).
+    """
+    values = np.asarray(values, dtype=float)
+    n_rows, n_dates = values.shape
+    betas = BETA_GRID if method in ('Holt', 'Seasonal') else [None]
+    gammas = GAMMA_GRID if method == 'Seasonal' else [None]
+    steps = np.arange(1, horizon + 1)
+
+    best_sse = np.full(n_rows, np.inf)
+    forecast = np.zeros((n_rows, horizon))
+    params = np.zeros((n_rows, 3))
+    for alpha, beta, gamma in itertools.product(ALPHA_GRID, betas, gammas):
+        sse, level, trend, seasonal = smoothing_pass(values, alpha, beta, gamma, season_length)
+        if gamma is not None:
+            season = seasonal[:, (n_dates + steps - 1) % seasonal.shape[1]]
+        else:
+            season = 0.0
+        candidate = level[:, None] + trend[:, None] * steps + season
+        better = sse < best_sse
+        best_sse = np.where(better, sse, best_sse)
+        forecast[better] = candidate[better]
+        params[better] = [alpha, beta or 0.0, gamma or 0.0]
+
+    observations = np.maximum((~np.isnan(values)).sum(axis=1) - 1, 1)
+    rmse = np.sqrt(best_sse / observations)
+    return np.maximum(forecast, 0), rmse, params[:, 0], params[:, 1], params[:, 2]
+
+def forecast_demand(sales_matrix, method='Simple', horizon=FORECAST_DEFAULTS['horizon'],
+                    season_length=FORECAST_DEFAULTS['season_length'], workers=FORECAST_WORKERS):
+    """
+    Forecasts the next `horizon` snapshot periods of every item's sales. The
+    matrix is split into blocks of items; large catalogs fan the blocks out to a
+    process pool, smaller ones run in-process. Seasonal smoothing needs two full
+    seasons of history and falls back to Holt otherwise.
+    """
+    values = sales_matrix['values']
+    dates = sales_matrix['dates']
+    if method == 'Seasonal' and len(dates) < 2 * season_length:
+        method = 'Holt'
+
+    blocks = [values[start:start + FORECAST_CHUNK_ITEMS] for start in range(0, len(values), FORECAST_CHUNK_ITEMS)]
+    args = (method, horizon, season_length)
+    if workers > 1 and len(blocks) > 1 and len(values) >= FORECAST_PARALLEL_MIN_ITEMS:
+        # Spawned workers: the caller may be a background thread, where forking is unsafe
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(blocks)),
+                                                    mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(fit_forecast_block, blocks, *[itertools.repeat(arg) for arg in args]))
+    else:
+        results = [fit_forecast_block(block, *args) for block in blocks]
+
+    if results:
+        forecast, rmse, alpha, beta, gamma = (np.concatenate(parts) for parts in zip(*results))
+    else:
+        forecast, rmse, alpha, beta, gamma = np.zeros((0, horizon)), *(np.zeros(0) for _ in range(4))
+
+    # Snapshot spacing turns forecast periods into calendar dates
+    period_days = max(int(np.median(np.diff(dates.values).astype('timedelta64[D]').astype(int))), 1) if len(dates) > 1 else 1
+    return {
+        'method': method,
+        'items': sales_matrix['items'],
+        'dates': dates,
+        'history': values,
+        'forecastDates': dates[-1] + pd.to_timedelta(np.arange(1, horizon + 1) * period_days, unit='D') if len(dates) else pd.DatetimeIndex([]),
+        'forecast': forecast,
+        'rmse': rmse,
+        'params': pd.DataFrame({'alpha': alpha, 'beta': beta, 'gamma': gamma}),
+        'periodDays': period_days,
+    }
+
+def project_stock_outs(forecast, position_matrix):
+    """
+    Latest on-hand quantity per item (summed over warehouses) against its
+    cumulative forecast demand: the first forecast period that exhausts the
+    stock gives the days to stock-out (NaN when it lasts beyond the horizon).
+    """
+    latest = np.nan_to_num(position_matrix['values'][:, -1]) if position_matrix['values'].size else np.zeros(0)
+    on_hand = pd.Series(latest).groupby(position_matrix['items']).sum()
+    on_hand = on_hand.reindex(forecast['items'], fill_value=0).to_numpy()
+
+    cumulative = np.cumsum(forecast['forecast'], axis=1)
+    exhausted = cumulative >= on_hand[:, None]
+    runs_out = exhausted.any(axis=1) if exhausted.size else np.zeros(len(on_hand), dtype=bool)
+    periods = np.where(runs_out, exhausted.argmax(axis=1) + 1, np.nan) if exhausted.size else np.full(len(on_hand), np.nan)
+    return pd.DataFrame({
+        'Item': forecast['items'],
+        'On-hand Quantity': on_hand,
+        'Forecast Demand': cumulative[:, -1] if cumulative.size else 0.0,
+        'Days to Stock-out': np.where(on_hand <= 0, 0, periods * forecast['periodDays']),
+    })
@@ -0,0 +1,17 @@
+"""Currency formatting helpers shared by the pages."""
+
+import pandas as pd
+
+# --- Helper Functions ---
+
+def format_currency(value):
+    """Formats a numerical value into a currency string in millions."""
+    if value is None or pd.isna(value):
+        return '$N/A'
+    return f"${(value / 1000000):.2f}M"
+
+def format_currency_k(value):
+    """Formats a numerical value into a currency string in thousands."""
+    if value is None or pd.isna(value):
+        return '$N/A'
+    return f"${(value / 1000):.0f}K"
@@ -0,0 +1,193 @@
+"""Delta-encoded snapshot history."""
+
+import pandas as pd
+import numpy as np
+
+from supply_chain.processing import compact_base_frame, expand_base_frame
+
+# --- Delta-Encoded Snapshot History ---
+
+class DeltaHistoryStore:
+    """
+    Snapshot history stored as a base snapshot plus, for every later date, only
+    the positions (Item x Warehouse) that changed or appeared and the keys of the
+    positions that disappeared. Any date's full view is rebuilt on demand by
+    stacking the change log up to that date and keeping the last entry per
+    position, which is a vectorized forward fill. Rows are kept in the compact
+    base layout (see compact_base_frame); derived columns are recomputed on rebuild
+    under the store's stock policy.
+    """
+
+    KEY_COLUMNS = ['Item', 'Warehouse', 'Key Occurrence'] # Occurrence disambiguates duplicate SKU x Location rows
+
+    def __init__(self, policy=None):
+        self.policy = policy
+        self.dates = []
+        self.log = [] # One entry per date: {'changes': changed rows, 'removed': keys of dropped positions}
+        self.latest = None # Latest full view, indexed by key, used to diff the next snapshot
+        self.row_counts = []
+        self.full_nbytes = 0
+
+    @classmethod
+    def from_snapshots(cls, all_dfs, policy=None):
+        """Builds a store from processed snapshots, combining frames that share a date."""
+        snapshots = {}
+        for snapshot_df in all_dfs:
+            if snapshot_df.empty:
+                continue
+            snapshot_date = pd.to_datetime(snapshot_df['Date'].iloc[0])
+            if snapshot_date in snapshots:
+                snapshots[snapshot_date] = pd.concat([snapshots[snapshot_date], snapshot_df], ignore_index=True)
+            else:
+                snapshots[snapshot_date] = snapshot_df
+        store = cls(policy)
+        for snapshot_date in sorted(snapshots):
+            store.append(snapshots[snapshot_date])
+        return store
+
+    @classmethod
+    def concat(cls, stores, policy=None):
+        """
+        Joins stores built over consecutive date ranges, each seeded with the
+        snapshot preceding its range, into the store of the whole history.
+        """
+        store = cls(policy)
+        for part in stores:
+            if store.dates and part.dates and part.dates[0] <= store.dates[-1]:
+                raise ValueError(f"Snapshot {part.dates[0].date()} is not newer than {store.dates[-1].date()}")
+            store.dates.extend(part.dates)
+            store.log.extend(part.log)
+            store.row_counts.extend(part.row_counts)
+            store.full_nbytes += part.full_nbytes
+            if part.dates:
+                store.latest = part.latest
+        return store
+
+    def seed(self, snapshot_df):
+        """Makes the next appended snapshot diff against `snapshot_df`, which is not stored itself."""
+        self.latest = self.keyed(snapshot_df)
+
+    def keyed(self, snapshot_df):
+        """Indexes the compact base frame of a processed snapshot by position."""
+        base = compact_base_frame(snapshot_df, self.policy)
+        occurrence = base.groupby(['Item', 'Warehouse'], sort=False, observed=True).cumcount().to_numpy()
+        return base.assign(**{'Key Occurrence': occurrence}).set_index(self.KEY_COLUMNS)
+
+    def append(self, snapshot_df):
+        """Appends a snapshot newer than every stored date, keeping only its changed rows."""
+        snapshot_date = pd.to_datetime(snapshot_df['Date'].iloc[0])
+        if self.dates and snapshot_date <= self.dates[-1]:
+            raise ValueError(f"Snapshot {snapshot_date.date()} is not newer than {self.dates[-1].date()}")
+
+        current = self.keyed(snapshot_df)
+        if self.latest is None:
+            changes = current
+            removed = current.index[:0]
+        else:
+            common = current.index.intersection(self.latest.index)
+            columns = current.columns.intersection(self.latest.columns, sort=False)
+            changed = np.zeros(len(common), dtype=bool)
+            for col in columns:
+                # Plain arrays, so categoricals with different categories still compare
+                before = np.asarray(self.latest[col].loc[common], dtype=object)
+                after = np.asarray(current[col].loc[common], dtype=object)
+                changed |= (before != after) & ~(pd.isna(before) & pd.isna(after))
+            if len(columns) < len(current.columns):
+                changed[:] = True # New columns: every position carries new values
+            added = current.index.difference(self.latest.index)
+            removed = self.latest.index.difference(current.index)
+            changes = pd.concat([current.loc[common[changed]], current.loc[added]])
+
+        self.log.append({
+            'changes': changes.reset_index(),
+            'removed': removed.to_frame(index=False),
+        })
+        self.dates.append(snapshot_date)
+        self.latest = current
+        self.row_counts.append(len(snapshot_df))
+        self.full_nbytes += int(snapshot_df.memory_usage(deep=True).sum())
+
+    @property
+    def latest_date(self):
+        return self.dates[-1] if self.dates else None
+
+    @property
+    def total_rows(self):
+        return sum(self.row_counts)
+
+    def reconstruct(self, date):
+        """Full processed snapshot as of `date` (the latest stored date not after it)."""
+        date = pd.to_datetime(date)
+        upto = int(np.searchsorted(np.array(self.dates, dtype='datetime64[ns]'), np.datetime64(date, 'ns'), side='right'))
+        if upto == 0:
+            return pd.DataFrame()
+
+        entries = self.log[:upto]
+        changes = pd.concat([entry['changes'] for entry in entries], ignore_index=True)
+        offsets = np.cumsum([0] + [len(entry['changes']) for entry in entries])
+        # Every key event points at its row in `changes`; removals point at -1
+        key_events = []
+        for offset, entry in zip(offsets, entries):
+            key_events.append(entry['changes'][self.KEY_COLUMNS].assign(Row=np.arange(offset, offset + len(entry['changes']))))
+            key_events.append(entry['removed'].assign(Row=-1))
+        last_events = pd.concat(key_events, ignore_index=True).drop_duplicates(subset=self.KEY_COLUMNS, keep='last')
+        rows = last_events['Row'].to_numpy()
+        view = changes.iloc[np.sort(rows[rows >= 0])].drop(columns='Key Occurrence')
+        return expand_base_frame(view.reset_index(drop=True), self.dates[upto - 1], self.policy)
+
+    def sample(self):
+        """One changed row of every date, expanded: all columns and dtypes the stored snapshots have, in a few rows."""
+        base = pd.concat([entry['changes'].head(1) for entry in self.log], ignore_index=True)
+        return expand_base_frame(base.drop(columns='Key Occurrence'), self.dates[-1], self.policy)
+
+    def iter_snapshots(self):
+        """
+        Yields the full view of every stored date in chronological order, same as
+        reconstruct. One keyed view is rolled forward through the change log, so
+        each entry is applied once instead of replaying the log for every date.
+        """
+        view = None
+        for snapshot_date, entry in zip(self.dates, self.log):
+            changes = entry['changes'].set_index(self.KEY_COLUMNS)
+            if view is None:
+                view = changes
+            else:
+                # Changed positions move to the end, as reconstruct orders rows by their last change
+                replaced = changes.index.append(pd.MultiIndex.from_frame(entry['removed']))
+                view = pd.concat([view[~view.index.isin(replaced)], changes])
+            yield expand_base_frame(view.reset_index().drop(columns='Key Occurrence'), snapshot_date, self.policy)
+
+    def to_frame(self):
+        """Materializes the full history (every row of every date), like the former master_df."""
+        if not self.dates:
+            return pd.DataFrame()
+        return pd.concat(self.iter_snapshots(), ignore_index=True)
+
+    def nbytes(self):
+        return int(sum(entry['changes'].memory_usage(deep=True).sum() + entry['removed'].memory_usage(deep=True).sum() for entry in self.log))
+
+    def save(self, path):
+        """Writes the change log to a Parquet file (requires pyarrow)."""
+        log = pd.concat([
+            pd.concat([entry['changes'].assign(Removed=False), entry['removed'].assign(Removed=True)], ignore_index=True).assign(Date=snapshot_date)
+            for snapshot_date, entry in zip(self.dates, self.log)
+        ], ignore_index=True)
+        log.to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path, policy=None):
+        """Rebuilds a store from a change log written by `save` (with the policy it was saved under)."""
+        store = cls(policy)
+        for snapshot_date, entry in pd.read_parquet(path).groupby('Date', sort=True):
+            removed = entry['Removed'].to_numpy(dtype=bool)
+            store.dates.append(pd.to_datetime(snapshot_date))
+            store.log.append({
+                'changes': entry[~removed].drop(columns=['Date', 'Removed']).reset_index(drop=True),
+                'removed': entry.loc[removed, cls.KEY_COLUMNS].reset_index(drop=True),
+            })
+        for snapshot_df in store.iter_snapshots():
+            store.row_counts.append(len(snapshot_df))
+            store.full_nbytes += int(snapshot_df.memory_usage(deep=True).sum())
+        if store.dates:
+            store.latest = store.keyed(snapshot_df)
+        return store
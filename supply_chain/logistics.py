@@ -0,0 +1,53 @@
+"""Logistics analytics per snapshot."""
+
+import numpy as np
+
+from supply_chain.processing import PASSTHROUGH_NUMERIC_COLUMNS
+
+# --- Logistics Analytics (per snapshot) ---
+
+LOGISTICS_DIMENSIONS = ['Shipping carriers', 'Routes', 'Transportation modes', 'Supplier name']
+
+def compute_logistics_analytics(snapshot_df):
+    """
+    Precomputes the logistics aggregates of one processed snapshot: one table per
+    dimension plus the full carrier x route x mode x supplier combination.
+    Cached per snapshot content in the shared cache (see compute_snapshot_sections).
+    """
+    dims = [d for d in LOGISTICS_DIMENSIONS if d in snapshot_df.columns]
+    if snapshot_df.empty or not dims:
+        return {}
+
+    df = snapshot_df.copy()
+    for col in PASSTHROUGH_NUMERIC_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    groupings = {dim: [dim] for dim in dims}
+    if len(dims) > 1:
+        groupings['All dimensions'] = dims
+
+    analytics = {}
+    for name, keys in groupings.items():
+        grouped = df.groupby(keys, observed=True, sort=True)
+        summary = grouped.agg(
+            positions=('Item', 'count'),
+            orderQuantity=('Order quantities', 'sum'),
+            totalCosts=('Costs', 'sum'),
+            shippingCosts=('Shipping costs', 'sum'),
+            avgShippingTime=('Shipping times', 'mean'),
+            avgLeadTime=('Lead times', 'mean'),
+        )
+        # Quantiles for every group in one call, unstacked into columns
+        shipping_q = grouped['Shipping times'].quantile([0.1, 0.5, 0.9]).unstack()
+        shipping_q.columns = ['shippingTimeP10', 'shippingTimeP50', 'shippingTimeP90']
+        lead_q = grouped['Lead times'].quantile([0.5, 0.9, 0.95]).unstack()
+        lead_q.columns = ['leadTimeP50', 'leadTimeP90', 'leadTimeP95']
+        summary = summary.join(shipping_q).join(lead_q)
+
+        order_qty = summary['orderQuantity'].where(summary['orderQuantity'] > 0)
+        summary['costPerUnit'] = (summary['totalCosts'] / order_qty).fillna(0)
+        summary['shippingCostPerUnit'] = (summary['shippingCosts'] / order_qty).fillna(0)
+        analytics[name] = summary.reset_index()
+
+    return analytics
@@ -0,0 +1,166 @@
+"""Parallel map-reduce of the per-snapshot aggregations over month partitions of the history."""
+
+import streamlit as st
+import concurrent.futures
+import multiprocessing
+import os
+
+import pandas as pd
+
+from supply_chain.cache import snapshot_derived
+from supply_chain.history import DeltaHistoryStore
+from supply_chain.logistics import compute_logistics_analytics
+from supply_chain.quality import compute_quality_scorecards
+from supply_chain.retention import archive_partial, archived_prefix_length
+from supply_chain.rolling import ROLLING_DIMENSIONS, rolling_prefix_length, snapshot_fingerprint, snapshot_group_totals
+from supply_chain.turnover import compute_turnover_totals
+
+# --- Parallel Aggregation (map over month partitions, reduce in order) ---
+
+AGGREGATION_WORKERS = int(os.environ.get('SC_AGGREGATION_WORKERS', str(os.cpu_count() or 1))) # 1 keeps the serial path
+AGGREGATION_PARALLEL_MIN_ROWS = 500000 # Fewer rows to aggregate run in-process (pool start-up costs more)
+
+# Page sections computed from the last frame of each snapshot date
+SECTION_FUNCTIONS = {
+    'turnover': compute_turnover_totals,
+    'logistics': compute_logistics_analytics,
+    'quality': compute_quality_scorecards,
+}
+
+def snapshots_by_date(all_dfs):
+    """Non-empty processed snapshots grouped by date, in upload order within a date: {Timestamp: [frames]}."""
+    snapshots = {}
+    for snapshot_df in all_dfs:
+        if snapshot_df.empty:
+            continue
+        snapshots.setdefault(pd.to_datetime(snapshot_df['Date'].iloc[0]), []).append(snapshot_df)
+    return snapshots
+
+def merged_snapshot(snapshot_dfs):
+    """The frames of one date combined, as the archive, rolling state and history store combine them."""
+    return snapshot_dfs[0] if len(snapshot_dfs) == 1 else pd.concat(snapshot_dfs, ignore_index=True)
+
+def month_partitions(dates):
+    """`dates` grouped by calendar month, oldest month first."""
+    months = {}
+    for snapshot_date in sorted(dates):
+        months.setdefault(snapshot_date.to_period('M'), []).append(snapshot_date)
+    return list(months.values())
+
+def compute_snapshot_sections(snapshot_df, cached=True):
+    """
+    The per-snapshot page sections of one frame, with its fingerprint so the
+    next aggregation can carry them over. Each section is kept in the shared
+    cache under the snapshot's content hash; `cached=False` computes them
+    directly, for worker processes whose cache would never be hit again.
+    """
+    fingerprint = snapshot_fingerprint(snapshot_df)
+    sections = {'fingerprint': fingerprint}
+    for name, func in SECTION_FUNCTIONS.items():
+        if cached:
+            sections[name] = snapshot_derived(f'section-{name}', fingerprint, lambda: func(snapshot_df))
+        else:
+            sections[name] = func(snapshot_df)
+    return sections
+
+def carried_sections(sections, snapshot_date, snapshot_df):
+    """The sections of `snapshot_date` kept from the previous aggregation, if its frame is unchanged."""
+    carried = (sections or {}).get(snapshot_date)
+    if carried is not None and carried['fingerprint'] == snapshot_fingerprint(snapshot_df):
+        return carried
+    return None
+
+def map_month_partition(partition, previous_df, policy, with_history, keep_latest):
+    """
+    Map task: the per-snapshot aggregations one month still needs. `partition`
+    is a list of (date, frames, parts), `parts` naming which of 'archive',
+    'rolling' and 'sections' to compute. `previous_df` is the last snapshot
+    before the month, which the history store diffs the first date against.
+    Returns ({date: partial results}, history store of the month, or None
+    without `with_history`).
+    """
+    history = None
+    if with_history:
+        history = DeltaHistoryStore(policy)
+        if previous_df is not None:
+            history.seed(previous_df)
+    partials = {}
+    for snapshot_date, snapshot_dfs, parts in partition:
+        snapshot_df = merged_snapshot(snapshot_dfs)
+        partial = {}
+        if 'archive' in parts:
+            partial['archive'] = archive_partial(snapshot_df)
+        if 'rolling' in parts:
+            partial['rolling'] = {dim: snapshot_group_totals(snapshot_df, dim) for dim in ROLLING_DIMENSIONS}
+        if 'sections' in parts:
+            # Per-page sections keep the last frame of a date, as the serial path does
+            partial['sections'] = compute_snapshot_sections(snapshot_dfs[-1], cached=False)
+        partials[snapshot_date] = partial
+        if history is not None:
+            history.append(snapshot_df)
+    if history is not None and not keep_latest:
+        history.latest = None # Only the last month's latest view is needed, so the others are not sent back
+    return partials, history
+
+@st.cache_resource
+def get_aggregation_pool(workers):
+    """Process pool shared by all sessions, started on the first parallel aggregation."""
+    # Spawned workers: aggregations run on background threads, where forking is unsafe
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def map_snapshot_partials(all_dfs, policy=None, workers=AGGREGATION_WORKERS, archive=None, rolling_state=None, sections=None):
+    """
+    Runs the per-snapshot aggregations still missing from the previous
+    `archive`, `rolling_state` and carried page `sections` as map tasks, one
+    per month, on the shared process pool, and reduces them in date order:
+    partial results are keyed by snapshot date and, when the whole history is
+    mapped, the monthly history stores are concatenated. Returns (partials,
+    history or None), or None when the missing part is too small (or `workers`
+    too few) to be worth the pool; callers then take the serial path, which
+    gives identical results.
+    """
+    if workers <= 1:
+        return None
+    snapshots = snapshots_by_date(all_dfs)
+    merged = {snapshot_date: merged_snapshot(snapshot_dfs) for snapshot_date, snapshot_dfs in snapshots.items()}
+    ordered_dates = sorted(merged)
+    archived = archived_prefix_length(archive, merged, policy) or 0
+    rolled = rolling_prefix_length(rolling_state, merged) or 0
+
+    needed = {}
+    for i, snapshot_date in enumerate(ordered_dates):
+        parts = []
+        if i >= archived:
+            parts.append('archive')
+        if i >= rolled:
+            parts.append('rolling')
+        if carried_sections(sections, snapshot_date, snapshots[snapshot_date][-1]) is None:
+            parts.append('sections')
+        if parts:
+            needed[snapshot_date] = parts
+    partitions = month_partitions(needed)
+    needed_rows = sum(len(merged[snapshot_date]) for snapshot_date in needed)
+    if len(partitions) < 2 or needed_rows < AGGREGATION_PARALLEL_MIN_ROWS:
+        return None
+
+    # The history store is only mapped when nothing is archived yet; otherwise it is built serially
+    with_history = archived == 0
+    tasks = []
+    previous_date = None
+    for i, dates in enumerate(partitions):
+        previous_df = merged[previous_date] if with_history and previous_date is not None else None
+        tasks.append(([(snapshot_date, snapshots[snapshot_date], needed[snapshot_date]) for snapshot_date in dates],
+                      previous_df, policy, with_history, i == len(partitions) - 1))
+        previous_date = dates[-1]
+
+    try:
+        results = list(get_aggregation_pool(workers).map(map_month_partition, *zip(*tasks)))
+    except concurrent.futures.process.BrokenProcessPool:
+        get_aggregation_pool.clear() # A worker died; the next aggregation starts a fresh pool
+        raise
+
+    partials = {}
+    for month_partials, _ in results:
+        partials.update(month_partials)
+    history = DeltaHistoryStore.concat([history for _, history in results], policy=policy) if with_history else None
+    return partials, history
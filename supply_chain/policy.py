@@ -0,0 +1,92 @@
+"""Safety-stock policy engine: per-family / per-warehouse rule tables."""
+
+import pandas as pd
+import numpy as np
+
+# --- Stock Policy Rules ---
+
+DEFAULT_SAFETY_STOCK_RATE = 0.2 # Safety stock as a share of on-hand quantity
+DEFAULT_OVERSTOCK_FACTOR = 1.5 # Over-stock above this multiple of the safety stock
+POLICY_WILDCARD = 'All'
+POLICY_COLUMNS = ['Item Family', 'Warehouse', 'Safety Stock %', 'Over-stock Factor']
+
+def default_policy():
+    """Rule table equivalent to the built-in defaults."""
+    return pd.DataFrame([{
+        'Item Family': POLICY_WILDCARD,
+        'Warehouse': POLICY_WILDCARD,
+        'Safety Stock %': DEFAULT_SAFETY_STOCK_RATE * 100,
+        'Over-stock Factor': DEFAULT_OVERSTOCK_FACTOR,
+    }], columns=POLICY_COLUMNS)
+
+def normalize_policy(rules):
+    """
+    Cleans an edited rule table: blank keys become the wildcard, rows with
+    missing or negative parameters are dropped and, for repeated keys, the
+    last row wins.
+    """
+    rules = pd.DataFrame(rules).reindex(columns=POLICY_COLUMNS)
+    for col in ['Item Family', 'Warehouse']:
+        keys = rules[col].astype(object).where(rules[col].notna(), '').astype(str).str.strip()
+        rules[col] = keys.where(keys != '', POLICY_WILDCARD)
+    for col in ['Safety Stock %', 'Over-stock Factor']:
+        rules[col] = pd.to_numeric(rules[col], errors='coerce')
+    valid = (rules['Safety Stock %'] >= 0) & (rules['Over-stock Factor'] >= 0)
+    rules = rules[valid.fillna(False)]
+    return rules.drop_duplicates(subset=['Item Family', 'Warehouse'], keep='last').reset_index(drop=True)
+
+def policy_key(policy):
+    """Stable text form of a policy for cache keys; None means the built-in defaults."""
+    if policy is None:
+        return 'default'
+    return normalize_policy(policy).to_csv(index=False)
+
+def resolve_policy(df, policy=None):
+    """
+    Safety-stock rate and over-stock factor for every row of `df`. Without a
+    policy the built-in scalars are returned. Otherwise the rules are joined on
+    the distinct (family, warehouse) pairs, from least to most specific, so a
+    family + warehouse rule beats a family rule, which beats a warehouse rule,
+    which beats the All / All rule; the result is broadcast back to the rows.
+    """
+    if policy is None or len(policy) == 0:
+        return DEFAULT_SAFETY_STOCK_RATE, DEFAULT_OVERSTOCK_FACTOR
+
+    rules = normalize_policy(policy)
+    families = df['Item Family'] if 'Item Family' in df.columns else pd.Series('Unknown', index=df.index)
+    warehouses = df['Warehouse'] if 'Warehouse' in df.columns else pd.Series('Unknown', index=df.index)
+    # Distinct (family, warehouse) pairs via integer codes (cheap on categorical base columns)
+    family_codes, family_values = pd.factorize(families)
+    warehouse_codes, warehouse_values = pd.factorize(warehouses)
+    codes, pair_ids = pd.factorize(family_codes.astype(np.int64) * max(len(warehouse_values), 1) + warehouse_codes)
+    pairs = pd.MultiIndex.from_arrays([
+        np.asarray(family_values, dtype=object)[pair_ids // max(len(warehouse_values), 1)].astype(str),
+        np.asarray(warehouse_values, dtype=object)[pair_ids % max(len(warehouse_values), 1)].astype(str),
+    ])
+
+    rate = np.full(len(pairs), DEFAULT_SAFETY_STOCK_RATE)
+    factor = np.full(len(pairs), DEFAULT_OVERSTOCK_FACTOR)
+    family_wild = (rules['Item Family'] == POLICY_WILDCARD).to_numpy()
+    warehouse_wild = (rules['Warehouse'] == POLICY_WILDCARD).to_numpy()
+    levels = [
+        (family_wild & warehouse_wild, []),
+        (family_wild & ~warehouse_wild, ['Warehouse']),
+        (~family_wild & warehouse_wild, ['Item Family']),
+        (~family_wild & ~warehouse_wild, ['Item Family', 'Warehouse']),
+    ]
+    pair_keys = {'Item Family': pairs.get_level_values(0), 'Warehouse': pairs.get_level_values(1)}
+    for mask, keys in levels:
+        level_rules = rules[mask]
+        if level_rules.empty:
+            continue
+        if keys:
+            index = pd.MultiIndex.from_frame(level_rules[keys]) if len(keys) > 1 else pd.Index(level_rules[keys[0]])
+            lookup = pd.MultiIndex.from_arrays([pair_keys[k] for k in keys]) if len(keys) > 1 else pair_keys[keys[0]]
+            match = index.get_indexer(lookup)
+        else:
+            match = np.zeros(len(pairs), dtype=np.intp)
+        hit = match >= 0
+        rate[hit] = level_rules['Safety Stock %'].to_numpy()[match[hit]] / 100
+        factor[hit] = level_rules['Over-stock Factor'].to_numpy()[match[hit]]
+
+    return rate[codes], factor[codes]
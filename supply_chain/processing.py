@@ -0,0 +1,300 @@
+"""Processing, compaction and validation of uploaded snapshots."""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from supply_chain.policy import resolve_policy
+
+# --- CSV Data Processing (for single file) ---
+
+PROCESSED_COLUMNS = ['Date', 'Item', 'Warehouse', 'On-hand Quantity', 'Price', 'Inventory Value',
+                     'Safety Stock', 'Missing Stock Amount', 'Excess Stock Value', 'Calculated Stock Status',
+                     'Item Family']
+
+# Export columns carried through unchanged so the analytics pages can use them
+PASSTHROUGH_NUMERIC_COLUMNS = ['Shipping times', 'Shipping costs', 'Lead times', 'Order quantities', 'Costs', 'Number of products sold',
+                               'Defect rates', 'Manufacturing costs', 'Manufacturing lead time', 'Production volumes', 'Revenue generated']
+PASSTHROUGH_CATEGORICAL_COLUMNS = ['Supplier name', 'Shipping carriers', 'Transportation modes', 'Routes', 'Inspection results']
+
+def process_single_csv(df, current_date):
+    """Processes a single pandas DataFrame to a standardized format."""
+    if df.empty:
+        return pd.DataFrame() # Return empty DataFrame if input is empty
+
+    # --- Rename and Prepare Columns ---
+    column_mapping = {
+        'Stock levels': 'On-hand Quantity',
+        'Location': 'Warehouse',
+        'SKU': 'Item',
+        'Product type': 'Item Family', # Renaming 'Product type' to 'Item Family'
+        'Price': 'Price',
+    }
+    df = df.rename(columns=column_mapping)
+
+    # Ensure critical numerical columns are numeric, handling errors
+    for col in ['Price', 'On-hand Quantity']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        else:
+            st.warning(f"Required column '{col}' not found in CSV. Some calculations might be affected.")
+            df[col] = 0 # Default to 0 if column is missing
+
+    # Assign the current date to all rows in this DataFrame
+    df['Date'] = pd.to_datetime(current_date)
+
+    # Take the status from the export when it provides one; otherwise it is derived below
+    if 'Stock Status' in df.columns:
+        df['Calculated Stock Status'] = df['Stock Status'].astype(str).str.upper().str.replace(' ', '-')
+
+    df = derive_stock_columns(df)
+
+    # Ensure 'Item Family' is present after renaming
+    if 'Item Family' not in df.columns:
+        # Fallback or create an empty 'Item Family' column if original 'Product type' was missing
+        df['Item Family'] = 'Unknown' 
+
+    # Keep whichever optional analytics columns the export provides
+    passthrough_cols = []
+    for col in PASSTHROUGH_NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+            passthrough_cols.append(col)
+    for col in PASSTHROUGH_CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna('Unknown').astype(str)
+            passthrough_cols.append(col)
+
+    return df[PROCESSED_COLUMNS + passthrough_cols]
+
+def derive_stock_columns(df, policy=None):
+    """
+    Adds the columns derived from on-hand quantity and price: inventory value,
+    safety stock, missing and excess amounts and, where not already present,
+    the calculated stock status. Safety-stock rate and over-stock factor come
+    from the stock policy (the built-in 20% / 1.5x when no policy is given).
+    """
+    on_hand = df['On-hand Quantity'].to_numpy()
+    price = df['Price'].to_numpy()
+    safety_rate, overstock_factor = resolve_policy(df, policy)
+
+    # Calculate Inventory Value
+    df['Inventory Value'] = price * on_hand
+
+    # Derive Safety Stock (a share of on-hand quantity set by the policy)
+    safety_stock = np.maximum(on_hand * safety_rate, 0) # Ensure non-negative
+    df['Safety Stock'] = safety_stock
+
+    # Derive Missing Stock Amount
+    df['Missing Stock Amount'] = np.where(on_hand < safety_stock, (safety_stock - on_hand) * price, 0)
+
+    # Derive Excess Stock Value
+    overstock_level = safety_stock * overstock_factor
+    excess_stock_value = np.where(on_hand > overstock_level, (on_hand - overstock_level) * price, 0)
+    df['Excess Stock Value'] = excess_stock_value
+
+    # Calculate Stock Status (over-stock takes precedence, as it did with successive .loc assignments)
+    derived_status = np.select(
+        [excess_stock_value > 0, on_hand <= 0, (on_hand > 0) & (on_hand < safety_stock)],
+        ['OVER-STOCK', 'STOCK-OUT', 'BELOW-SAFETY-STOCK'],
+        default='AT-STOCK'
+    )
+    if 'Calculated Stock Status' not in df.columns:
+        df['Calculated Stock Status'] = derived_status
+    else:
+        # Statuses from the export are kept; rows without one (mixed histories) are derived
+        existing = df['Calculated Stock Status'].astype(object)
+        df['Calculated Stock Status'] = existing.where(existing.notna(), derived_status)
+    return df
+
+# --- Compact Snapshot Representation ---
+
+DERIVED_STOCK_COLUMNS = ['Inventory Value', 'Safety Stock', 'Missing Stock Amount', 'Excess Stock Value', 'Calculated Stock Status']
+# Count-like columns that fit in int32 (or float32 when not integral); money columns stay float64
+COMPACT_QUANTITY_COLUMNS = ['On-hand Quantity', 'Order quantities', 'Number of products sold', 'Lead times', 'Shipping times',
+                            'Manufacturing lead time', 'Production volumes']
+COMPACT_CATEGORY_COLUMNS = ['Warehouse', 'Item Family'] + PASSTHROUGH_CATEGORICAL_COLUMNS
+
+def downcast_quantity(series):
+    """int32 for integral quantities within range, float32 otherwise."""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    int32 = np.iinfo(np.int32)
+    if np.isfinite(values).all() and (values == np.round(values)).all() and (values.size == 0 or (values.min() >= int32.min and values.max() <= int32.max)):
+        return series.astype(np.int32)
+    return series.astype(np.float32)
+
+POLICY_INPUT_COLUMNS = ['On-hand Quantity', 'Price', 'Item Family', 'Warehouse']
+
+def compact_base_frame(snapshot_df, policy=None):
+    """
+    Keeps only the base columns of a processed snapshot with compact dtypes: the
+    per-row Date and the derived value columns are dropped (the status is kept
+    only when it came from the export and cannot be re-derived under `policy`).
+    """
+    derived = derive_stock_columns(snapshot_df[[col for col in POLICY_INPUT_COLUMNS if col in snapshot_df.columns]].copy(), policy)
+    status_is_derived = bool((derived['Calculated Stock Status'].to_numpy() == snapshot_df['Calculated Stock Status'].to_numpy()).all())
+    drop_columns = ['Date'] + [col for col in DERIVED_STOCK_COLUMNS if col != 'Calculated Stock Status' or status_is_derived]
+    base = snapshot_df.drop(columns=[col for col in drop_columns if col in snapshot_df.columns])
+    for col in COMPACT_QUANTITY_COLUMNS:
+        if col in base.columns:
+            base[col] = downcast_quantity(base[col])
+    for col in COMPACT_CATEGORY_COLUMNS + ['Calculated Stock Status']:
+        if col in base.columns:
+            base[col] = base[col].astype('category')
+    return base
+
+def expand_base_frame(base, snapshot_date, policy=None):
+    """
+    Rebuilds the full processed layout from a compact base frame and its date
+    (one date, or one per row), deriving the stock columns under `policy`.
+    """
+    df = base.copy()
+    df.insert(0, 'Date', pd.Timestamp(snapshot_date) if np.ndim(snapshot_date) == 0 else pd.DatetimeIndex(snapshot_date))
+    df = derive_stock_columns(df, policy)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
+            # Plain strings again, so downstream groupbys behave exactly as on processed CSVs
+            df[col] = df[col].astype(str)
+    extra_columns = [col for col in df.columns if col not in PROCESSED_COLUMNS]
+    return df[PROCESSED_COLUMNS + extra_columns]
+
+class CompactSnapshot:
+    """
+    Memory-lean processed snapshot: the date is stored once, quantities are
+    int32/float32, low-cardinality text is categorical, and the derived value
+    columns are computed on demand instead of being stored.
+    """
+
+    def __init__(self, snapshot_df):
+        self.date = pd.Timestamp(snapshot_df['Date'].iloc[0]) if not snapshot_df.empty else None
+        self.base = compact_base_frame(snapshot_df) if not snapshot_df.empty else pd.DataFrame()
+
+    @property
+    def empty(self):
+        return self.base.empty
+
+    def __len__(self):
+        return len(self.base)
+
+    def column(self, name, policy=None):
+        """One column of the processed layout; derived columns are computed from the base columns."""
+        if name == 'Date':
+            return pd.Series(self.date, index=self.base.index, name='Date')
+        if name in self.base.columns:
+            return self.base[name]
+        inputs = self.base[[col for col in POLICY_INPUT_COLUMNS if col in self.base.columns]].copy()
+        return derive_stock_columns(inputs, policy)[name]
+
+    def to_frame(self, policy=None):
+        """Materializes the full processed snapshot, as returned by process_single_csv (under `policy`)."""
+        if self.empty:
+            return pd.DataFrame()
+        return expand_base_frame(self.base, self.date, policy)
+
+    def subset(self, rows):
+        """Compact snapshot of the rows selected by a boolean mask."""
+        snapshot = CompactSnapshot.__new__(CompactSnapshot)
+        snapshot.date = self.date
+        snapshot.base = self.base[rows].reset_index(drop=True)
+        return snapshot
+
+    def nbytes(self):
+        return int(self.base.memory_usage(deep=True).sum())
+
+def expand_snapshots(compact_snapshots, policy=None):
+    """
+    Materializes several compact snapshots under a stock policy. The base
+    columns of the whole history are stacked and classified in one vectorized
+    pass, then split back per snapshot; no raw file is read again.
+    """
+    snapshots = [snapshot for snapshot in compact_snapshots if not snapshot.empty]
+    if not snapshots:
+        return []
+    lengths = [len(snapshot) for snapshot in snapshots]
+    base = pd.concat([snapshot.base for snapshot in snapshots], ignore_index=True)
+    dates = pd.DatetimeIndex([snapshot.date for snapshot in snapshots]).repeat(lengths)
+    full = expand_base_frame(base, dates, policy)
+    bounds = np.cumsum([0] + lengths)
+    return [full.iloc[start:stop].reset_index(drop=True) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+# --- Ingest Validation ---
+
+REQUIRED_COLUMNS = ['SKU', 'Location', 'Stock levels', 'Price']
+KEY_COLUMNS = ['SKU', 'Location'] # Without these a file cannot be processed; the other required columns default to 0
+REQUIRED_NUMERIC_COLUMNS = ['Price', 'Stock levels'] # Blank or non-numeric cells are processed as 0
+VALIDATION_NUMERIC_COLUMNS = REQUIRED_NUMERIC_COLUMNS + PASSTHROUGH_NUMERIC_COLUMNS
+VALIDATION_SAMPLE_ROWS = 5
+
+def validate_raw_snapshot(df):
+    """
+    Runs vectorized checks over a raw CSV frame (original export column names) in
+    a single pass per check: required columns, blank required numbers, numeric
+    coercion failures, negative stock, duplicate SKU x Location keys and
+    out-of-range defect rates.
+    Returns a compact report with a few sample offending rows per failed check;
+    `blocking` is set when a key column is missing and the file cannot be processed.
+    """
+    issues = []
+
+    def add_issue(check, severity, message, mask=None, columns=None):
+        issue = {'check': check, 'severity': severity, 'message': message, 'count': 0, 'sample': []}
+        if mask is not None:
+            offending = np.flatnonzero(mask)
+            if len(offending) == 0:
+                return
+            issue['count'] = len(offending)
+            sample = df.iloc[offending[:VALIDATION_SAMPLE_ROWS]]
+            sample = sample[[c for c in (columns or []) if c in df.columns] or list(df.columns)]
+            # CSV line numbers: the header is line 1
+            issue['sample'] = sample.assign(**{'CSV line': offending[:VALIDATION_SAMPLE_ROWS] + 2}).to_dict('records')
+        issues.append(issue)
+
+    missing_keys = [col for col in KEY_COLUMNS if col not in df.columns]
+    if missing_keys:
+        add_issue('Required columns', 'error', f"Missing key column(s): {', '.join(missing_keys)}. The file cannot be processed without them.")
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns and col not in KEY_COLUMNS]
+    if missing_columns:
+        add_issue('Required columns', 'error', f"Missing required column(s): {', '.join(missing_columns)}. They default to 0.")
+    if 'Product type' not in df.columns:
+        add_issue('Required columns', 'warning', "Column 'Product type' not found; all items are grouped under family 'Unknown'.")
+
+    key_columns = [col for col in ['SKU', 'Location'] if col in df.columns]
+    if key_columns:
+        add_issue('Missing keys', 'error', "Rows without SKU or Location.",
+                  df[key_columns].isna().any(axis=1).to_numpy(), key_columns)
+
+    numeric = {}
+    for col in VALIDATION_NUMERIC_COLUMNS:
+        if col not in df.columns:
+            continue
+        if col in REQUIRED_NUMERIC_COLUMNS:
+            # Blank cells (and markers such as 'n/a') are read as NaN and would silently become 0
+            add_issue('Missing values', 'error', f"Blank values in '{col}' (treated as 0).",
+                      df[col].isna().to_numpy(), key_columns + [col])
+        if pd.api.types.is_numeric_dtype(df[col]):
+            numeric[col] = df[col] # Already parsed as numbers, nothing can fail to coerce
+            continue
+        numeric[col] = pd.to_numeric(df[col], errors='coerce')
+        treated_as = 'treated as 0' if col in REQUIRED_NUMERIC_COLUMNS else 'left empty'
+        add_issue('Numeric coercion', 'error', f"Non-numeric values in '{col}' ({treated_as}).",
+                  (numeric[col].isna() & df[col].notna()).to_numpy(), key_columns + [col])
+
+    if 'Stock levels' in numeric:
+        add_issue('Negative stock', 'error', "Negative 'Stock levels'.",
+                  (numeric['Stock levels'] < 0).to_numpy(), key_columns + ['Stock levels'])
+
+    if len(key_columns) == 2:
+        add_issue('Duplicate keys', 'warning', "Duplicate SKU x Location rows.",
+                  df.duplicated(key_columns, keep=False).to_numpy(), key_columns)
+
+    if 'Defect rates' in numeric:
+        add_issue('Defect rate range', 'warning', "'Defect rates' outside 0-100%.",
+                  ((numeric['Defect rates'] < 0) | (numeric['Defect rates'] > 100)).to_numpy(), key_columns + ['Defect rates'])
+
+    return {
+        'rows': len(df),
+        'issues': issues,
+        'blocking': bool(missing_keys),
+        'errorCount': sum(1 for issue in issues if issue['severity'] == 'error'),
+        'warningCount': sum(1 for issue in issues if issue['severity'] == 'warning'),
+    }
@@ -0,0 +1,85 @@
+"""Quality and manufacturing scorecards per snapshot."""
+
+import pandas as pd
+import numpy as np
+
+# --- Quality & Manufacturing Scorecards (per snapshot) ---
+
+QUALITY_DIMENSIONS = ['Supplier name', 'Item Family']
+QUALITY_COLUMNS = ['Defect rates', 'Manufacturing costs', 'Manufacturing lead time', 'Production volumes', 'Inspection results']
+QUALITY_LEAD_TIME_QUANTILES = [0.1, 0.5, 0.9]
+
+def compute_quality_scorecards(snapshot_df):
+    """
+    Quality scorecard of one processed snapshot per supplier and per item family.
+    Defect rates are percentages of the production volume and manufacturing
+    costs are per unit, so defects and costs are volume-weighted. All sums come
+    from a single grouped aggregation over precomputed columns; cached per
+    snapshot content in the shared cache (see compute_snapshot_sections).
+    """
+    dims = [d for d in QUALITY_DIMENSIONS if d in snapshot_df.columns]
+    if snapshot_df.empty or not dims or not any(col in snapshot_df.columns for col in QUALITY_COLUMNS):
+        return {}
+
+    def numeric(col):
+        if col not in snapshot_df.columns:
+            return np.full(len(snapshot_df), np.nan)
+        return snapshot_df[col].to_numpy(dtype=float, na_value=np.nan)
+
+    volume = numeric('Production volumes')
+    defect_rate = numeric('Defect rates') / 100
+    unit_cost = numeric('Manufacturing costs')
+    inspection = (snapshot_df['Inspection results'].astype(str).str.capitalize().to_numpy()
+                  if 'Inspection results' in snapshot_df.columns else np.full(len(snapshot_df), 'Unknown'))
+
+    df = snapshot_df[dims].assign(
+        volume=np.nan_to_num(volume),
+        defectUnits=np.nan_to_num(volume * defect_rate),
+        manufacturingCost=np.nan_to_num(volume * unit_cost),
+        defectCost=np.nan_to_num(volume * unit_cost * defect_rate),
+        inspected=np.isin(inspection, ['Pass', 'Fail']).astype(np.int64),
+        failed=(inspection == 'Fail').astype(np.int64),
+        pending=(inspection == 'Pending').astype(np.int64),
+        leadTime=numeric('Manufacturing lead time'),
+    )
+
+    scorecards = {}
+    for dim in dims:
+        grouped = df.groupby(dim, observed=True, sort=True)
+        summary = grouped.agg(
+            positions=('volume', 'size'),
+            productionVolume=('volume', 'sum'),
+            defectUnits=('defectUnits', 'sum'),
+            manufacturingCost=('manufacturingCost', 'sum'),
+            defectCost=('defectCost', 'sum'),
+            inspected=('inspected', 'sum'),
+            failed=('failed', 'sum'),
+            pending=('pending', 'sum'),
+            avgLeadTime=('leadTime', 'mean'),
+        )
+        # Lead-time percentiles for every group in one call, unstacked into columns
+        lead_q = grouped['leadTime'].quantile(QUALITY_LEAD_TIME_QUANTILES).unstack()
+        lead_q.columns = [f"leadTimeP{int(q * 100)}" for q in QUALITY_LEAD_TIME_QUANTILES]
+        summary = summary.join(lead_q)
+
+        volume_total = summary['productionVolume'].where(summary['productionVolume'] > 0)
+        summary['defectRate'] = (summary['defectUnits'] / volume_total * 100).fillna(0)
+        summary['defectCostShare'] = (summary['defectCost'] / summary['manufacturingCost'].where(summary['manufacturingCost'] > 0) * 100).fillna(0)
+        summary['failureRate'] = (summary['failed'] / summary['inspected'].where(summary['inspected'] > 0) * 100).fillna(0)
+        scorecards[dim] = summary.reset_index()
+
+    return scorecards
+
+def build_quality_evolution(quality_by_date):
+    """
+    Stacks the per-snapshot scorecards into one time series per dimension. Only
+    the already aggregated scorecards are read, never the snapshot rows, so a
+    new snapshot adds one cached aggregation instead of a rescan of the history.
+    """
+    evolution = {}
+    for dim in QUALITY_DIMENSIONS:
+        frames = [scorecards[dim].assign(Date=pd.Timestamp(snapshot_date))
+                  for snapshot_date, scorecards in sorted(quality_by_date.items()) if dim in scorecards]
+        if frames:
+            evolution[dim] = pd.concat(frames, ignore_index=True)
+    return evolution
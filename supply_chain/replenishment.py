@@ -0,0 +1,85 @@
+"""Reorder point and EOQ replenishment engine."""
+
+import pandas as pd
+import numpy as np
+
+# --- Replenishment Engine (reorder point / EOQ) ---
+
+REPLENISHMENT_DEFAULTS = {
+    'service_level_z': 1.65, # ~95% cycle service level
+    'holding_rate': 0.25, # Yearly holding cost as a share of the unit price
+    'demand_cv': 0.3, # Demand variability assumed when the history is too short
+}
+REPLENISHMENT_INPUT_COLUMNS = ['Number of products sold', 'Lead times', 'Order quantities', 'Costs']
+
+def build_replenishment_inputs(master_df, current_df):
+    """
+    Collects the per-position inputs of the replenishment engine: the latest
+    snapshot's stock, price, sales, lead time, order size and ordering cost, plus
+    the standard deviation of sales across snapshots when there are enough of them.
+    """
+    if any(col not in current_df.columns for col in REPLENISHMENT_INPUT_COLUMNS):
+        return pd.DataFrame()
+
+    inputs = current_df[['Date', 'Item', 'Warehouse', 'Item Family', 'On-hand Quantity', 'Price'] + REPLENISHMENT_INPUT_COLUMNS].reset_index(drop=True)
+    if master_df['Date'].nunique() >= 3:
+        sales_std = master_df.groupby(['Item', 'Warehouse'], observed=True)['Number of products sold'].std()
+        inputs['Sales Std'] = sales_std.reindex(pd.MultiIndex.from_frame(inputs[['Item', 'Warehouse']])).to_numpy()
+    else:
+        inputs['Sales Std'] = np.nan
+    return inputs
+
+def compute_replenishment(inputs, sales_period_days, service_level_z=1.65, holding_rate=0.25, demand_cv=0.3):
+    """
+    Computes reorder points, economic order quantities and suggested order dates for
+    every position at once with NumPy array operations:
+        daily demand d = sold / period,  safety stock = z * sigma_d * sqrt(L),
+        reorder point = d * L + safety stock,  EOQ = sqrt(2 * D * S / H)
+    with D the yearly demand, S the ordering cost ('Costs') and H the yearly holding
+    cost per unit. Orders are at least the usual order size ('Order quantities').
+    `sales_period_days` is the period 'Number of products sold' covers, the
+    payload's salesPeriodDays, so demand agrees with the turnover ratios.
+    """
+    if inputs.empty:
+        return pd.DataFrame()
+
+    on_hand = inputs['On-hand Quantity'].to_numpy(dtype=float)
+    price = inputs['Price'].to_numpy(dtype=float)
+    daily_demand = np.nan_to_num(inputs['Number of products sold'].to_numpy(dtype=float)) / sales_period_days
+    lead_time = np.nan_to_num(inputs['Lead times'].to_numpy(dtype=float))
+    order_size = np.nan_to_num(inputs['Order quantities'].to_numpy(dtype=float))
+    ordering_cost = np.nan_to_num(inputs['Costs'].to_numpy(dtype=float))
+
+    # Observed variability when available, otherwise a fixed coefficient of variation
+    sales_std = inputs['Sales Std'].to_numpy(dtype=float) / sales_period_days
+    demand_std = np.where(np.isnan(sales_std), daily_demand * demand_cv, sales_std)
+
+    safety_stock = service_level_z * demand_std * np.sqrt(lead_time)
+    reorder_point = daily_demand * lead_time + safety_stock
+
+    holding_cost = holding_rate * price
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eoq = np.sqrt(2 * daily_demand * 365 * ordering_cost / holding_cost)
+        days_to_reorder = (on_hand - reorder_point) / daily_demand
+    eoq = np.nan_to_num(eoq, posinf=0)
+    order_qty = np.ceil(np.maximum(eoq, order_size))
+
+    has_demand = daily_demand > 0
+    days_to_reorder = np.where(has_demand, np.maximum(days_to_reorder, 0), np.nan)
+    order_date = inputs['Date'].to_numpy() + pd.to_timedelta(np.ceil(days_to_reorder), unit='D').to_numpy()
+
+    return pd.DataFrame({
+        'Item': inputs['Item'].to_numpy(),
+        'Warehouse': inputs['Warehouse'].to_numpy(),
+        'Item Family': inputs['Item Family'].to_numpy(),
+        'On-hand Quantity': on_hand,
+        'Daily Demand': daily_demand,
+        'Safety Stock': safety_stock,
+        'Reorder Point': reorder_point,
+        'EOQ': eoq,
+        'Order Quantity': np.where(has_demand, order_qty, 0),
+        'Order Value': np.where(has_demand, order_qty * price, 0),
+        'Days to Reorder': days_to_reorder,
+        'Suggested Order Date': order_date,
+        'Order Now': has_demand & (on_hand <= reorder_point),
+    })
@@ -0,0 +1,236 @@
+"""Snapshot retention: recent snapshots at row detail, older ones compacted into coarser tiers."""
+
+import os
+
+import pandas as pd
+import numpy as np
+
+from supply_chain.cube import CUBE_DIMENSIONS, CUBE_MEASURES, build_snapshot_cube
+from supply_chain.policy import policy_key
+from supply_chain.rolling import snapshot_fingerprint
+
+# --- Snapshot Retention and Compaction ---
+
+# Ages (in days before the latest snapshot) at which data moves to the next, coarser tier
+RETENTION_DEFAULTS = {
+    'full_days': int(os.environ.get('SC_RETENTION_FULL_DAYS', '35')), # Full rows
+    'daily_days': int(os.environ.get('SC_RETENTION_DAILY_DAYS', '180')), # Per-item daily aggregates
+    'monthly_days': int(os.environ.get('SC_RETENTION_MONTHLY_DAYS', '730')), # Per-item monthly aggregates, then cube only
+}
+ITEM_MEASURES = {
+    'onHand': 'On-hand Quantity',
+    'inventoryValue': 'Inventory Value',
+    'excessValue': 'Excess Stock Value',
+    'missingAmount': 'Missing Stock Amount',
+    'sold': 'Number of products sold',
+}
+RETENTION_TIERS = ['full', 'daily', 'monthly', 'cube']
+
+def stack_frames(frames):
+    """Concatenates the non-empty frames (empty placeholders would turn typed columns into object)."""
+    frames = [frame for frame in frames if not frame.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def item_daily_aggregates(snapshot_df):
+    """Per-item totals of one processed snapshot (measures missing from the export are NaN)."""
+    values = pd.DataFrame({
+        measure: pd.to_numeric(snapshot_df[column], errors='coerce').to_numpy(dtype=float) if column in snapshot_df.columns else np.nan
+        for measure, column in ITEM_MEASURES.items()
+    })
+    values['positions'] = 1
+    items = values.groupby(snapshot_df['Item'].astype(str).to_numpy(), sort=True).sum(min_count=1)
+    items = items.rename_axis('Item').reset_index()
+    snapshot_date = pd.Timestamp(snapshot_df['Date'].iloc[0])
+    items.insert(0, 'Date', snapshot_date)
+    items.insert(1, 'Month', snapshot_date.to_period('M'))
+    return items
+
+class SnapshotArchive:
+    """
+    Snapshot history kept at decreasing resolution with age. Snapshots from the
+    last `full_days` keep every row, served by the delta-encoded history store
+    of the payload (the archive only holds their per-item aggregates, so rows
+    are never stored twice); older dates are reduced to per-item daily aggregates, months older than `daily_days` to
+    per-item monthly aggregates (summed over the month's snapshots, with the
+    snapshot count), and months older than `monthly_days` only survive in the
+    status cube, which covers every date. The readers below combine the tiers,
+    so evolution series span the whole history without scanning full rows.
+    """
+
+    def __init__(self, policy=None, retention=None):
+        self.policy = policy
+        self.retention = dict(RETENTION_DEFAULTS, **(retention or {}))
+        self.dates = []
+        self.fingerprints = []
+        self.full_items = {} # Date -> per-item aggregates of a snapshot still held in full by the history store
+        self.daily = pd.DataFrame()
+        self.monthly = pd.DataFrame()
+        self.month_items = pd.DataFrame() # Distinct items per month of the months kept only in the cube
+        self.cube_parts = []
+
+    def copy(self):
+        """Shallow copy with its own containers (tier frames are replaced, never modified in place)."""
+        archive = SnapshotArchive(self.policy, self.retention)
+        archive.dates = list(self.dates)
+        archive.fingerprints = list(self.fingerprints)
+        archive.full_items = dict(self.full_items)
+        archive.daily = self.daily
+        archive.monthly = self.monthly
+        archive.month_items = self.month_items
+        archive.cube_parts = list(self.cube_parts)
+        return archive
+
+    def add(self, snapshot_df, partial=None):
+        """
+        Adds a processed snapshot newer than every archived date at full detail.
+        `partial` holds its parts already computed by archive_partial (e.g. on a
+        worker process).
+        """
+        snapshot_date = pd.Timestamp(snapshot_df['Date'].iloc[0])
+        if self.dates and snapshot_date <= self.dates[-1]:
+            raise ValueError(f"Snapshot {snapshot_date.date()} is not newer than {self.dates[-1].date()}")
+        partial = partial or archive_partial(snapshot_df)
+        self.dates.append(snapshot_date)
+        self.fingerprints.append(partial['fingerprint'])
+        self.full_items[snapshot_date] = partial['items']
+        self.cube_parts.append(partial['cube'])
+
+    def compact(self):
+        """
+        Moves data that aged out of its tier to the next one. Months move as a
+        whole between the daily, monthly and cube tiers, so a month's item
+        counts are never split across aggregates. Returns the number of dates
+        and months moved per tier.
+        """
+        moved = dict.fromkeys(RETENTION_TIERS[1:], 0)
+        if not self.dates:
+            return moved
+        latest = self.dates[-1]
+
+        full_cutoff = latest - pd.Timedelta(days=self.retention['full_days'])
+        aged = [snapshot_date for snapshot_date in self.full_items if snapshot_date <= full_cutoff]
+        if aged:
+            self.daily = stack_frames([self.daily] + [self.full_items.pop(snapshot_date) for snapshot_date in aged])
+            moved['daily'] = len(aged)
+
+        daily_cutoff = (latest - pd.Timedelta(days=self.retention['daily_days'])).to_period('M')
+        if not self.daily.empty:
+            aged = self.daily['Month'] < daily_cutoff
+            if aged.any():
+                monthly = self.daily[aged].groupby(['Month', 'Item'], sort=True)[list(ITEM_MEASURES) + ['positions']].sum(min_count=1)
+                monthly['snapshots'] = self.daily[aged].groupby(['Month', 'Item'], sort=True)['Date'].nunique()
+                self.monthly = stack_frames([self.monthly, monthly.reset_index()])
+                moved['monthly'] = int(self.daily.loc[aged, 'Month'].nunique())
+                self.daily = self.daily[~aged].reset_index(drop=True)
+
+        monthly_cutoff = (latest - pd.Timedelta(days=self.retention['monthly_days'])).to_period('M')
+        if not self.monthly.empty:
+            aged = self.monthly['Month'] < monthly_cutoff
+            if aged.any():
+                counts = self.monthly[aged].groupby('Month', sort=True)['Item'].nunique().reset_index(name='items')
+                self.month_items = stack_frames([self.month_items, counts])
+                moved['cube'] = len(counts)
+                self.monthly = self.monthly[~aged].reset_index(drop=True)
+        return moved
+
+    @property
+    def cube(self):
+        """Status cube of every archived date (the coarsest tier, never compacted)."""
+        if not self.cube_parts:
+            return pd.DataFrame(columns=CUBE_DIMENSIONS + ['Month'] + CUBE_MEASURES)
+        return pd.concat(self.cube_parts, ignore_index=True)
+
+    def item_frames(self):
+        """Per-item aggregates of every tier that still has item detail, oldest first."""
+        frames = [self.monthly, self.daily] + [self.full_items[snapshot_date] for snapshot_date in sorted(self.full_items)]
+        return [frame for frame in frames if not frame.empty]
+
+    def monthly_items(self):
+        """Distinct items per month across all tiers."""
+        frames = self.item_frames()
+        counts = [self.month_items]
+        if frames:
+            pairs = pd.concat([frame[['Month', 'Item']] for frame in frames], ignore_index=True)
+            counts.append(pairs.drop_duplicates().groupby('Month', sort=True).size().reset_index(name='items'))
+        counts = stack_frames(counts)
+        if counts.empty:
+            return pd.DataFrame({'Month': pd.PeriodIndex([], freq='M'), 'items': np.zeros(0, dtype=int)})
+        return counts.sort_values('Month', kind='stable').reset_index(drop=True)
+
+    def item_totals(self, measure):
+        """Sum of an item measure over every snapshot still held at item detail."""
+        frames = self.item_frames()
+        if not frames:
+            return pd.Series(dtype=float)
+        return pd.concat([frame[['Item', measure]] for frame in frames], ignore_index=True).groupby('Item')[measure].sum()
+
+    def nbytes(self):
+        return int(self.tier_summary()['bytes'].sum())
+
+    def tier_summary(self):
+        """Dates, rows and memory held per tier (full-tier rows are counted, but held by the history store)."""
+        return pd.DataFrame([
+            {'tier': 'full', 'dates': len(self.full_items), 'rows': int(sum(frame['positions'].sum() for frame in self.full_items.values())),
+             'bytes': sum(int(frame.memory_usage(deep=True).sum()) for frame in self.full_items.values())},
+            {'tier': 'daily', 'dates': int(self.daily['Date'].nunique()) if not self.daily.empty else 0, 'rows': len(self.daily),
+             'bytes': int(self.daily.memory_usage(deep=True).sum())},
+            {'tier': 'monthly', 'dates': int(self.monthly['Month'].nunique()) if not self.monthly.empty else 0, 'rows': len(self.monthly),
+             'bytes': int(self.monthly.memory_usage(deep=True).sum())},
+            {'tier': 'cube', 'dates': len(self.month_items), 'rows': sum(len(part) for part in self.cube_parts),
+             'bytes': sum(int(part.memory_usage(deep=True).sum()) for part in self.cube_parts)},
+        ])
+
+def archive_partial(snapshot_df):
+    """The parts SnapshotArchive.add keeps of one snapshot."""
+    return {
+        'fingerprint': snapshot_fingerprint(snapshot_df),
+        'items': item_daily_aggregates(snapshot_df),
+        'cube': build_snapshot_cube(snapshot_df),
+    }
+
+def archived_prefix_length(archive, snapshots, policy=None):
+    """
+    Number of leading dates of `snapshots` ({date: combined snapshot}) the archive
+    already holds, unchanged and under `policy`; None when it has to be rebuilt.
+    """
+    if archive is None or policy_key(archive.policy) != policy_key(policy):
+        return None
+    ordered_dates = sorted(snapshots)
+    known = len(archive.dates)
+    is_prefix = known <= len(ordered_dates) and all(
+        ordered_dates[i] == archive.dates[i]
+        and snapshot_fingerprint(snapshots[ordered_dates[i]]) == archive.fingerprints[i]
+        for i in range(known)
+    )
+    return known if is_prefix else None
+
+def update_archive(archive, all_dfs, policy=None, partials=None):
+    """
+    Brings the archive up to date with the given snapshots and compacts it.
+    As with the rolling state, newer snapshots are appended to a copy of the
+    previous archive; it is only rebuilt when an archived snapshot changed,
+    disappeared or was re-dated, or when the stock policy changed. `partials`
+    maps snapshot dates to precomputed archive_partial results.
+    """
+    snapshots = {}
+    for snapshot_df in all_dfs:
+        if snapshot_df.empty:
+            continue
+        snapshot_date = pd.to_datetime(snapshot_df['Date'].iloc[0])
+        if snapshot_date in snapshots:
+            snapshots[snapshot_date] = pd.concat([snapshots[snapshot_date], snapshot_df], ignore_index=True)
+        else:
+            snapshots[snapshot_date] = snapshot_df
+    ordered_dates = sorted(snapshots)
+
+    known = archived_prefix_length(archive, snapshots, policy)
+    if known is not None:
+        archive = archive.copy() # A cached archive may be shared with other sessions
+    else:
+        archive = SnapshotArchive(policy)
+        known = 0
+
+    for snapshot_date in ordered_dates[known:]:
+        archive.add(snapshots[snapshot_date], (partials or {}).get(snapshot_date))
+    archive.compact()
+    return archive
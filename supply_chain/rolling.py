@@ -0,0 +1,168 @@
+"""Incremental rolling-window metrics."""
+
+import weakref
+
+import pandas as pd
+import numpy as np
+
+from supply_chain.cache import content_hash
+
+# --- Rolling-Window Metrics (incremental cumulative sums) ---
+
+ROLLING_WINDOWS = [7, 30, 90]
+ROLLING_METRICS = ['inventoryValue', 'excessValue', 'missingAmount', 'stockOuts']
+ROLLING_DIMENSIONS = ['Warehouse', 'Item Family']
+ROLLING_METRIC_LABELS = {
+    'inventoryValue': 'Inventory Value',
+    'excessValue': 'Excess Stock Value',
+    'missingAmount': 'Missing Stock Amount',
+    'stockOuts': 'Stock-out Positions',
+}
+
+def snapshot_group_totals(snapshot_df, dim):
+    """Sums the rolling metrics of one snapshot per value of `dim`."""
+    values = pd.DataFrame({
+        'inventoryValue': snapshot_df['Inventory Value'].to_numpy(dtype=float),
+        'excessValue': snapshot_df['Excess Stock Value'].to_numpy(dtype=float),
+        'missingAmount': snapshot_df['Missing Stock Amount'].to_numpy(dtype=float),
+        'stockOuts': (snapshot_df['Calculated Stock Status'] == 'STOCK-OUT').to_numpy(dtype=float),
+    })
+    return values.groupby(snapshot_df[dim].to_numpy(), sort=False).sum()
+
+# Fingerprints of the frames still alive, by id, so each frame is hashed once however many states check it
+SNAPSHOT_FINGERPRINTS = {}
+
+def snapshot_fingerprint(snapshot_df):
+    """Content hash of every row and column of a snapshot, used to detect a snapshot whose contents changed."""
+    key = id(snapshot_df)
+    fingerprint = SNAPSHOT_FINGERPRINTS.get(key)
+    if fingerprint is None:
+        # Excess and missing columns depend on the stock policy, so a policy change invalidates the state too
+        row_hashes = pd.util.hash_pandas_object(snapshot_df, index=False).to_numpy()
+        fingerprint = content_hash(*snapshot_df.columns, row_hashes.tobytes())
+        SNAPSHOT_FINGERPRINTS[key] = fingerprint
+        weakref.finalize(snapshot_df, SNAPSHOT_FINGERPRINTS.pop, key, None) # Forgotten before the id can be reused
+    return fingerprint
+
+def append_snapshot_to_rolling_state(state, snapshot_date, snapshot_df, group_totals=None):
+    """
+    Appends one snapshot (newer than every snapshot already in `state`) by adding
+    its per-group totals onto the last cumulative-sum row. Nothing already in the
+    state is recomputed. `group_totals` are the snapshot's {dimension: totals}
+    when already computed.
+    """
+    state['dates'] = np.append(state['dates'], np.datetime64(snapshot_date, 'ns'))
+    state['fingerprints'].append(snapshot_fingerprint(snapshot_df))
+    for dim in ROLLING_DIMENSIONS:
+        dim_state = state['dimensions'][dim]
+        totals = group_totals[dim] if group_totals is not None else snapshot_group_totals(snapshot_df, dim)
+        new_labels = [label for label in totals.index if label not in dim_state['positions']]
+        if new_labels:
+            # Groups seen for the first time have a zero cumulative sum so far
+            for label in new_labels:
+                dim_state['positions'][label] = len(dim_state['labels'])
+                dim_state['labels'].append(label)
+            dim_state['cumsum'] = np.pad(dim_state['cumsum'], ((0, 0), (0, len(new_labels)), (0, 0)))
+        row = dim_state['cumsum'][-1].copy()
+        row[[dim_state['positions'][label] for label in totals.index]] += totals[ROLLING_METRICS].to_numpy()
+        dim_state['cumsum'] = np.concatenate([dim_state['cumsum'], row[np.newaxis]])
+    return state
+
+def rolling_prefix_length(state, snapshots):
+    """
+    Number of leading dates of `snapshots` ({date: combined snapshot}) already in
+    the rolling state, unchanged; None when the state has to be rebuilt.
+    """
+    if state is None:
+        return None
+    ordered_dates = sorted(snapshots)
+    known = len(state['dates'])
+    is_prefix = known <= len(ordered_dates) and all(
+        np.datetime64(ordered_dates[i], 'ns') == state['dates'][i]
+        and snapshot_fingerprint(snapshots[ordered_dates[i]]) == state['fingerprints'][i]
+        for i in range(known)
+    )
+    return known if is_prefix else None
+
+def update_rolling_state(state, all_dfs, group_totals=None):
+    """
+    Brings the rolling state up to date with the given snapshots. Snapshots newer
+    than the state are appended incrementally; the state is only rebuilt when an
+    already-included snapshot was changed, removed or re-dated. `group_totals`
+    maps snapshot dates to their precomputed per-dimension totals.
+    """
+    snapshots = {}
+    for snapshot_df in all_dfs:
+        if snapshot_df.empty:
+            continue
+        snapshot_date = pd.to_datetime(snapshot_df['Date'].iloc[0])
+        if snapshot_date in snapshots:
+            snapshots[snapshot_date] = pd.concat([snapshots[snapshot_date], snapshot_df], ignore_index=True)
+        else:
+            snapshots[snapshot_date] = snapshot_df
+    ordered_dates = sorted(snapshots)
+
+    known = rolling_prefix_length(state, snapshots)
+    if known is not None:
+        # Copy the containers so a cached state shared with other sessions is never mutated
+        state = {
+            'dates': state['dates'],
+            'fingerprints': list(state['fingerprints']),
+            'dimensions': {
+                dim: {'labels': list(dim_state['labels']), 'positions': dict(dim_state['positions']), 'cumsum': dim_state['cumsum']}
+                for dim, dim_state in state['dimensions'].items()
+            },
+        }
+    else:
+        state = {
+            'dates': np.array([], dtype='datetime64[ns]'),
+            'fingerprints': [],
+            'dimensions': {
+                dim: {'labels': [], 'positions': {}, 'cumsum': np.zeros((1, 0, len(ROLLING_METRICS)))}
+                for dim in ROLLING_DIMENSIONS
+            },
+        }
+        known = 0
+
+    for snapshot_date in ordered_dates[known:]:
+        append_snapshot_to_rolling_state(state, snapshot_date, snapshots[snapshot_date], (group_totals or {}).get(snapshot_date))
+    return state
+
+def rolling_window_means(state, dim, window_days):
+    """
+    Average of each metric per snapshot over the trailing `window_days` for every
+    date and group, read off the cumulative sums: (cs[t] - cs[t - window]) / n.
+    Returns an array of shape (dates, groups, metrics).
+    """
+    dates = state['dates']
+    cumsum = state['dimensions'][dim]['cumsum']
+    window_start = np.searchsorted(dates, dates - np.timedelta64(window_days, 'D'), side='right')
+    window_end = np.arange(1, len(dates) + 1)
+    window_sums = cumsum[window_end] - cumsum[window_start]
+    snapshot_counts = (window_end - window_start)[:, np.newaxis, np.newaxis]
+    return window_sums / snapshot_counts
+
+def build_rolling_metrics_data(state):
+    """Shapes the rolling metrics for the dashboard: latest value per group and window, plus total evolution."""
+    rolling_data = {'byDimension': {}, 'evolution': []}
+    if state is None or len(state['dates']) == 0:
+        return rolling_data
+
+    date_labels = pd.DatetimeIndex(state['dates']).strftime('%b %d, %y')
+    for dim in ROLLING_DIMENSIONS:
+        labels = state['dimensions'][dim]['labels']
+        records = []
+        for window_days in ROLLING_WINDOWS:
+            means = rolling_window_means(state, dim, window_days)
+            latest = pd.DataFrame(means[-1], columns=ROLLING_METRICS)
+            latest.insert(0, 'window', f"{window_days}d")
+            latest.insert(0, 'name', labels)
+            records.extend(latest.to_dict('records'))
+            if dim == ROLLING_DIMENSIONS[0]:
+                # Totals across warehouses are the company-wide rolling series
+                evolution = pd.DataFrame(means.sum(axis=1), columns=ROLLING_METRICS)
+                evolution.insert(0, 'window', f"{window_days}d")
+                evolution.insert(0, 'date', date_labels)
+                rolling_data['evolution'].extend(evolution.to_dict('records'))
+        rolling_data['byDimension'][dim] = records
+    return rolling_data
@@ -0,0 +1,125 @@
+"""What-if scenarios recomputed from cached base arrays of the latest snapshot."""
+
+import pandas as pd
+import numpy as np
+
+from supply_chain.policy import resolve_policy
+from supply_chain.processing import derive_stock_columns
+from supply_chain.transitions import STATUS_COLORS, STATUS_ORDER
+
+# --- What-if Scenario Simulator ---
+
+SCENARIO_PRICE_RANGE = (-50, 50) # Price change slider bounds, in percent
+SCENARIO_SAFETY_STOCK_RANGE = (0, 100) # Safety stock slider bounds, in percent of on-hand quantity
+
+def build_scenario_base(current_df, policy=None):
+    """
+    Base arrays of the latest snapshot for scenario runs: quantities and prices,
+    integer codes for warehouse and family, the policy's safety-stock rate and
+    over-stock factor per row, and the statuses supplied by the export (which
+    scenarios do not override, as for stock policies).
+    """
+    warehouse_codes, warehouses = pd.factorize(current_df['Warehouse'], sort=True)
+    family_codes, families = pd.factorize(current_df['Item Family'], sort=True)
+    safety_rate, overstock_factor = resolve_policy(current_df, policy)
+    n_rows = len(current_df)
+    inputs = current_df[['On-hand Quantity', 'Price', 'Item Family', 'Warehouse']].copy()
+    derived = derive_stock_columns(inputs, policy)['Calculated Stock Status'].to_numpy()
+    fixed = current_df['Calculated Stock Status'].to_numpy() != derived
+    # Export statuses outside STATUS_ORDER get -2 and stay out of the status counts
+    status_codes = pd.Categorical(current_df['Calculated Stock Status'], categories=STATUS_ORDER).codes
+    status_codes = np.where(status_codes >= 0, status_codes, -2)
+
+    return {
+        'onHand': current_df['On-hand Quantity'].to_numpy(dtype=float),
+        'price': current_df['Price'].to_numpy(dtype=float),
+        'warehouseCodes': warehouse_codes.astype(np.int32),
+        'warehouses': np.asarray(warehouses, dtype=object),
+        'familyCodes': family_codes.astype(np.int32),
+        'families': np.asarray(families, dtype=object),
+        'safetyRate': np.broadcast_to(np.asarray(safety_rate, dtype=float), (n_rows,)).copy(),
+        'overstockFactor': np.broadcast_to(np.asarray(overstock_factor, dtype=float), (n_rows,)).copy(),
+        'fixedStatus': np.where(fixed, status_codes, -1).astype(np.int8), # -1: derived by the scenario, else kept
+    }
+
+def simulate_scenario(base, price_change_pct=0.0, family_safety_stock_pct=None):
+    """
+    Recomputes the latest-snapshot KPIs, status breakdown and warehouse summary
+    for a scenario: prices scaled by `price_change_pct` and, per family in
+    `family_safety_stock_pct`, a new safety stock (percent of on-hand). Every
+    step is a vectorized array operation or a bincount over the cached codes.
+    """
+    on_hand = base['onHand']
+    price = base['price'] * (1 + price_change_pct / 100)
+
+    safety_rate = base['safetyRate']
+    if family_safety_stock_pct:
+        # Per-family override table, gathered by family code
+        family_rate = np.full(len(base['families']), np.nan)
+        family_index = {family: i for i, family in enumerate(base['families'])}
+        for family, pct in family_safety_stock_pct.items():
+            if family in family_index:
+                family_rate[family_index[family]] = pct / 100
+        override = family_rate[base['familyCodes']]
+        safety_rate = np.where(np.isnan(override), safety_rate, override)
+
+    safety_stock = np.maximum(on_hand * safety_rate, 0)
+    overstock_level = safety_stock * base['overstockFactor']
+    inventory_value = price * on_hand
+    missing_amount = np.where(on_hand < safety_stock, (safety_stock - on_hand) * price, 0)
+    excess_value = np.where(on_hand > overstock_level, (on_hand - overstock_level) * price, 0)
+    # Codes follow STATUS_ORDER; same precedence as derive_stock_columns
+    status = np.select(
+        [excess_value > 0, on_hand <= 0, (on_hand > 0) & (on_hand < safety_stock)],
+        [3, 0, 1],
+        default=2
+    ).astype(np.int8)
+    status = np.where(base['fixedStatus'] != -1, base['fixedStatus'], status)
+
+    n_warehouses, n_status = len(base['warehouses']), len(STATUS_ORDER)
+    wh = base['warehouseCodes']
+    by_warehouse = pd.DataFrame({
+        'name': base['warehouses'],
+        'inventoryValue': np.bincount(wh, weights=inventory_value, minlength=n_warehouses),
+        'excessStock': np.bincount(wh, weights=excess_value, minlength=n_warehouses),
+        'missingStock': np.bincount(wh, weights=missing_amount, minlength=n_warehouses),
+        'positions': np.bincount(wh, minlength=n_warehouses),
+    })
+    valid_status = status >= 0
+    warehouse_status = np.bincount(wh[valid_status].astype(np.int64) * n_status + status[valid_status],
+                                   minlength=n_warehouses * n_status).reshape(n_warehouses, n_status)
+    status_counts = warehouse_status.sum(axis=0)
+
+    def breakdown(counts):
+        table = pd.DataFrame({'name': STATUS_ORDER, 'value': counts})
+        table = table[table['value'] > 0].sort_values('value', ascending=False, kind='stable')
+        return table.assign(color=table['name'].map(STATUS_COLORS)).to_dict('records')
+
+    return {
+        'kpis': {
+            'inventoryValue': float(inventory_value.sum()),
+            'missingStockAmount': float(missing_amount.sum()),
+            'excessStockValue': float(excess_value.sum()),
+        },
+        'statusBreakdown': breakdown(status_counts),
+        'warehouseSummary': by_warehouse.to_dict('records'),
+        'warehouses': [dict(row, stockBreakdown=breakdown(warehouse_status[i])) for i, row in enumerate(by_warehouse.to_dict('records'))],
+    }
+
+def apply_scenario(data, scenario):
+    """
+    Dashboard payload with the scenario's KPIs, status breakdown and warehouse
+    figures. The cached payload is shared, so only copies of the touched
+    sections are replaced; everything else is reused as is.
+    """
+    scenario_data = dict(data)
+    scenario_data['kpis'] = scenario['kpis']
+    scenario_data['inventoryStatus'] = dict(data['inventoryStatus'], breakdown=scenario['statusBreakdown'])
+    scenario_data['executiveSummary'] = dict(data['executiveSummary'], warehouseSummary=scenario['warehouseSummary'])
+    scenario_data['warehouses'] = scenario['warehouses']
+    scenario_data['availability'] = dict(data['availability'],
+                                         inventoryValue=scenario['kpis']['inventoryValue'],
+                                         missingStockAmount=scenario['kpis']['missingStockAmount'],
+                                         excessStockValue=scenario['kpis']['excessStockValue'])
+    scenario_data['isScenario'] = True
+    return scenario_data
@@ -0,0 +1,33 @@
+"""Ad-hoc SQL over the snapshot history."""
+
+try:
+    import duckdb # Optional: powers the SQL mode of the Adhoc page
+except ImportError:
+    duckdb = None
+
+# --- Ad-hoc SQL over the Snapshot History ---
+
+DEFAULT_ADHOC_QUERY = """SELECT "Item Family", "Warehouse", SUM("Inventory Value") AS inventory_value
+FROM snapshots
+WHERE "Date" = (SELECT MAX("Date") FROM snapshots)
+GROUP BY ALL
+ORDER BY inventory_value DESC"""
+
+def run_adhoc_query(master_df, query):
+    """
+    Runs a SQL query with the embedded DuckDB engine over the processed snapshots.
+    The DataFrame is scanned in place (no copy); DuckDB reads only the columns
+    the query references, but every row of the frame. Exposes `snapshots` (full
+    history) and `latest`. External access is disabled, so queries cannot read
+    or write files on the server.
+    """
+    if duckdb is None:
+        raise RuntimeError("DuckDB is not installed. Run `pip install duckdb` to enable SQL queries.")
+
+    con = duckdb.connect(database=':memory:', config={'enable_external_access': False})
+    try:
+        con.register('snapshots', master_df)
+        con.execute('CREATE VIEW latest AS SELECT * FROM snapshots WHERE "Date" = (SELECT MAX("Date") FROM snapshots)')
+        return con.execute(query).df()
+    finally:
+        con.close()
@@ -0,0 +1,51 @@
+"""Position x Date matrices of the snapshot history."""
+
+import pandas as pd
+import numpy as np
+
+# --- Position x Date Matrix ---
+
+def scatter_matrix(row_codes, date_codes, column_values, n_rows, n_dates):
+    """Sums values into a rows x dates float32 matrix; cells without any value are NaN."""
+    flat = row_codes.astype(np.int64) * n_dates + date_codes
+    weights = column_values.to_numpy(dtype=float, na_value=0.0)
+    sums = np.bincount(flat, weights=weights, minlength=n_rows * n_dates)
+    present = np.bincount(flat, minlength=n_rows * n_dates) > 0
+    return np.where(present, sums, np.nan).reshape(n_rows, n_dates).astype(np.float32)
+
+def build_position_matrix(master_df, column='On-hand Quantity'):
+    """
+    Pivots one column of the snapshot history into a dense (Item x Warehouse)
+    by Date matrix with a single scatter-add: rows are positions, columns are
+    the sorted snapshot dates, duplicate positions within a date are summed and
+    positions absent on a date are NaN.
+    """
+    if master_df.empty:
+        return {'items': np.array([], dtype=object), 'warehouses': np.array([], dtype=object),
+                'dates': pd.DatetimeIndex([]), 'values': np.empty((0, 0), dtype=np.float32)}
+
+    item_codes, items = pd.factorize(master_df['Item'])
+    warehouse_codes, warehouses = pd.factorize(master_df['Warehouse'])
+    position_codes, position_ids = pd.factorize(item_codes.astype(np.int64) * len(warehouses) + warehouse_codes)
+    date_codes, dates = pd.factorize(master_df['Date'], sort=True)
+
+    values = scatter_matrix(position_codes, date_codes, master_df[column], len(position_ids), len(dates))
+
+    return {
+        'items': np.asarray(items, dtype=object)[position_ids // len(warehouses)],
+        'warehouses': np.asarray(warehouses, dtype=object)[position_ids % len(warehouses)],
+        'dates': pd.DatetimeIndex(dates),
+        'values': values,
+    }
+
+def build_item_matrix(master_df, column='Number of products sold'):
+    """Like build_position_matrix, with one row per item (summed over warehouses)."""
+    if master_df.empty or column not in master_df.columns:
+        return None
+    item_codes, items = pd.factorize(master_df['Item'])
+    date_codes, dates = pd.factorize(master_df['Date'], sort=True)
+    return {
+        'items': np.asarray(items, dtype=object),
+        'dates': pd.DatetimeIndex(dates),
+        'values': scatter_matrix(item_codes, date_codes, master_df[column], len(items), len(dates)),
+    }
@@ -0,0 +1,75 @@
+"""Stock status transition analytics."""
+
+import pandas as pd
+import numpy as np
+
+# --- Status Transition Analytics ---
+
+STATUS_ORDER = ['STOCK-OUT', 'BELOW-SAFETY-STOCK', 'AT-STOCK', 'OVER-STOCK']
+STATUS_COLORS = {
+    'STOCK-OUT': '#DC2626',
+    'BELOW-SAFETY-STOCK': '#F59E0B',
+    'AT-STOCK': '#10B981',
+    'OVER-STOCK': '#6366F1',
+    'UNKNOWN': '#CCCCCC'
+}
+
+def compute_status_transitions(master_df):
+    """
+    Markov transition counts between stock statuses from one snapshot to the next
+    for every position, computed in one pass with shifted categorical codes and
+    bincounts: overall, per period (the later snapshot date), per warehouse and per
+    item family. Also reports the mean dwell time per status, in snapshots and days.
+    """
+    n_states = len(STATUS_ORDER)
+    empty_matrix = np.zeros((n_states, n_states), dtype=np.int64).tolist()
+    result = {'states': STATUS_ORDER, 'overall': empty_matrix, 'byPeriod': {}, 'byWarehouse': {}, 'byFamily': {}, 'dwell': []}
+    if master_df.empty:
+        return result
+
+    df = master_df[['Date', 'Item', 'Warehouse', 'Item Family', 'Calculated Stock Status']].sort_values(['Item', 'Warehouse', 'Date'], kind='stable')
+    position = df.groupby(['Item', 'Warehouse'], sort=False, observed=True).ngroup().to_numpy()
+    codes = pd.Categorical(df['Calculated Stock Status'], categories=STATUS_ORDER).codes.astype(np.int64)
+    dates = df['Date'].to_numpy()
+
+    # A transition is a row whose previous row belongs to the same position
+    same_position = np.zeros(len(df), dtype=bool)
+    same_position[1:] = position[1:] == position[:-1]
+    prev_codes = np.empty_like(codes)
+    prev_codes[0] = -1
+    prev_codes[1:] = codes[:-1]
+    valid = same_position & (codes >= 0) & (prev_codes >= 0)
+    transitions = prev_codes[valid] * n_states + codes[valid]
+
+    def count_matrices(group_codes, group_labels):
+        counts = np.bincount(group_codes * n_states * n_states + transitions, minlength=len(group_labels) * n_states * n_states)
+        matrices = counts.reshape(len(group_labels), n_states, n_states)
+        return {label: matrices[i].tolist() for i, label in enumerate(group_labels)}
+
+    result['overall'] = np.bincount(transitions, minlength=n_states * n_states).reshape(n_states, n_states).tolist()
+    period_codes, period_labels = pd.factorize(df['Date'].to_numpy()[valid], sort=True)
+    result['byPeriod'] = count_matrices(period_codes, [pd.Timestamp(d).strftime('%Y-%m-%d') for d in period_labels])
+    for key, col in [('byWarehouse', 'Warehouse'), ('byFamily', 'Item Family')]:
+        group_codes, group_labels = pd.factorize(df[col].to_numpy()[valid], sort=True)
+        result[key] = count_matrices(group_codes, list(group_labels))
+
+    # Dwell time: runs of identical status per position
+    run_start = ~same_position | (codes != prev_codes)
+    run_id = np.cumsum(run_start) - 1
+    run_codes = codes[run_start]
+    run_lengths = np.bincount(run_id)
+    run_first_date = dates[run_start]
+    # A run ends when the next run of the same position starts; the last run of a position is censored at its last snapshot
+    next_start = np.flatnonzero(run_start)[1:]
+    run_end_date = np.empty_like(run_first_date)
+    run_end_date[:-1] = np.where(same_position[next_start], dates[next_start], dates[next_start - 1])
+    run_end_date[-1] = dates[-1]
+    run_days = (run_end_date - run_first_date) / np.timedelta64(1, 'D')
+
+    known = run_codes >= 0
+    runs = pd.DataFrame({'status': run_codes[known], 'snapshots': run_lengths[known], 'days': run_days[known]})
+    dwell = runs.groupby('status').agg(runs=('snapshots', 'size'), meanSnapshots=('snapshots', 'mean'), meanDays=('days', 'mean'))
+    dwell = dwell.reindex(range(n_states)).fillna(0)
+    dwell.index = STATUS_ORDER
+    result['dwell'] = dwell.rename_axis('status').reset_index().to_dict('records')
+    return result
@@ -0,0 +1,92 @@
+"""Inventory turnover, days of inventory, sell-through and GMROI per snapshot."""
+
+import pandas as pd
+import numpy as np
+
+# --- Turnover Analytics (per snapshot) ---
+
+TURNOVER_DIMENSIONS = ['Item', 'Item Family', 'Warehouse']
+TURNOVER_INPUTS = {
+    'revenue': 'Revenue generated',
+    'unitsSold': 'Number of products sold',
+    'costs': 'Costs',
+    'inventoryValue': 'Inventory Value',
+    'onHand': 'On-hand Quantity',
+}
+TURNOVER_RATIOS = ['turnover', 'daysOfInventory', 'sellThrough', 'gmroi']
+TURNOVER_PERIOD_DAYS = 30 # Sales period assumed when a single snapshot gives no spacing
+SLOW_MOVER_TOP_K = 10
+
+def compute_turnover_totals(snapshot_df):
+    """
+    Sums of the turnover inputs of one processed snapshot per SKU, item family
+    and warehouse. Only additive totals are stored, so the ratios can be taken
+    at any grouping or period without revisiting rows; cached per snapshot
+    content in the shared cache (see compute_snapshot_sections).
+    """
+    if snapshot_df.empty or 'Number of products sold' not in snapshot_df.columns:
+        return {}
+    inputs = pd.DataFrame({
+        measure: snapshot_df[column].to_numpy(dtype=float, na_value=np.nan) if column in snapshot_df.columns else np.nan
+        for measure, column in TURNOVER_INPUTS.items()
+    })
+    return {
+        dim: inputs.groupby(snapshot_df[dim].to_numpy(), sort=True).sum(min_count=1).rename_axis(dim).reset_index()
+        for dim in TURNOVER_DIMENSIONS if dim in snapshot_df.columns
+    }
+
+def turnover_ratios(totals, period_days):
+    """
+    Adds the ratios to a frame of summed inputs, as whole-column operations:
+    turnover (costs over inventory value, annualized), days of inventory (on-hand
+    over daily units sold), sell-through (sold over sold plus on-hand, %) and
+    GMROI (gross margin over inventory value, annualized). Undefined ratios are NaN.
+    """
+    def ratio(numerator, denominator):
+        numerator = np.asarray(numerator, dtype=float)
+        denominator = np.asarray(denominator, dtype=float)
+        return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator > 0)
+
+    periods_per_year = 365 / period_days
+    return totals.assign(
+        turnover=ratio(totals['costs'], totals['inventoryValue']) * periods_per_year,
+        daysOfInventory=ratio(totals['onHand'], totals['unitsSold'] / period_days),
+        sellThrough=ratio(totals['unitsSold'], totals['unitsSold'] + totals['onHand']) * 100,
+        gmroi=ratio(totals['revenue'] - totals['costs'], totals['inventoryValue']) * periods_per_year,
+    )
+
+def rank_slow_movers(item_metrics, k=SLOW_MOVER_TOP_K):
+    """
+    The k SKUs with the lowest sell-through (ties broken by the higher excess
+    value when given). np.argpartition selects them in linear time; only those
+    k rows are sorted.
+    """
+    sell_through = item_metrics['sellThrough'].to_numpy(dtype=float)
+    ranked = np.flatnonzero(~np.isnan(sell_through))
+    if len(ranked) > k:
+        ranked = ranked[np.argpartition(sell_through[ranked], k - 1)[:k]]
+    order_keys = [sell_through[ranked]]
+    if 'excessValue' in item_metrics.columns:
+        order_keys.insert(0, -item_metrics['excessValue'].to_numpy(dtype=float)[ranked])
+    return item_metrics.iloc[ranked[np.lexsort(order_keys)]].reset_index(drop=True)
+
+def build_turnover_evolution(turnover_by_date, period_days):
+    """
+    Ratios per snapshot for the family and warehouse totals, stacked into one
+    time series per dimension. Only the cached per-snapshot totals are read, so
+    a new snapshot adds one aggregation rather than a rescan of the history.
+    """
+    evolution = {}
+    for dim in TURNOVER_DIMENSIONS[1:]:
+        frames = [turnover_ratios(totals[dim], period_days).assign(Date=pd.Timestamp(snapshot_date))
+                  for snapshot_date, totals in sorted(turnover_by_date.items()) if dim in totals]
+        if frames:
+            evolution[dim] = pd.concat(frames, ignore_index=True)
+    return evolution
+
+def snapshot_period_days(snapshot_dates):
+    """Median spacing of the snapshots in days (TURNOVER_PERIOD_DAYS for a single snapshot)."""
+    if len(snapshot_dates) < 2:
+        return TURNOVER_PERIOD_DAYS
+    spacing = np.diff(pd.DatetimeIndex(sorted(snapshot_dates)).values).astype('timedelta64[D]').astype(int)
+    return max(int(np.median(spacing)), 1)
@@ -0,0 +1,33 @@
+"""
+Page renderers. Each page lives in its own module and is imported the first
+time it is shown, so Plotly and the optional engines (DuckDB, PyArrow,
+openpyxl) are not loaded until a page needs them.
+"""
+
+import importlib
+
+# Navigation label -> (module in this package, renderer function), in sidebar order
+PAGES = {
+    'Home': ('home', 'HomeContent'),
+    'Executive Summary': ('summary', 'ExecutiveSummaryContent'),
+    'Warehouses': ('warehouses', 'WarehousesContent'),
+    'Availability': ('stock', 'AvailabilityContent'),
+    'Excess Stock': ('stock', 'ExcessStockContent'),
+    'Missing Stock': ('stock', 'MissingStockContent'),
+    'Historical Status': ('historical', 'HistoricalStatusContent'),
+    'Stock Coverage': ('coverage', 'StockCoverageContent'),
+    'Item': ('item', 'ItemContent'),
+    'Adhoc': ('adhoc', 'AdhocContent'),
+    'Logistics': ('logistics', 'LogisticsContent'),
+    'Quality': ('quality', 'QualityContent'),
+    'Replenishment': ('replenishment', 'ReplenishmentContent'),
+    'Stock Policy': ('policy', 'StockPolicyContent'),
+    'Day-to-Day Comparison': ('comparison', 'DayToDayComparisonContent'),
+    'Export': ('export', 'ExportContent'),
+}
+
+def load_page(name):
+    """Imports (once) and returns the renderer of a navigation entry."""
+    module_name, function_name = PAGES[name]
+    module = importlib.import_module(f'{__name__}.{module_name}')
+    return getattr(module, function_name)
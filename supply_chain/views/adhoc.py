@@ -0,0 +1,95 @@
+"""Adhoc analysis page (charts and SQL)."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from supply_chain.cache import dashboard_derived
+from supply_chain.sql import DEFAULT_ADHOC_QUERY, duckdb, run_adhoc_query
+
+@st.fragment
+def AdhocSqlContent(data):
+    history = data.get('history')
+    if history is None or not history.dates:
+        st.info("Please upload a CSV file to query the snapshot history.")
+        return
+    if duckdb is None:
+        st.warning("SQL mode needs DuckDB. Install it with `pip install duckdb`.")
+        return
+
+    st.caption("Query the table `snapshots` (all processed snapshots) or the view `latest` (latest date only). "
+               "Quote column names containing spaces, e.g. \"Inventory Value\".")
+    query = st.text_area("SQL query", value=DEFAULT_ADHOC_QUERY, height=160, key="adhoc_sql_query")
+    if not query.strip():
+        return
+
+    try:
+        # Widget changes rerun this fragment: the history is materialized once and each query run once per dashboard
+        snapshots_df = lambda: dashboard_derived('history-frame', history.to_frame)
+        result_df = dashboard_derived('adhoc-sql', lambda: run_adhoc_query(snapshots_df(), query), query)
+    except Exception as e:
+        st.error(f"Query failed: {e}")
+        return
+
+    st.write(f"{len(result_df)} rows")
+    output = st.radio("Show result as", ['Table', 'Bar chart', 'Line chart'], horizontal=True, key="adhoc_sql_output")
+    if output == 'Table' or result_df.empty or len(result_df.columns) < 2:
+        st.dataframe(result_df, use_container_width=True, hide_index=True)
+        return
+
+    columns = list(result_df.columns)
+    numeric_columns = list(result_df.select_dtypes(include='number').columns) or columns
+    col1, col2 = st.columns(2)
+    with col1:
+        x_col = st.selectbox("X axis", options=columns, index=0, key="adhoc_sql_x")
+    with col2:
+        y_col = st.selectbox("Y axis", options=numeric_columns, index=len(numeric_columns) - 1, key="adhoc_sql_y")
+    if output == 'Bar chart':
+        fig = px.bar(result_df, x=x_col, y=y_col, color_discrete_sequence=['#8884d8'])
+    else:
+        fig = px.line(result_df, x=x_col, y=y_col, color_discrete_sequence=['#8884d8'])
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def AdhocContent(data):
+    st.header("Adhoc Analysis")
+
+    mode = st.radio("Mode", ['Standard charts', 'SQL query'], horizontal=True, key="adhoc_mode")
+    if mode == 'SQL query':
+        AdhocSqlContent(data)
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Inventory Value Trends")
+        df_inv_trends = pd.DataFrame(data['adhocAnalysis']['inventoryValueTrends'])
+        if not df_inv_trends.empty:
+            fig = px.bar(df_inv_trends, x='month', y='value', labels={'value': 'Inventory Value'},
+                         color_discrete_sequence=['#8884d8'])
+            fig.update_layout(yaxis_tickprefix="$", yaxis_tickformat=".1fM")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No inventory value trends data available.")
+    with col2:
+        st.subheader("Inventory Value by Item Family")
+        df_inv_by_family = pd.DataFrame(data['adhocAnalysis']['inventoryValueByItemFamily'])
+        if not df_inv_by_family.empty:
+            fig = px.bar(df_inv_by_family, x='value', y='name', orientation='h',
+                         labels={'value': 'Inventory Value', 'name': 'Item Family'},
+                         color_discrete_sequence=['#82ca9d'])
+            fig.update_layout(xaxis_tickprefix="$", xaxis_tickformat=".0fK")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No inventory value by item family data available.")
+
+    st.markdown("---")
+
+    st.subheader("Pareto Analysis")
+    df_pareto = pd.DataFrame(data['adhocAnalysis']['paretoAnalysis'])
+    if not df_pareto.empty:
+        fig = px.bar(df_pareto, x='name', y='value', labels={'value': 'Value', 'name': 'Item'},
+                     color_discrete_sequence=['#8884d8'])
+        fig.update_layout(yaxis_tickprefix="$", yaxis_tickformat=".1fM")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No Pareto analysis data available.")
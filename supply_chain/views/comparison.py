@@ -0,0 +1,105 @@
+"""Day-to-Day Comparison page."""
+
+import streamlit as st
+
+from supply_chain.anomalies import ANOMALY_DEFAULTS, ANOMALY_METHODS, ANOMALY_TYPES, detect_change_anomalies
+from supply_chain.cache import dashboard_derived
+from supply_chain.comparison import compute_day_to_day_comparison
+from supply_chain.formatting import format_currency_k
+
+ANOMALY_LIST_ROWS = 200
+
+def DayToDayComparisonContent(data):
+    st.header("Day-to-Day Stock Comparison")
+
+    history = data.get('history')
+    if history is None or not history.dates:
+        st.info("Please upload multiple CSV files with different dates to enable day-to-day comparison.")
+        return
+
+    available_dates = [snapshot_date.date() for snapshot_date in history.dates]
+
+    if len(available_dates) < 2:
+        st.info("Upload at least two CSV files with different dates to perform a day-to-day comparison.")
+        return
+
+    DateComparison(history, available_dates)
+
+    st.markdown("---")
+    ChangeAnomalies(data)
+
+@st.fragment
+def DateComparison(history, available_dates):
+    """Date selectors and the comparison table; picking a date reruns only this section."""
+    st.subheader("Select Dates for Comparison")
+    col1, col2 = st.columns(2)
+    with col1:
+        date1 = st.selectbox("Select First Date", options=available_dates, index=0, key="date1_select")
+    with col2:
+        # Default to the last date if available, otherwise the second date
+        default_index_date2 = len(available_dates) - 1 if len(available_dates) > 1 else 0
+        date2 = st.selectbox("Select Second Date", options=available_dates, index=default_index_date2, key="date2_select")
+
+    if date1 and date2 and date1 == date2:
+        st.warning("Please select two different dates for comparison.")
+    elif date1 and date2:
+        st.subheader(f"Stock Comparison: {date1} vs {date2}")
+
+        # Compared and formatted once per dashboard and date pair, shared by every session
+        df_to_display = dashboard_derived('comparison', lambda: comparison_table(history, date1, date2), date1, date2)
+        st.dataframe(df_to_display, use_container_width=True, hide_index=True)
+
+        st.caption(f"History: {len(history.dates)} snapshots, {history.total_rows:,} rows stored as "
+                   f"{history.nbytes() / 1e6:.1f} MB of changes ({history.full_nbytes / 1e6:.1f} MB as full snapshots)")
+
+def comparison_table(history, date1, date2):
+    """The day-to-day comparison with its value columns formatted for display."""
+    comparison_df = compute_day_to_day_comparison(history, date1, date2)
+    value_col1 = f'Inventory Value_{date1.strftime("%Y%m%d")}'
+    value_col2 = f'Inventory Value_{date2.strftime("%Y%m%d")}'
+    return comparison_df.drop(columns=[value_col1, value_col2, 'Value Change']).assign(**{
+        value_col1: comparison_df[value_col1].apply(format_currency_k),
+        value_col2: comparison_df[value_col2].apply(format_currency_k),
+        'Value Change': comparison_df['Value Change'].apply(format_currency_k),
+    })
+
+@st.fragment
+def ChangeAnomalies(data):
+    """Ranked list of abnormal quantity changes, each scored against the position's own history."""
+    st.subheader("Anomalous Changes")
+
+    position_matrix = data.get('positionMatrix')
+    if position_matrix is None or position_matrix['values'].shape[1] < 2:
+        st.info("Anomaly detection needs at least two snapshots.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        method = st.selectbox("Method", options=ANOMALY_METHODS, key="anomaly_method_select")
+    with col2:
+        window = st.slider("History window (snapshots)", 3, 30, ANOMALY_DEFAULTS['window'], key="anomaly_window")
+    with col3:
+        threshold = st.slider("Score threshold", 2.0, 10.0, ANOMALY_DEFAULTS['threshold'], 0.5, key="anomaly_threshold")
+
+    # Scored once per dashboard and settings, shared by every session
+    anomalies = dashboard_derived('anomalies', lambda: detect_change_anomalies(position_matrix, method=method, window=window, threshold=threshold),
+                                  method, window, threshold)
+
+    if anomalies.empty:
+        st.info(f"No anomalous changes. Changes are scored once a position has {ANOMALY_DEFAULTS['min_history']} earlier changes.")
+        return
+
+    type_counts = anomalies['Type'].value_counts()
+    cols = st.columns(len(ANOMALY_TYPES))
+    for col, anomaly_type in zip(cols, ANOMALY_TYPES):
+        with col:
+            st.metric(label=anomaly_type, value=int(type_counts.get(anomaly_type, 0)))
+
+    selected_types = st.multiselect("Types", options=ANOMALY_TYPES, default=ANOMALY_TYPES, key="anomaly_types_select")
+    ranked = anomalies[anomalies['Type'].isin(selected_types)]
+    st.dataframe(ranked.head(ANOMALY_LIST_ROWS).assign(
+        Date=ranked['Date'].dt.date,
+        Score=ranked['Score'].round(1),
+        **{'Expected Change': ranked['Expected Change'].round(1)},
+    ), use_container_width=True, hide_index=True)
+    st.caption(f"Top {min(len(ranked), ANOMALY_LIST_ROWS):,} of {len(ranked):,} anomalies, most abnormal first.")
@@ -0,0 +1,25 @@
+"""Stock Coverage page."""
+
+import streamlit as st
+import pandas as pd
+
+from supply_chain.formatting import format_currency_k
+
+def StockCoverageContent(data):
+    st.header("Stock Coverage Analysis")
+    st.write("The ABC-XYZ analysis is an algorithm to classify your products by volume (ABC - high, medium, low consumption) and predictability (XYZ - stable, volatile, high volatile consumption).")
+    st.write("Each combination (AX, BX, CY) implies a suggested way to manage inventory (replenishment, buffer stock, inventory control).")
+
+    st.subheader("ABC-XYZ Classification: How to optimize and reduce my inventory coverage?")
+    df_abc_xyz = pd.DataFrame(data['stockCoverage']['abcXyzClassification'])
+    if not df_abc_xyz.empty:
+        # Flatten details for display if necessary, or simplify
+        df_abc_xyz['Detail by Product'] = df_abc_xyz['details'].apply(lambda x: ", ".join([f"{d['name']}: {format_currency_k(d['value'])}" for d in x]))
+        st.dataframe(df_abc_xyz[[
+            'consumption', 'stability', 'class', 'totalOutflowValue', 'numItems',
+            'recommended', 'buffer', 'control', 'Detail by Product'
+        ]].assign(
+            totalOutflowValue=df_abc_xyz['totalOutflowValue'].apply(format_currency_k)
+        ), use_container_width=True, hide_index=True)
+    else:
+        st.info("No ABC-XYZ classification data available.")
@@ -0,0 +1,68 @@
+"""Export page."""
+
+import streamlit as st
+import datetime
+import tempfile
+import urllib.parse
+
+from supply_chain.api import API_PUBLIC_URL, get_api_server
+from supply_chain.export import EXPORT_FORMATS, build_export_tables, export_file_type, export_table_builders, openpyxl, pa, write_export
+
+def ExportContent(data):
+    st.header("Export Dashboard Data")
+    st.write("Download the processed snapshots, the aggregates behind each page and a day-to-day comparison. "
+             "Tables are built and written in chunks when you click download.")
+    ExportDownload(data)
+
+@st.fragment
+def ExportDownload(data):
+    """Table and format pickers and the download button; changing them reruns only this section."""
+
+    history = data.get('history')
+    comparison_dates = None
+    if history is not None and history.dates:
+        available_dates = [snapshot_date.date() for snapshot_date in history.dates]
+        if len(available_dates) >= 2:
+            # Reuse the dates picked on the Day-to-Day Comparison page when available
+            date1 = st.session_state.get('date1_select', available_dates[-2])
+            date2 = st.session_state.get('date2_select', available_dates[-1])
+            if date1 != date2:
+                comparison_dates = (date1, date2)
+
+    builders = export_table_builders(data, comparison_dates)
+    selected_tables = st.multiselect("Tables", options=list(builders), default=list(builders), key="export_tables_select")
+    export_format = st.radio("Format", EXPORT_FORMATS, horizontal=True, key="export_format_select")
+
+    if export_format == 'Parquet' and pa is None:
+        st.warning("Parquet export needs pyarrow. Install it with `pip install pyarrow`.")
+        return
+    if export_format == 'Excel' and openpyxl is None:
+        st.warning("Excel export needs openpyxl. Install it with `pip install openpyxl`.")
+        return
+    if not selected_tables:
+        st.info("Select at least one table to export.")
+        return
+
+    extension, mime = export_file_type(export_format)
+    api_server = get_api_server()
+    dashboard_key = st.session_state.get('dashboard_key')
+    if API_PUBLIC_URL and api_server is not None and dashboard_key is not None:
+        # The API streams the file while it is written, so large exports never sit in memory.
+        # Only linked when its public URL is configured: the bind address is often unreachable from browsers.
+        params = {'dashboard': dashboard_key, 'format': export_format, 'tables': ','.join(selected_tables)}
+        if comparison_dates:
+            params.update(date1=comparison_dates[0].isoformat(), date2=comparison_dates[1].isoformat())
+        st.link_button(f"Download {export_format}", f"{API_PUBLIC_URL}/api/export?{urllib.parse.urlencode(params)}")
+        return
+
+    def generate_export():
+        # Tables are only built on download; the file spools to disk past 32 MB, but the
+        # download button still holds the whole file in memory (set SC_API_PUBLIC_URL to stream it)
+        fileobj = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+        write_export(build_export_tables(builders, selected_tables), export_format, fileobj)
+        fileobj.seek(0)
+        return fileobj
+
+    st.download_button(f"Download {export_format}", data=generate_export,
+                       file_name=f"supply_chain_export_{datetime.date.today().strftime('%Y%m%d')}.{extension}",
+                       mime=mime, key="export_download_button")
@@ -0,0 +1,23 @@
+"""Forecast settings and cached demand forecasts shared by the Item and Availability pages."""
+
+import streamlit as st
+
+from supply_chain.cache import dashboard_derived
+from supply_chain.forecasting import FORECAST_DEFAULTS, FORECAST_METHODS, forecast_demand
+
+def ForecastSettings(key_prefix):
+    """Method and horizon selectors; returns (method, horizon)."""
+    col1, col2 = st.columns(2)
+    with col1:
+        method = st.selectbox("Forecast method", options=FORECAST_METHODS, key=f"{key_prefix}_forecast_method")
+    with col2:
+        horizon = st.slider("Horizon (snapshot periods)", 1, 24, FORECAST_DEFAULTS['horizon'], key=f"{key_prefix}_forecast_horizon")
+    return method, horizon
+
+def cached_demand_forecast(data, method, horizon):
+    """Forecast of every item for the current data version, computed once and shared by all sessions."""
+    sales_matrix = data.get('salesMatrix')
+    if sales_matrix is None or not len(sales_matrix['items']):
+        return None
+    return dashboard_derived('forecast', lambda: forecast_demand(sales_matrix, method=method, horizon=horizon),
+                             method, horizon, FORECAST_DEFAULTS['season_length'])
@@ -0,0 +1,74 @@
+"""Historical Status page."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+
+def HistoricalStatusContent(data):
+    st.header("Inventory Historical Status")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("What was the Items' status in our inventory over the selected period?")
+        status_overview = data['historicalStatus']['stockStatusOverview']
+        st.info(f"**Out-of-Stock:** {status_overview['stockOut']}%")
+        st.warning(f"**Below Safety Stock:** {status_overview['belowSafetyStock']}%")
+        st.success(f"**At Stock:** {status_overview['atStock']}%")
+        st.info(f"**Over Stock:** {status_overview['overStock']}%")
+    with col2:
+        st.subheader("Which Items have had the most inventory issues?")
+        df_most_issues = pd.DataFrame(data['historicalStatus']['mostInventoryIssues'])
+        if not df_most_issues.empty:
+            st.dataframe(df_most_issues, use_container_width=True, hide_index=True)
+        else:
+            st.info("No items with historical issues.")
+
+    st.markdown("---")
+
+    st.subheader("How do positions move between statuses from one snapshot to the next?")
+    StatusTransitions(data['historicalStatus'].get('transitions'))
+
+    st.markdown("---")
+
+    st.subheader("Evolution in Position Status (Simulated)")
+    for item_data in data['historicalStatus']['evolutionInPositionStatus']:
+        st.write(f"**{item_data['item']}**")
+        status_html = ""
+        for status in item_data['statuses']:
+            color_class = {
+                'STOCK-OUT': 'bg-red-500',
+                'BELOW-SAFETY-STOCK': 'bg-yellow-500',
+                'AT-STOCK': 'bg-green-500',
+                'OVER-STOCK': 'bg-blue-500',
+                'UNKNOWN': 'bg-gray-300'
+            }.get(status, 'bg-gray-300')
+            status_html += f"<span class='status-square {color_class}' title='{status}'></span>"
+        st.markdown(f"<div style='display: flex; flex-wrap: wrap; gap: 4px;'>{status_html}</div>", unsafe_allow_html=True)
+
+@st.fragment
+def StatusTransitions(transitions):
+    """Transition matrices and dwell times; the scope selectors rerun only this section."""
+    if transitions and np.sum(transitions['overall']) > 0:
+        col1, col2 = st.columns(2)
+        with col1:
+            scope = st.selectbox("Scope", options=['All positions', 'By period', 'By warehouse', 'By item family'], key="transitions_scope_select")
+        groups = {'By period': transitions['byPeriod'], 'By warehouse': transitions['byWarehouse'], 'By item family': transitions['byFamily']}.get(scope)
+        matrix = transitions['overall']
+        if groups:
+            with col2:
+                group = st.selectbox(scope.replace('By ', '').capitalize(), options=list(groups.keys()), key="transitions_group_select")
+            matrix = groups[group]
+        fig = px.imshow(matrix, x=transitions['states'], y=transitions['states'], text_auto=True,
+                        color_continuous_scale='Blues', labels={'x': 'To status', 'y': 'From status', 'color': 'Positions'})
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown("**Mean dwell time per status**")
+        df_dwell = pd.DataFrame(transitions['dwell'])
+        st.dataframe(df_dwell.assign(
+            runs=df_dwell['runs'].astype(int),
+            meanSnapshots=df_dwell['meanSnapshots'].round(1),
+            meanDays=df_dwell['meanDays'].round(1),
+        ), use_container_width=True, hide_index=True)
+    else:
+        st.info("Upload snapshots for at least two dates to see status transitions.")
@@ -0,0 +1,46 @@
+"""Home page."""
+
+import streamlit as st
+import plotly.express as px
+
+from supply_chain.formatting import format_currency
+
+def HomeContent(data):
+    st.title("Inventory")
+    st.write("Salesforce")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Inventory Value as of Latest Date", value=format_currency(data['kpis']['inventoryValue']))
+    with col2:
+        st.metric(label="Missing Stock Amount", value=format_currency(data['kpis']['missingStockAmount']), delta_color="inverse")
+    with col3:
+        st.metric(label="Excess Stock Value", value=format_currency(data['kpis']['excessStockValue']), delta_color="off")
+
+    st.subheader(f"Inventory Status as of {data['history'].latest_date.strftime('%B %d, %Y') if data.get('history') is not None and data['history'].dates else 'Latest Date'}")
+    col_items, col_chart = st.columns([1, 3])
+    with col_items:
+        st.markdown(f"<h1 style='text-align: center; color: #3b82f6;'>{data['inventoryStatus']['totalItems']}</h1><p style='text-align: center;'>Items</p>", unsafe_allow_html=True)
+    with col_chart:
+        fig = px.bar(data['inventoryStatus']['breakdown'], y='name', x='value', orientation='h',
+                     color='name', color_discrete_map={item['name']: item['color'] for item in data['inventoryStatus']['breakdown']},
+                     height=150, title="", labels={'value': '', 'name': ''})
+        fig.update_layout(showlegend=False, margin=dict(l=0, r=0, t=0, b=0),
+                          xaxis_visible=False, yaxis_ticksuffix=" ")
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+    st.markdown(f"<p style='text-align: center; margin-top: -30px;'><h1 style='text-align: center; color: #10B981;'>{data['inventoryStatus']['totalPositions']}</h1>Positions</p>", unsafe_allow_html=True)
+
+    st.subheader("What you want to:")
+    actions = [
+        ("Assess", "M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.003 12.003 0 002 12c0 2.514.905 4.882 2.457 6.77A11.952 11.952 0 0012 21c2.514 0 4.882-.905 6.77-2.457A11.952 11.952 0 0022 12c0-2.514-.905-4.882-2.457-6.77z"),
+        ("Evaluate", "M9 19V6l12-3v13M9 19c-1.38 0-2.5-.68-2.5-1.5s1.12-1.5 2.5-1.5 2.5.68 2.5 1.5-1.12 1.5-2.5 1.5zm0 0v-6m0 6l-8-8"),
+        ("Reduce Risks", "M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z"),
+        ("Optimize", "M11 4a2 2 0 10-4 0v1a1 1 0 001 1h3a1 1 0 001-1V4zm0 16a2 2 0 10-4 0v1a1 1 0 001 1h3a1 1 0 001-1v-1zm-1-8a2 2 0 10-4 0v1a1 1 0 001 1h3a1 1 0 001-1v-1zM11 8a2 2 0 10-4 0v1a1 1 0 001 1h3a1 1 0 001-1V8zm-1 4a2 2 0 10-4 0v1a1 1 0 001 1h3a1 1 0 001-1v-1z"),
+        ("Assess Improvements", "M14 10h4.764a2 2 0 011.789 2.894l-3.5 7A2 2 0 0115.263 21H6.5a2 2 0 01-2-2v-6a2 2 0 012-2h2l2.5-3.5a2 2 0 013.098 0z"),
+        ("Deep-dive", "M21 21l-6-6m2-5a7 7 0 11-14 0 7 7 0 0114 0z")
+    ]
+    cols = st.columns(len(actions))
+    for i, (text, svg_path) in enumerate(actions):
+        with cols[i]:
+            st.button(text, key=f"action_btn_{text}", use_container_width=True, help=f"Click to {text}")
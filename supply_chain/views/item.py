@@ -0,0 +1,78 @@
+"""Item deep-dive page."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+
+from supply_chain.formatting import format_currency_k
+from supply_chain.views.forecast import ForecastSettings, cached_demand_forecast
+
+def ItemContent(data):
+    st.header("Item Deep-dive")
+
+    st.subheader(f"Inventory as of November 8, 2022 - {data['itemDeepDive']['selectedItem']}")
+    st.write(f"Item Family: {data['itemDeepDive']['itemFamily']}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="On-hand Qty", value=data['itemDeepDive']['stockStatus']['onHandQty'])
+    with col2:
+        st.metric(label="Inventory Value", value=format_currency_k(data['itemDeepDive']['stockStatus']['inventoryValue']))
+    with col3:
+        st.metric(label="Excess Stock", value=format_currency_k(data['itemDeepDive']['stockStatus']['excessStock']), delta_color="off")
+    with col4:
+        st.metric(label="Missing Stock", value=format_currency_k(data['itemDeepDive']['stockStatus']['missingStock']), delta_color="inverse")
+
+    st.markdown("---")
+
+    st.subheader("Stock Status by Warehouse")
+    df_warehouse_breakdown = pd.DataFrame(data['itemDeepDive']['warehouseBreakdown'])
+    if not df_warehouse_breakdown.empty:
+        st.dataframe(df_warehouse_breakdown.assign(
+            value=df_warehouse_breakdown['value'].apply(format_currency_k),
+            excess=df_warehouse_breakdown['excess'].apply(format_currency_k),
+            missing=df_warehouse_breakdown['missing'].apply(format_currency_k)
+        ), use_container_width=True, hide_index=True)
+    else:
+        st.info("No warehouse breakdown data for this item.")
+
+    st.markdown("---")
+
+    st.subheader("Demand Forecast")
+    ItemForecast(data)
+
+@st.fragment
+def ItemForecast(data):
+    """Demand forecast of one item; the item and forecast settings rerun only this section."""
+    method, horizon = ForecastSettings("item")
+    forecast = cached_demand_forecast(data, method, horizon)
+    if forecast is None:
+        st.info("Demand forecasts need the 'Number of products sold' column.")
+        return
+
+    items = list(forecast['items'])
+    default_item = data['itemDeepDive']['selectedItem']
+    item = st.selectbox("Item", options=items, index=items.index(default_item) if default_item in items else 0, key="item_forecast_select")
+    row = items.index(item)
+    df_forecast = pd.concat([
+        pd.DataFrame({'date': forecast['dates'], 'sold': forecast['history'][row], 'series': 'Actual'}),
+        pd.DataFrame({'date': forecast['forecastDates'], 'sold': forecast['forecast'][row], 'series': f"{forecast['method']} forecast"}),
+    ], ignore_index=True)
+    fig = px.line(df_forecast, x='date', y='sold', color='series', markers=True, labels={'sold': 'Products sold per period', 'date': 'Date'})
+    st.plotly_chart(fig, use_container_width=True)
+    params = forecast['params'].iloc[row]
+    st.caption(f"{forecast['method']} exponential smoothing, one-step RMSE {forecast['rmse'][row]:.1f}, "
+               f"alpha={params['alpha']:.2f} beta={params['beta']:.2f} gamma={params['gamma']:.2f}, "
+               f"one period = {forecast['periodDays']} day(s).")
+
+    position_matrix = data.get('positionMatrix')
+    if position_matrix is not None and position_matrix['values'].size:
+        on_hand = float(np.nansum(position_matrix['values'][position_matrix['items'] == item, -1]))
+        df_projection = pd.DataFrame({
+            'date': forecast['forecastDates'],
+            'expectedOnHand': on_hand - np.cumsum(forecast['forecast'][row]),
+        })
+        st.subheader("Expected On-Hand Quantity without Replenishment")
+        fig = px.line(df_projection, x='date', y='expectedOnHand', markers=True, labels={'expectedOnHand': 'Expected On-Hand'})
+        st.plotly_chart(fig, use_container_width=True)
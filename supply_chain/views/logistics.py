@@ -0,0 +1,55 @@
+"""Logistics page."""
+
+import streamlit as st
+import plotly.express as px
+
+from supply_chain.formatting import format_currency_k
+from supply_chain.logistics import LOGISTICS_DIMENSIONS
+
+def LogisticsContent(data):
+    st.header("Supplier & Logistics Analytics")
+
+    logistics = data.get('logistics') or {}
+    if not logistics:
+        st.info("The uploaded data has no supplier or shipping columns to analyze.")
+        return
+    LogisticsBreakdown(logistics)
+
+@st.fragment
+def LogisticsBreakdown(logistics):
+    """Snapshot and breakdown selectors rerun only this section."""
+    available_dates = sorted(logistics.keys())
+    col1, col2 = st.columns(2)
+    with col1:
+        snapshot_date = st.selectbox("Snapshot", options=available_dates, index=len(available_dates) - 1, key="logistics_date_select")
+    analytics = logistics.get(snapshot_date) or {}
+    if not analytics:
+        st.info("No logistics data available for this snapshot.")
+        return
+    with col2:
+        breakdown = st.selectbox("Break down by", options=list(analytics.keys()), key="logistics_breakdown_select")
+
+    df_logistics = analytics[breakdown]
+    dims = [d for d in LOGISTICS_DIMENSIONS if d in df_logistics.columns]
+    label = df_logistics[dims].astype(str).agg(' / '.join, axis=1)
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Cost per Unit")
+        fig = px.bar(df_logistics.assign(group=label), x='group', y=['costPerUnit', 'shippingCostPerUnit'],
+                     barmode='group', labels={'group': breakdown, 'value': 'Cost per Unit ($)'})
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.subheader("Shipping Time Distribution (days)")
+        fig = px.bar(df_logistics.assign(group=label), x='group', y=['shippingTimeP10', 'shippingTimeP50', 'shippingTimeP90'],
+                     barmode='group', labels={'group': breakdown, 'value': 'Days'})
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Lead Time Percentiles and Costs")
+    st.dataframe(df_logistics.assign(
+        totalCosts=df_logistics['totalCosts'].apply(format_currency_k),
+        costPerUnit=df_logistics['costPerUnit'].apply(lambda x: f"${x:.2f}"),
+        shippingCostPerUnit=df_logistics['shippingCostPerUnit'].apply(lambda x: f"${x:.2f}"),
+    ), use_container_width=True, hide_index=True)
@@ -0,0 +1,63 @@
+"""Stock Policy page."""
+
+import streamlit as st
+import pandas as pd
+
+from supply_chain.policy import POLICY_WILDCARD, default_policy, normalize_policy
+from supply_chain.processing import compact_base_frame, expand_base_frame
+from supply_chain.transitions import STATUS_ORDER
+
+def StockPolicyContent(data):
+    st.header("Safety-Stock Policy")
+    st.write("Safety stock is a share of the on-hand quantity and positions above the over-stock factor times the "
+             "safety stock are over-stock. A family + warehouse rule beats a family rule, which beats a warehouse rule, "
+             f"which beats the {POLICY_WILDCARD} / {POLICY_WILDCARD} rule. Applying a policy re-classifies the whole "
+             "history from the cached snapshots, without re-reading the uploaded files.")
+    PolicyEditor(data)
+
+@st.fragment
+def PolicyEditor(data):
+    """Rule editor and preview; edits rerun only this section, applying a policy reruns the app."""
+
+    current_policy = data.get('stockPolicy')
+    cube = data.get('cube')
+    families = sorted(cube['Item Family'].astype(str).unique()) if cube is not None else []
+    warehouses = sorted(cube['Warehouse'].astype(str).unique()) if cube is not None else []
+
+    edited = st.data_editor(
+        current_policy if current_policy is not None else default_policy(),
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key="stock_policy_editor",
+        column_config={
+            'Item Family': st.column_config.SelectboxColumn(options=[POLICY_WILDCARD] + families, default=POLICY_WILDCARD),
+            'Warehouse': st.column_config.SelectboxColumn(options=[POLICY_WILDCARD] + warehouses, default=POLICY_WILDCARD),
+            'Safety Stock %': st.column_config.NumberColumn(min_value=0.0, max_value=500.0, step=1.0, default=20.0),
+            'Over-stock Factor': st.column_config.NumberColumn(min_value=0.0, max_value=20.0, step=0.1, default=1.5),
+        },
+    )
+    edited = normalize_policy(edited)
+
+    history = data.get('history')
+    if history is not None and history.dates:
+        # Preview: the latest snapshot re-classified under the edited rules
+        latest_date = history.latest_date
+        latest = history.reconstruct(latest_date)
+        base = compact_base_frame(latest, current_policy)
+        before = latest['Calculated Stock Status'].value_counts()
+        after = expand_base_frame(base, latest_date, edited)['Calculated Stock Status'].value_counts()
+        preview = pd.DataFrame({'Current policy': before, 'Edited policy': after}).reindex(STATUS_ORDER).fillna(0).astype(int)
+        st.subheader(f"Status Breakdown on {latest_date.date()}")
+        st.dataframe(preview.assign(Change=preview['Edited policy'] - preview['Current policy']), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Apply policy", type="primary", key="stock_policy_apply"):
+            st.session_state['stock_policy'] = edited
+            st.rerun(scope="app")
+    with col2:
+        if st.button("Reset to defaults", key="stock_policy_reset"):
+            st.session_state.pop('stock_policy', None)
+            st.session_state.pop('stock_policy_editor', None)
+            st.rerun(scope="app")
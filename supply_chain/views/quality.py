@@ -0,0 +1,60 @@
+"""Quality page."""
+
+import streamlit as st
+import plotly.express as px
+
+from supply_chain.formatting import format_currency_k
+from supply_chain.quality import QUALITY_LEAD_TIME_QUANTILES
+
+def QualityContent(data):
+    st.header("Quality & Manufacturing Scorecards")
+
+    quality = data.get('quality') or {}
+    by_snapshot = {snapshot_date: scorecards for snapshot_date, scorecards in (quality.get('bySnapshot') or {}).items() if scorecards}
+    if not by_snapshot:
+        st.info("The uploaded data has no inspection, defect or manufacturing columns to score.")
+        return
+    QualityScorecards(quality, by_snapshot)
+
+@st.fragment
+def QualityScorecards(quality, by_snapshot):
+    """Snapshot, dimension and metric selectors rerun only the scorecards."""
+    available_dates = sorted(by_snapshot.keys())
+    col1, col2 = st.columns(2)
+    with col1:
+        snapshot_date = st.selectbox("Snapshot", options=available_dates, index=len(available_dates) - 1, key="quality_date_select")
+    scorecards = by_snapshot[snapshot_date]
+    with col2:
+        dim = st.selectbox("Score by", options=list(scorecards.keys()), key="quality_dimension_select")
+
+    df_scorecard = scorecards[dim]
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Defect and Inspection Failure Rates (%)")
+        fig = px.bar(df_scorecard, x=dim, y=['defectRate', 'failureRate'], barmode='group',
+                     labels={'value': '%', 'variable': 'Rate'})
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.subheader("Manufacturing Lead Time Distribution (days)")
+        lead_columns = [f"leadTimeP{int(q * 100)}" for q in QUALITY_LEAD_TIME_QUANTILES]
+        fig = px.bar(df_scorecard, x=dim, y=lead_columns, barmode='group', labels={'value': 'Days', 'variable': 'Percentile'})
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Scorecard")
+    st.dataframe(df_scorecard.assign(
+        manufacturingCost=df_scorecard['manufacturingCost'].apply(format_currency_k),
+        defectCost=df_scorecard['defectCost'].apply(format_currency_k),
+        defectRate=df_scorecard['defectRate'].apply(lambda x: f"{x:.2f}%"),
+        defectCostShare=df_scorecard['defectCostShare'].apply(lambda x: f"{x:.2f}%"),
+        failureRate=df_scorecard['failureRate'].apply(lambda x: f"{x:.1f}%"),
+    ), use_container_width=True, hide_index=True)
+
+    evolution = (quality.get('evolution') or {}).get(dim)
+    if evolution is not None and evolution['Date'].nunique() > 1:
+        st.subheader("Evolution over Snapshots")
+        metric = st.selectbox("Metric", options=['defectRate', 'failureRate', 'defectCost', 'avgLeadTime'], key="quality_metric_select")
+        fig = px.line(evolution, x='Date', y=metric, color=dim, markers=True)
+        st.plotly_chart(fig, use_container_width=True)
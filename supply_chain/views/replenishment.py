@@ -0,0 +1,56 @@
+"""Replenishment page."""
+
+import streamlit as st
+
+from supply_chain.formatting import format_currency
+from supply_chain.replenishment import REPLENISHMENT_DEFAULTS, compute_replenishment
+
+def ReplenishmentContent(data):
+    st.header("What to Order")
+
+    inputs = data.get('replenishmentInputs')
+    if inputs is None or inputs.empty:
+        st.info("Replenishment needs the 'Number of products sold', 'Lead times', 'Order quantities' and 'Costs' columns.")
+        return
+    st.caption(f"Daily demand is 'Number of products sold' over a {data['salesPeriodDays']}-day sales period "
+               "(the spacing between snapshots), as for the turnover ratios on the Excess Stock page.")
+    ReplenishmentPlan(inputs, data['salesPeriodDays'])
+
+@st.fragment
+def ReplenishmentPlan(inputs, sales_period_days):
+    """Policy sliders and the suggested orders; moving a slider reruns only this section."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        service_level_z = st.slider("Service level (z)", 0.0, 3.0, REPLENISHMENT_DEFAULTS['service_level_z'], 0.05, key="replenishment_z")
+    with col2:
+        holding_rate = st.slider("Yearly holding rate", 0.05, 0.6, REPLENISHMENT_DEFAULTS['holding_rate'], 0.01, key="replenishment_holding")
+    with col3:
+        horizon_days = st.slider("Order within (days)", 0, 90, 30, key="replenishment_horizon")
+
+    replenishment = compute_replenishment(inputs, sales_period_days, service_level_z=service_level_z, holding_rate=holding_rate,
+                                          demand_cv=REPLENISHMENT_DEFAULTS['demand_cv'])
+    to_order = replenishment[replenishment['Days to Reorder'] <= horizon_days].sort_values(['Days to Reorder', 'Order Value'], ascending=[True, False])
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Positions to Order Now", value=int(replenishment['Order Now'].sum()))
+    with col2:
+        st.metric(label=f"Positions to Order within {horizon_days} days", value=len(to_order))
+    with col3:
+        st.metric(label="Value to Order", value=format_currency(to_order['Order Value'].sum()))
+
+    st.markdown("---")
+
+    st.subheader("Suggested Orders")
+    display_limit = 1000
+    if len(to_order) > display_limit:
+        st.caption(f"Showing the {display_limit:,} most urgent of {len(to_order):,} positions. Use the Export page for the full list.")
+    st.dataframe(to_order.head(display_limit), use_container_width=True, hide_index=True, column_config={
+        'Order Value': st.column_config.NumberColumn(format="$%.0f"),
+        'Daily Demand': st.column_config.NumberColumn(format="%.2f"),
+        'Safety Stock': st.column_config.NumberColumn(format="%.1f"),
+        'Reorder Point': st.column_config.NumberColumn(format="%.1f"),
+        'EOQ': st.column_config.NumberColumn(format="%.0f"),
+        'Days to Reorder': st.column_config.NumberColumn(format="%.0f"),
+        'Suggested Order Date': st.column_config.DateColumn(),
+    })
@@ -0,0 +1,219 @@
+"""Availability, Excess Stock and Missing Stock pages."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+
+from supply_chain.forecasting import project_stock_outs
+from supply_chain.formatting import format_currency, format_currency_k
+from supply_chain.views.forecast import ForecastSettings, cached_demand_forecast
+
+def AvailabilityContent(data):
+    st.header("Item Availability")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Missing Stock Amount", value=format_currency(data['availability']['missingStockAmount']), delta_color="inverse")
+    with col2:
+        st.metric(label="Excess Stock Value", value=format_currency(data['availability']['excessStockValue']), delta_color="off")
+    with col3:
+        st.metric(label="Inventory Value", value=format_currency(data['availability']['inventoryValue']))
+
+    st.markdown("---")
+
+    StockOutForecast(data)
+
+@st.fragment
+def StockOutForecast(data):
+    """Stock-out projections; the forecast settings rerun only this section."""
+    method, horizon = ForecastSettings("availability")
+    forecast = cached_demand_forecast(data, method, horizon)
+    projection = project_stock_outs(forecast, data['positionMatrix']) if forecast is not None and data.get('positionMatrix') is not None else None
+
+    if projection is None:
+        st.info("Stock-out forecasts need the 'Number of products sold' column.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Forecast: Next Stock-out Items")
+            days = projection['Days to Stock-out']
+            stock_out_forecast = [
+                {'range': 'within 3 days', 'items': int((days <= 3).sum())},
+                {'range': '4 to 10 days', 'items': int(((days > 3) & (days <= 10)).sum())},
+                {'range': '11 to 20 days', 'items': int(((days > 10) & (days <= 20)).sum())},
+                {'range': '21 to 30 days', 'items': int(((days > 20) & (days <= 30)).sum())},
+            ]
+            max_items = max([forecast_range['items'] for forecast_range in stock_out_forecast] + [1])
+            for forecast_range in stock_out_forecast:
+                st.write(f"{forecast_range['range']} ({forecast_range['items']} items)")
+                st.progress(forecast_range['items'] / max_items)
+        with col2:
+            st.subheader("Forecast: Items to Stock-out Soon")
+            df_stock_out_soon = projection.dropna(subset=['Days to Stock-out']).sort_values('Days to Stock-out', kind='stable').head(20)
+            if not df_stock_out_soon.empty:
+                st.dataframe(df_stock_out_soon, use_container_width=True, hide_index=True)
+            else:
+                st.info("No items expected to stock out soon.")
+
+    st.markdown("---")
+
+    st.subheader("Current Inventory by Item")
+    df_current_inventory = pd.DataFrame(data['availability']['currentInventoryByItem'])
+    if not df_current_inventory.empty:
+        st.dataframe(df_current_inventory, use_container_width=True, hide_index=True)
+    else:
+        st.info("No current inventory data available.")
+
+    if projection is not None:
+        st.subheader(f"Theoretical On Hand Quantity (next {horizon} periods, {method} forecast)")
+        df_theoretical_on_hand = pd.DataFrame({
+            'date': forecast['forecastDates'],
+            'value': projection['On-hand Quantity'].sum() - np.cumsum(forecast['forecast'].sum(axis=0)),
+        })
+        fig = px.line(df_theoretical_on_hand, x='date', y='value', labels={'value': 'Quantity'})
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def ExcessStockContent(data):
+    st.header("Excess Stock")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Percentage of Over-Stock Items", value=f"{data['excessStock']['percentOverStock']:.1f}%")
+    with col2:
+        st.metric(label="Excess Stock Value", value=format_currency(data['excessStock']['excessStockValue']))
+    with col3:
+        st.metric(label="Share of Excess-Stock Value", value=f"{data['excessStock']['shareOfExcessStockValue']:.1f}%")
+
+    st.markdown("---")
+
+    st.subheader("How has our Excess-stock value evolved?")
+    df_excess_evolution = pd.DataFrame(data['excessStock']['excessStockEvolution'])
+    if not df_excess_evolution.empty:
+        fig = px.line(df_excess_evolution, x='month', y=['excessValue', 'excessShare'],
+                      labels={'excessValue': 'Excess Value ($)', 'excessShare': 'Excess Share (%)'},
+                      height=300)
+        fig.update_traces(yaxis='y1', selector=dict(name='excessValue'))
+        fig.update_traces(yaxis='y2', selector=dict(name='excessShare'))
+        fig.update_layout(yaxis=dict(title='Excess Value ($)', side='left'),
+                          yaxis2=dict(title='Excess Share (%)', overlaying='y', side='right'))
+        fig.update_layout(hovermode="x unified")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No excess stock evolution data available.")
+
+
+    st.markdown("---")
+
+    st.subheader("Which Items have the highest Excess-stock value?")
+    df_highest_excess = pd.DataFrame(data['excessStock']['highestExcessItems'])
+    if not df_highest_excess.empty:
+        st.dataframe(df_highest_excess.assign(
+            excessValue=df_highest_excess['excessValue'].apply(format_currency_k),
+            share=df_highest_excess['share'].apply(lambda x: f"{x:.1f}%"),
+            **{col: df_highest_excess[col].apply(fmt) for col, fmt in [
+                ('sellThrough', lambda x: f"{x:.1f}%" if pd.notna(x) else '–'),
+                ('daysOfInventory', lambda x: f"{x:.0f} days" if pd.notna(x) else '–'),
+            ] if col in df_highest_excess.columns}
+        ), use_container_width=True, hide_index=True)
+    else:
+        st.info("No highest excess items data available.")
+
+    st.markdown("---")
+
+    ExcessTurnover(data)
+
+@st.fragment
+def ExcessTurnover(data):
+    """Turnover, days of inventory, sell-through and GMROI: is the excess slow-moving or just high-volume?"""
+    st.subheader("Is our excess stock slow-moving?")
+    turnover = data.get('turnover') or {}
+    latest = turnover.get('latest') or {}
+    if not latest:
+        st.info("The uploaded data has no sales columns ('Number of products sold', 'Revenue generated', 'Costs') to compute turnover.")
+        return
+    st.caption(f"Ratios are annualized from a {turnover['periodDays']}-day sales period (the spacing between snapshots).")
+
+    ratio_columns = {
+        'turnover': lambda x: f"{x:.1f}x",
+        'daysOfInventory': lambda x: f"{x:.0f} days",
+        'sellThrough': lambda x: f"{x:.1f}%",
+        'gmroi': lambda x: f"{x:.2f}",
+    }
+    def formatted(df):
+        return df.assign(**{
+            col: df[col].apply(lambda x, fmt=fmt: fmt(x) if pd.notna(x) else '–') for col, fmt in ratio_columns.items() if col in df.columns
+        }, **{col: df[col].apply(format_currency_k) for col in ['excessValue', 'inventoryValue', 'revenue'] if col in df.columns})
+
+    slow_movers = turnover.get('slowMovers')
+    if slow_movers is not None and not slow_movers.empty:
+        st.markdown("**Slowest-moving SKUs** (lowest sell-through)")
+        st.dataframe(formatted(slow_movers[['Item', 'excessValue', 'onHand', 'unitsSold', 'sellThrough', 'daysOfInventory', 'turnover', 'gmroi']]),
+                     use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        dim = st.selectbox("Group by", options=[d for d in ['Item Family', 'Warehouse'] if d in latest], key="turnover_dimension_select")
+    with col2:
+        metric = st.selectbox("Metric", options=list(ratio_columns), key="turnover_metric_select")
+    df_latest = latest[dim]
+    fig = px.bar(df_latest, x=dim, y=metric)
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(formatted(df_latest[[dim, 'inventoryValue', 'revenue', 'unitsSold', 'turnover', 'daysOfInventory', 'sellThrough', 'gmroi']]),
+                 use_container_width=True, hide_index=True)
+
+    evolution = (turnover.get('evolution') or {}).get(dim)
+    if evolution is not None and evolution['Date'].nunique() > 1:
+        fig = px.line(evolution, x='Date', y=metric, color=dim, markers=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def MissingStockContent(data):
+    st.header("Missing Stock")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Share of Missing Stock Items")
+        st.markdown(f"<h1 style='font-size: 3rem; font-weight: bold; color: #ef4444;'>{data['missingStock']['percentBelowSafetyStock']:.1f}%</h1>", unsafe_allow_html=True)
+        st.write("of items are Below Safety Stock")
+        st.markdown(f"<h1 style='font-size: 2rem; font-weight: bold; color: #ef4444;'>{data['missingStock']['percentOutOfStock']:.1f}%</h1>", unsafe_allow_html=True)
+        st.write("of items are Out-of-Stock")
+    with col2:
+        st.subheader("Amount Needed to Refill Positions")
+        st.markdown(f"<h1 style='font-size: 3rem; font-weight: bold; color: #fbbf24;'>{format_currency(data['missingStock']['amountToRefill'])}</h1>", unsafe_allow_html=True)
+        st.write("Missing Stock Amount")
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Evolution of Missing Stock Items (Count)")
+        df_missing_items_evolution = pd.DataFrame(data['missingStock']['evolutionOfMissingStockItems'])
+        if not df_missing_items_evolution.empty:
+            fig = px.line(df_missing_items_evolution, x='month', y='items', labels={'items': 'Number of Missing Items'},
+                          color_discrete_sequence=['#FF7043'])
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No missing items evolution data available.")
+    with col2:
+        st.subheader("Evolution of Missing Stock Amount")
+        df_missing_amount_evolution = pd.DataFrame(data['missingStock']['evolutionOfMissingStockAmount'])
+        if not df_missing_amount_evolution.empty:
+            fig = px.line(df_missing_amount_evolution, x='month', y='amount', labels={'amount': 'Missing Stock Amount'},
+                          color_discrete_sequence=['#FFB300'])
+            fig.update_layout(yaxis_tickprefix="$", yaxis_tickformat=".1fM")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No missing stock amount evolution data available.")
+
+    st.markdown("---")
+
+    st.subheader("Which Items Represent the Most Important Inventory to Refill?")
+    df_most_important_missing = pd.DataFrame(data['missingStock']['mostImportantMissingItems'])
+    if not df_most_important_missing.empty:
+        st.dataframe(df_most_important_missing.assign(
+            amount=df_most_important_missing['amount'].apply(format_currency_k)
+        ), use_container_width=True, hide_index=True)
+    else:
+        st.info("No most important missing items data available.")
@@ -0,0 +1,81 @@
+"""Executive Summary page."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from supply_chain.formatting import format_currency
+from supply_chain.rolling import ROLLING_DIMENSIONS, ROLLING_METRICS, ROLLING_METRIC_LABELS, ROLLING_WINDOWS
+
+def ExecutiveSummaryContent(data):
+    st.header("Executive Summary")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Inventory Status by Warehouse")
+        max_positions = max([wh['positions'] for wh in data['executiveSummary']['warehouseSummary']], default=0)
+        for wh in data['executiveSummary']['warehouseSummary']:
+            st.markdown(f"**{wh['name']}**")
+            if wh['positions'] > 0:
+                st.progress(wh['positions'] / max_positions, text=f"{wh['positions']} positions")
+            else:
+                st.progress(0, text="0 positions")
+    with col2:
+        st.subheader("Evolution of our inventory Items")
+        df_item_evolution = pd.DataFrame(data['executiveSummary']['itemEvolution'])
+        if not df_item_evolution.empty:
+            fig = px.line(df_item_evolution, x='month', y='items', labels={'items': 'Number of Items'})
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No item evolution data available.")
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Are we efficiently mobilizing our capital in our inventory?")
+        st.markdown(f"<h1 style='font-size: 3rem; font-weight: bold;'>{format_currency(data['kpis']['inventoryValue'])}</h1>", unsafe_allow_html=True)
+        st.write(f"Total Inventory Value (Excess Stock {format_currency(data['kpis']['excessStockValue'])})")
+        st.markdown(f"<h1 style='font-size: 3rem; font-weight: bold; color: #ef4444;'>{format_currency(data['kpis']['missingStockAmount'])}</h1>", unsafe_allow_html=True)
+        st.write("to refill Missing Stock")
+    with col2:
+        st.subheader("How is the total value of our inventory evolving?")
+        df_inv_evolution = pd.DataFrame(data['executiveSummary']['inventoryEvolution'])
+        if not df_inv_evolution.empty:
+            fig = px.bar(df_inv_evolution, x='month', y='value', labels={'value': 'Inventory Value'},
+                         color_discrete_sequence=['#82ca9d'])
+            fig.update_layout(yaxis_tickprefix="$", yaxis_tickformat=".1fM")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No inventory evolution data available.")
+        archive = data.get('archive')
+        if archive is not None and archive.dates:
+            tiers = archive.tier_summary().set_index('tier')['dates']
+            st.caption(f"History: {tiers['full']} recent snapshots in full, {tiers['daily']} older dates as daily item totals, "
+                       f"{tiers['monthly']} months as monthly item totals and {tiers['cube']} months as summaries only.")
+
+    st.markdown("---")
+
+    st.subheader("Rolling averages per snapshot (7 / 30 / 90 days)")
+    RollingAverages(data.get('rollingMetrics') or {})
+
+@st.fragment
+def RollingAverages(rolling):
+    """Metric and dimension selectors rerun only this section."""
+    df_rolling_evolution = pd.DataFrame(rolling.get('evolution', []))
+    if not df_rolling_evolution.empty:
+        col1, col2 = st.columns(2)
+        with col1:
+            metric = st.selectbox("Metric", options=ROLLING_METRICS, key="rolling_metric_select",
+                                  format_func=lambda m: ROLLING_METRIC_LABELS[m])
+        with col2:
+            dim = st.selectbox("Break down by", options=ROLLING_DIMENSIONS, key="rolling_dimension_select")
+        fig = px.line(df_rolling_evolution, x='date', y=metric, color='window',
+                      labels={metric: ROLLING_METRIC_LABELS[metric], 'date': ''})
+        st.plotly_chart(fig, use_container_width=True)
+        df_rolling_latest = pd.DataFrame(rolling['byDimension'].get(dim, []))
+        if not df_rolling_latest.empty:
+            st.dataframe(df_rolling_latest.pivot(index='name', columns='window', values=metric)[[f"{w}d" for w in ROLLING_WINDOWS]]
+                         .reset_index().rename(columns={'name': dim}), use_container_width=True, hide_index=True)
+    else:
+        st.info("No rolling metrics available.")
@@ -0,0 +1,22 @@
+"""Sidebar validation report."""
+
+import streamlit as st
+import pandas as pd
+
+def ValidationReport(file_name, report):
+    """Sidebar summary of the ingest validation report of one uploaded file."""
+    if not report['issues']:
+        st.caption(f"✅ {report['rows']:,} rows passed validation")
+        return
+
+    summary = f"{report['errorCount']} error(s), {report['warningCount']} warning(s) in {report['rows']:,} rows"
+    if report['errorCount']:
+        st.error(f"Validation: {summary}")
+    else:
+        st.warning(f"Validation: {summary}")
+    with st.expander(f"Validation details for {file_name}"):
+        for issue in report['issues']:
+            count = f" ({issue['count']:,} rows)" if issue['count'] else ""
+            st.markdown(f"**{issue['check']}** · {issue['severity']}{count}: {issue['message']}")
+            if issue['sample']:
+                st.dataframe(pd.DataFrame(issue['sample']), use_container_width=True, hide_index=True)
@@ -0,0 +1,46 @@
+"""Warehouses page."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from supply_chain.formatting import format_currency
+from supply_chain.rolling import ROLLING_METRIC_LABELS
+
+def WarehousesContent(data):
+    st.header("Inventory by Warehouse")
+
+    rolling_by_warehouse = pd.DataFrame((data.get('rollingMetrics') or {}).get('byDimension', {}).get('Warehouse', []))
+
+    for wh in data['warehouses']:
+        st.markdown("---")
+        st.subheader(wh['name'])
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown(f"**{wh['positions']}** Positions")
+        with col2:
+            st.markdown("**Inventory Positions Breakdown**")
+            df_breakdown = pd.DataFrame(wh['stockBreakdown'])
+            if not df_breakdown.empty:
+                fig = px.bar(df_breakdown, y='name', x='value', orientation='h',
+                             color='name', color_discrete_map={item['name']: item['color'] for item in wh['stockBreakdown']},
+                             height=150, labels={'value': '', 'name': ''})
+                fig.update_layout(showlegend=False, margin=dict(l=0, r=0, t=0, b=0), xaxis_visible=False, yaxis_ticksuffix=" ")
+                st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+            else:
+                st.info("No stock breakdown data.")
+        with col3:
+            st.markdown(f"**Inventory Value:** {format_currency(wh['inventoryValue'])}")
+            st.markdown(f"**Excess Stock:** {format_currency(wh['excessStock'])}")
+        with col4:
+            st.markdown(f"**Missing Stock Amount:** {format_currency(wh['missingStock'])}")
+
+        df_wh_rolling = rolling_by_warehouse[rolling_by_warehouse['name'] == wh['name']] if not rolling_by_warehouse.empty else rolling_by_warehouse
+        if not df_wh_rolling.empty:
+            st.dataframe(df_wh_rolling.assign(
+                inventoryValue=df_wh_rolling['inventoryValue'].apply(format_currency),
+                excessValue=df_wh_rolling['excessValue'].apply(format_currency),
+                missingAmount=df_wh_rolling['missingAmount'].apply(format_currency),
+                stockOuts=df_wh_rolling['stockOuts'].round(1),
+            ).drop(columns='name').rename(columns={'window': 'Rolling window', **ROLLING_METRIC_LABELS}),
+                use_container_width=True, hide_index=True)